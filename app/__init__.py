@@ -1,12 +1,17 @@
 from flask import Flask, jsonify
 from sqlalchemy import text
 from .db.init_db import init_db
+# Importing the repositories also registers the Core tables and indexes
+# (rollups, data versions, the unique readings index) on the models'
+# metadata before init_db creates them
+from .repositories import enable_sqlite_savepoints
 
 def create_app():
     app = Flask(__name__)
 
     # Initialize database
     Session = init_db()
+    enable_sqlite_savepoints(Session.get_bind())
 
     @app.route('/health')
     def health_check():
@@ -1,22 +1,63 @@
 from flask import Flask, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
+from typing import Optional
+
+import numpy as np
 from app.db.init_db import init_db
 from app.db.repositories import StationRepository, TemperatureRepository
+from app.repositories import DataVersionRepository, RollupRepository, enable_sqlite_savepoints
+from app.dashboard.cache import CacheBackend, ResponseCache
+from app.dashboard.pagination import decode_cursor, encode_cursor
+from app.services.comparison import (
+    SEASONS, hourly_means_matrix, pairwise_differences, seasonal_hourly_medians, seasonal_hourly_stats, to_json_list
+)
+from app.services.downsample import BUCKETS, aggregate_daily, choose_bucket, lttb
+
+def create_app(cache_backend: Optional[CacheBackend] = None):
+    """Create and configure the Flask application.
 
-def create_app():
-    """Create and configure the Flask application."""
+    Responses are cached in `cache_backend` (in-process LRU by default)
+    until ingestion bumps the data version.
+    """
     app = Flask(__name__)
     
     # Initialize database
     db_session = init_db('sqlite:///../db/weather.db')
+    enable_sqlite_savepoints(db_session.get_bind())
+    response_cache = ResponseCache(
+        get_version=lambda: DataVersionRepository(db_session).get(),
+        backend=cache_backend
+    )
     
     @app.route('/api/cities', methods=['GET'])
+    @response_cache.cached
     def get_cities():
-        """Get list of all available cities."""
+        """Get list of all available cities.
+
+        Without `limit` or `cursor` the full list is returned; with them, a
+        page of cities and the cursor of the next page.
+        """
         try:
+            limit = request.args.get('limit', type=int)
+            cursor = request.args.get('cursor', type=str)
+            paginated = limit is not None or cursor is not None
+
             station_repo = StationRepository(db_session)
-            stations = station_repo.get_all()
+            if paginated:
+                limit = 100 if limit is None else limit
+                if not 1 <= limit <= 1000:
+                    return jsonify({'error': 'limit must be between 1 and 1000'}), 400
+                try:
+                    after_id = decode_cursor(cursor, [int])[0] if cursor else None
+                except ValueError:
+                    return jsonify({'error': 'Invalid cursor'}), 400
+                # Fetch one extra row to know whether another page follows
+                stations = station_repo.get_page(limit + 1, after_id)
+                has_next = len(stations) > limit
+                stations = stations[:limit]
+            else:
+                stations = station_repo.get_all()
             
             cities = [
                 {
@@ -29,13 +70,56 @@ def create_app():
                 for station in stations
             ]
             
+            if paginated:
+                next_cursor = encode_cursor([cities[-1]['id']]) if has_next else None
+                return jsonify({'items': cities, 'next_cursor': next_cursor})
             return jsonify(cities)
         except SQLAlchemyError as e:
             return jsonify({'error': 'Database error occurred'}), 500
         except Exception as e:
             return jsonify({'error': 'An unexpected error occurred'}), 500
 
+    @app.route('/api/temperatures', methods=['GET'])
+    @response_cache.cached
+    def get_temperatures():
+        """Get a page of temperature readings ordered by station and timestamp."""
+        try:
+            station_id = request.args.get('station_id', type=int)
+            limit = request.args.get('limit', default=1000, type=int)
+            cursor = request.args.get('cursor', type=str)
+
+            if not 1 <= limit <= 10000:
+                return jsonify({'error': 'limit must be between 1 and 10000'}), 400
+            try:
+                after = tuple(decode_cursor(cursor, [int, datetime])) if cursor else None
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+            # Fetch one extra row to know whether another page follows
+            temp_repo = TemperatureRepository(db_session)
+            temps = temp_repo.get_page_by_station_and_timestamp(limit + 1, after, station_id)
+            items = [
+                {
+                    'station_id': temp.station_id,
+                    'timestamp': temp.timestamp.isoformat(),
+                    'temperature': temp.temperature
+                }
+                for temp in temps[:limit]
+            ]
+            next_cursor = None
+            if len(temps) > limit:
+                last = temps[limit - 1]
+                next_cursor = encode_cursor([last.station_id, last.timestamp])
+
+            return jsonify({'items': items, 'next_cursor': next_cursor})
+
+        except SQLAlchemyError as e:
+            return jsonify({'error': 'Database error occurred'}), 500
+        except Exception as e:
+            return jsonify({'error': 'An unexpected error occurred'}), 500
+
     @app.route('/api/temperature-comparison', methods=['GET'])
+    @response_cache.cached
     def get_temperature_comparison():
         """Get temperature comparison data for two cities over a date range."""
         try:
@@ -56,28 +140,17 @@ def create_app():
             except ValueError:
                 return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
 
-            # Get temperature data
+            # Aggregate per hour of day in the database
             temp_repo = TemperatureRepository(db_session)
-            city1_temps = temp_repo.get_by_station_and_date_range(city1_id, start_date, end_date)
-            city2_temps = temp_repo.get_by_station_and_date_range(city2_id, start_date, end_date)
-
-            # Process data
-            hourly_data = {}
-            for temp in city1_temps + city2_temps:
-                hour = temp.timestamp.hour
-                if hour not in hourly_data:
-                    hourly_data[hour] = {'city1': [], 'city2': []}
-                
-                if temp.station_id == city1_id:
-                    hourly_data[hour]['city1'].append(temp.temperature)
-                else:
-                    hourly_data[hour]['city2'].append(temp.temperature)
+            stats = temp_repo.get_hourly_stats([city1_id, city2_id], start_date, end_date)
 
             # Calculate averages and differences
             result = []
             for hour in range(24):
-                city1_avg = sum(hourly_data[hour]['city1']) / len(hourly_data[hour]['city1']) if hourly_data[hour]['city1'] else None
-                city2_avg = sum(hourly_data[hour]['city2']) / len(hourly_data[hour]['city2']) if hourly_data[hour]['city2'] else None
+                city1_stats = stats[city1_id].get(hour)
+                city2_stats = stats[city2_id].get(hour)
+                city1_avg = city1_stats['avg'] if city1_stats else None
+                city2_avg = city2_stats['avg'] if city2_stats else None
                 
                 if city1_avg is not None and city2_avg is not None:
                     difference = city1_avg - city2_avg
@@ -117,5 +190,215 @@ def create_app():
             return jsonify({'error': 'Database error occurred'}), 500
         except Exception as e:
             return jsonify({'error': 'An unexpected error occurred'}), 500
+
+    @app.route('/api/multi-city-comparison', methods=['GET'])
+    @response_cache.cached
+    def get_multi_city_comparison():
+        """Get hourly temperatures of several cities and their pairwise differences over a date range."""
+        try:
+            # Get query parameters (comma-separated and/or repeated station_ids)
+            raw_ids = ','.join(request.args.getlist('station_ids'))
+            start_date = request.args.get('start_date', type=str)
+            end_date = request.args.get('end_date', type=str)
+
+            # Validate parameters
+            if not all([raw_ids, start_date, end_date]):
+                return jsonify({'error': 'Missing required parameters'}), 400
+
+            try:
+                station_ids = list(dict.fromkeys(
+                    int(station_id) for station_id in raw_ids.split(',') if station_id.strip()
+                ))
+            except ValueError:
+                return jsonify({'error': 'Invalid station ids'}), 400
+            if len(station_ids) < 2:
+                return jsonify({'error': 'At least two station ids are required'}), 400
+
+            # Convert dates
+            try:
+                start_date = datetime.strptime(start_date, '%Y-%m-%d')
+                end_date = datetime.strptime(end_date, '%Y-%m-%d')
+            except ValueError:
+                return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+            station_repo = StationRepository(db_session)
+            if any(station_repo.get(station_id) is None for station_id in station_ids):
+                return jsonify({'error': 'Station not found'}), 404
+
+            # Aggregate every station per hour of day, then compare them all at once
+            temp_repo = TemperatureRepository(db_session)
+            stats = temp_repo.get_hourly_stats(station_ids, start_date, end_date)
+            means = hourly_means_matrix(stats, station_ids)
+
+            hourly_data = [
+                {
+                    'station_id': station_id,
+                    'hours': [
+                        {'hour': hour, **stats[station_id][hour]} if hour in stats[station_id]
+                        else {'hour': hour, 'avg': None, 'count': 0, 'min': None, 'max': None}
+                        for hour in range(24)
+                    ]
+                }
+                for station_id in station_ids
+            ]
+
+            return jsonify({
+                'station_ids': station_ids,
+                'hourly_data': hourly_data,
+                'difference_matrix': to_json_list(pairwise_differences(means))
+            })
+
+        except SQLAlchemyError as e:
+            return jsonify({'error': 'Database error occurred'}), 500
+        except Exception as e:
+            return jsonify({'error': 'An unexpected error occurred'}), 500
+
+    @app.route('/api/temperature-series', methods=['GET'])
+    @response_cache.cached
+    def get_temperature_series():
+        """Get the downsampled temperature series of a city over a date range (whole days, inclusive)."""
+        try:
+            # Get query parameters
+            station_id = request.args.get('station_id', type=int)
+            start_date = request.args.get('start_date', type=str)
+            end_date = request.args.get('end_date', type=str)
+            bucket = request.args.get('bucket', default='auto', type=str)
+            max_points = request.args.get('max_points', default=1000, type=int)
+
+            # Validate parameters
+            if not all([station_id, start_date, end_date]):
+                return jsonify({'error': 'Missing required parameters'}), 400
+            if bucket != 'auto' and bucket not in BUCKETS:
+                return jsonify({'error': f"Invalid bucket. Use auto, {', '.join(BUCKETS)}"}), 400
+            if not 3 <= max_points <= 10000:
+                return jsonify({'error': 'max_points must be between 3 and 10000'}), 400
+
+            # Convert dates
+            try:
+                start_date = datetime.strptime(start_date, '%Y-%m-%d')
+                end_date = datetime.combine(datetime.strptime(end_date, '%Y-%m-%d'), datetime.max.time())
+            except ValueError:
+                return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+            if end_date < start_date:
+                return jsonify({'error': 'end_date must not be before start_date'}), 400
+
+            if bucket == 'auto':
+                bucket = choose_bucket(start_date, end_date, max_points)
+
+            # Hourly points are the raw readings; coarser buckets merge daily rollups
+            if bucket == 'hour':
+                rows = TemperatureRepository(db_session).get_series(station_id, start_date, end_date)
+                points = [
+                    {'timestamp': timestamp, 'avg': temperature, 'min': temperature, 'max': temperature, 'count': 1}
+                    for timestamp, temperature in rows
+                ]
+            else:
+                rows = RollupRepository(db_session).get_daily([station_id], start_date.date(), end_date.date())
+                points = aggregate_daily(rows, bucket)
+
+            # Explicit fine buckets over long ranges are reduced to the point budget
+            downsampled = len(points) > max_points
+            if downsampled:
+                x = np.array([point['timestamp'].timestamp() for point in points])
+                y = np.array([point['avg'] for point in points])
+                points = [points[i] for i in lttb(x, y, max_points)]
+
+            return jsonify({
+                'station_id': station_id,
+                'bucket': bucket,
+                'downsampled': downsampled,
+                'points': [
+                    {**point, 'timestamp': point['timestamp'].isoformat()}
+                    for point in points
+                ]
+            })
+
+        except SQLAlchemyError as e:
+            return jsonify({'error': 'Database error occurred'}), 500
+        except Exception as e:
+            return jsonify({'error': 'An unexpected error occurred'}), 500
+
+    @app.route('/api/seasonal-comparison', methods=['GET'])
+    @response_cache.cached
+    def get_seasonal_comparison():
+        """Get per-season hourly temperature statistics of two cities and their differences."""
+        try:
+            # Get query parameters
+            city1_id = request.args.get('city1_id', type=int)
+            city2_id = request.args.get('city2_id', type=int)
+            start_date = request.args.get('start_date', type=str)
+            end_date = request.args.get('end_date', type=str)
+            # Medians need every reading, so they are only computed on request
+            include_median = request.args.get('median', default='false', type=str).lower() in ('1', 'true', 'yes')
+
+            # Validate parameters
+            if not all([city1_id, city2_id, start_date, end_date]):
+                return jsonify({'error': 'Missing required parameters'}), 400
+
+            # Convert dates
+            try:
+                start_date = datetime.strptime(start_date, '%Y-%m-%d')
+                end_date = datetime.combine(datetime.strptime(end_date, '%Y-%m-%d'), datetime.max.time())
+            except ValueError:
+                return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+            station_repo = StationRepository(db_session)
+            stations = [station_repo.get(city1_id), station_repo.get(city2_id)]
+            if None in stations:
+                return jsonify({'error': 'Station not found'}), 404
+
+            # Seasons follow each station's hemisphere
+            temp_repo = TemperatureRepository(db_session)
+            monthly = temp_repo.get_monthly_hourly_stats([city1_id, city2_id], start_date, end_date)
+            seasonal = [seasonal_hourly_stats(monthly[station.id], station.latitude) for station in stations]
+            if include_median:
+                for station, stats in zip(stations, seasonal):
+                    timestamps, temperatures = temp_repo.get_arrays_by_station_and_date_range(
+                        station.id, start_date, end_date, dtype=np.float64
+                    )
+                    medians = seasonal_hourly_medians(timestamps, temperatures, station.latitude)
+                    for season, hours in medians.items():
+                        for hour, median in hours.items():
+                            # Hours missing from the rollup statistics are left out
+                            if hour in stats[season]:
+                                stats[season][hour]['median'] = median
+
+            result = {}
+            for season in SEASONS:
+                hourly_data = []
+                for hour in range(24):
+                    city1_stats = seasonal[0][season].get(hour)
+                    city2_stats = seasonal[1][season].get(hour)
+                    entry = {
+                        'hour': hour,
+                        'city1': city1_stats,
+                        'city2': city2_stats,
+                        'mean_difference': None
+                    }
+                    if city1_stats and city2_stats:
+                        entry['mean_difference'] = city1_stats['mean'] - city2_stats['mean']
+                        if include_median:
+                            city1_median = city1_stats.get('median')
+                            city2_median = city2_stats.get('median')
+                            entry['median_difference'] = (
+                                city1_median - city2_median
+                                if city1_median is not None and city2_median is not None else None
+                            )
+                    hourly_data.append(entry)
+
+                differences = [entry['mean_difference'] for entry in hourly_data if entry['mean_difference'] is not None]
+                result[season] = {
+                    'hourly_data': hourly_data,
+                    'avg_difference': sum(differences) / len(differences) if differences else None,
+                    'max_difference': max(differences) if differences else None,
+                    'min_difference': min(differences) if differences else None
+                }
+
+            return jsonify({'seasons': result})
+
+        except SQLAlchemyError as e:
+            return jsonify({'error': 'Database error occurred'}), 500
+        except Exception as e:
+            return jsonify({'error': 'An unexpected error occurred'}), 500
     
     return app 
\ No newline at end of file
@@ -0,0 +1,276 @@
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Optional
+from urllib.parse import urlencode
+
+from flask import Response, current_app, request
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend(ABC):
+    """Interface of the response cache storage backends."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached body, or None on a miss."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        """Store a body, evicting the least recently used entries beyond the size bound."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every cached body."""
+        pass
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache."""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the in-process cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached body and mark it as most recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store a body, dropping the least recently used entries beyond `max_entries`."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached body."""
+        with self._lock:
+            self._entries.clear()
+
+class FileCacheBackend(CacheBackend):
+    """File-backed LRU cache shared by the processes serving the dashboard."""
+
+    def __init__(self, cache_dir: str, max_entries: int = 1024, evict_every: Optional[int] = None):
+        """
+        Initialize the file-backed cache.
+
+        Args:
+            cache_dir: Directory holding one file per cached response
+            max_entries: Maximum number of cached responses
+            evict_every: Number of writes between scans of the directory for
+                eviction (defaults to an eighth of `max_entries`), so the
+                directory may briefly exceed `max_entries` by that many files
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.evict_every = evict_every if evict_every is not None else max(1, max_entries // 8)
+        self._writes_since_evict = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Get the file holding a key's body."""
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a cached body and mark it as most recently used."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+            # The modification time records recency for LRU eviction
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        """Write a body atomically, periodically evicting the least recently used files."""
+        # Write atomically so concurrent readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(value)
+        try:
+            os.replace(tmp_path, self._path(key))
+        except FileNotFoundError:
+            # A concurrent clear() removed the file; the entry is simply not cached
+            return
+
+        with self._lock:
+            self._writes_since_evict += 1
+            if self._writes_since_evict < self.evict_every:
+                return
+            self._writes_since_evict = 0
+        self._evict()
+
+    def clear(self) -> None:
+        """Delete every cached file, leaving in-flight writes alone."""
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.tmp'):
+                continue
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        """Delete the least recently used files beyond `max_entries`."""
+        entries = [entry for entry in os.scandir(self.cache_dir) if not entry.name.endswith('.tmp')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+class ResponseCache:
+    """Cache of JSON responses keyed by endpoint, normalized query and data version.
+
+    Cached responses carry a strong ETag derived from the same key, so
+    conditional requests are answered with 304 Not Modified, and large
+    bodies are gzip-compressed for clients accepting it.
+    """
+
+    def __init__(
+        self,
+        get_version: Callable[[], int],
+        backend: Optional[CacheBackend] = None,
+        version_ttl: float = 1.0,
+        min_compress_size: int = 1024
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            get_version: Returns the current data version; bumping it invalidates the cache
+            backend: Storage backend (defaults to an in-process LRU cache)
+            version_ttl: Seconds the data version is reused before it is read again
+            min_compress_size: Smallest body, in bytes, sent gzip-compressed
+        """
+        self.get_version = get_version
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.version_ttl = version_ttl
+        self.min_compress_size = min_compress_size
+        self._version = None
+        self._version_checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current_version(self) -> int:
+        """
+        Get the data version, reading it at most once per `version_ttl` seconds.
+
+        Returns:
+            Current data version
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._version is None or now - self._version_checked_at >= self.version_ttl:
+                version = self.get_version()
+                if self._version is not None and version != self._version:
+                    # Entries of older versions can never be hit again
+                    self.backend.clear()
+                self._version = version
+                self._version_checked_at = now
+            return self._version
+
+    def make_key(self, path: str, args, version: int) -> str:
+        """
+        Build the cache key of a request.
+
+        Query parameters are sorted and stripped, so equivalent requests
+        share an entry.
+
+        Args:
+            path: Request path
+            args: Request query parameters (a MultiDict)
+            version: Data version
+
+        Returns:
+            Cache key
+        """
+        query = sorted(
+            (name, value.strip())
+            for name in args
+            for value in args.getlist(name)
+            if value.strip()
+        )
+        return f"{version}:{path}?{urlencode(query)}"
+
+    def make_etag(self, key: str) -> str:
+        """
+        Build the strong ETag of a cache key.
+
+        Args:
+            key: Cache key, which includes the data version
+
+        Returns:
+            ETag of the identity-encoded representation
+        """
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+    def cached(self, view: Callable) -> Callable:
+        """Decorate a Flask view so its successful JSON responses are cached and revalidated."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                version = self.current_version()
+            except Exception as e:
+                logger.warning(f"Bypassing response cache: {str(e)}")
+                return view(*args, **kwargs)
+
+            key = self.make_key(request.path, request.args, version)
+            etag = self.make_etag(key)
+            # The gzip representation has its own tag, since its bytes differ
+            for tag in (etag, f"{etag}-gzip"):
+                if request.if_none_match.contains(tag):
+                    return self._finalize(Response(status=304), tag)
+
+            body = self.backend.get(key)
+            if body is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data()
+                self.backend.set(key, body)
+
+            if len(body) >= self.min_compress_size and request.accept_encodings['gzip']:
+                compressed = self.backend.get(f"{key}:gzip")
+                if compressed is None:
+                    compressed = gzip.compress(body, compresslevel=6)
+                    self.backend.set(f"{key}:gzip", compressed)
+                response = Response(compressed, mimetype='application/json')
+                response.headers['Content-Encoding'] = 'gzip'
+                return self._finalize(response, f"{etag}-gzip")
+            return self._finalize(Response(body, mimetype='application/json'), etag)
+        return wrapper
+
+    def _finalize(self, response: Response, etag: str) -> Response:
+        """Add the validation headers to a response."""
+        response.set_etag(etag)
+        # Browsers must revalidate, which costs a 304 while the data is unchanged
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Accept-Encoding')
+        return response
@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Sequence
+
+def encode_cursor(key: List) -> str:
+    """
+    Encode a keyset pagination key as an opaque URL-safe token.
+
+    Args:
+        key: Key values of the last returned row (ints, strings or datetimes)
+
+    Returns:
+        Cursor token
+    """
+    values = [
+        {'datetime': value.isoformat()} if isinstance(value, datetime) else value
+        for value in key
+    ]
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+def decode_cursor(token: str, types: Sequence[type]) -> List:
+    """
+    Decode a cursor token produced by encode_cursor.
+
+    Args:
+        token: Cursor token
+        types: Expected type of each key value
+
+    Returns:
+        Key values
+
+    Raises:
+        ValueError: If the token is malformed or its values have other types
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        key = [
+            datetime.fromisoformat(value['datetime']) if isinstance(value, dict) else value
+            for value in values
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+    if len(key) != len(types):
+        raise ValueError("Invalid cursor: unexpected key length")
+    # Exact type checks, so booleans are not accepted as integers
+    if any(type(value) is not expected for value, expected in zip(key, types)):
+        raise ValueError("Invalid cursor: unexpected key type")
+    return key
@@ -1,9 +1,14 @@
-from .base import BaseRepository
+from .base import BaseRepository, enable_sqlite_savepoints
+from .data_version import DataVersionRepository
+from .rollup import RollupRepository
 from .station import StationRepository
 from .temperature import TemperatureRepository
 
 __all__ = [
     'BaseRepository',
+    'DataVersionRepository',
+    'RollupRepository',
     'StationRepository',
-    'TemperatureRepository'
+    'TemperatureRepository',
+    'enable_sqlite_savepoints'
 ] 
\ No newline at end of file
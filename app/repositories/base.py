@@ -1,12 +1,45 @@
-from typing import TypeVar, Generic, Type, List, Optional
-from sqlalchemy.orm import Session
+from contextlib import contextmanager
+from typing import TypeVar, Generic, Type, List, Optional, Callable, Iterator
+from sqlalchemy import event, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, SessionTransactionOrigin, scoped_session
+from sqlalchemy.sql.dml import Insert
 from app.db.models import Base
+from .data_version import DataVersionRepository
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Keys of Session.info shared by every repository using the same session
+UNIT_OF_WORK = 'repository_unit_of_work'
+PENDING_DATA_VERSION_BUMP = 'repository_pending_data_version_bump'
+
+def enable_sqlite_savepoints(engine: Engine) -> None:
+    """Let SQLAlchemy manage pysqlite transactions, so unit_of_work savepoints work.
+
+    The pysqlite driver begins transactions lazily and on its own, which
+    breaks SAVEPOINT/RELEASE. Following the SQLAlchemy recipe, the driver's
+    transaction handling is disabled and BEGIN is emitted by SQLAlchemy.
+    Engines of other databases and drivers are left untouched.
+    """
+    if engine.dialect.name != 'sqlite' or engine.dialect.driver != 'pysqlite':
+        return
+
+    # On checkout rather than connect, so connections already pooled by
+    # init_db are covered too
+    @event.listens_for(engine, "checkout")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record, connection_proxy):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
 class BaseRepository(Generic[ModelType]):
     """Base repository class with common CRUD operations."""
     
+    # Whether writes invalidate cached responses by bumping the data version
+    bumps_data_version = False
+    
     def __init__(self, model: Type[ModelType], db_session: Session):
         self.model = model
         self.db_session = db_session
@@ -19,30 +52,104 @@ class BaseRepository(Generic[ModelType]):
         """Get all records."""
         return self.db_session.query(self.model).all()
 
-    def create(self, obj_in: dict) -> ModelType:
+    def get_page(self, limit: int = 100, after_id: Optional[int] = None) -> List[ModelType]:
+        """Get up to `limit` records with an ID greater than `after_id` (keyset pagination), in ID order."""
+        query = self.db_session.query(self.model)
+        if after_id is not None:
+            query = query.filter(self.model.id > after_id)
+        return query.order_by(self.model.id).limit(limit).all()
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[List[ModelType]]:
+        """Stream all records in batches of `chunk_size`, in ID order."""
+        return self._iter_batches(select(self.model).order_by(self.model.id), chunk_size)
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[Session]:
+        """Group the writes of every repository sharing this session under a single commit.
+
+        Inside the block writes are only flushed and no longer refreshed
+        (expired attributes load lazily on access). The transaction is
+        committed once on exit. If the block raises, only its own writes are
+        rolled back: when the session already has a transaction, the block
+        runs in a savepoint. A transaction the caller began explicitly
+        (Session.begin()) is theirs to commit, so on exit only the savepoint
+        is released; one the session began on its own (autobegin on an
+        earlier read or flush) is committed. Nested blocks join the
+        outermost one.
+        """
+        info = self.db_session.info
+        if self.in_unit_of_work():
+            yield self.db_session
+            return
+
+        caller_transaction = self._in_caller_transaction()
+        savepoint = self.db_session.begin_nested() if self._in_transaction() else None
+        info[UNIT_OF_WORK] = True
+        try:
+            yield self.db_session
+            if info.pop(PENDING_DATA_VERSION_BUMP, False):
+                DataVersionRepository(self.db_session).bump()
+            if savepoint is not None:
+                savepoint.commit()
+            if not caller_transaction:
+                self.db_session.commit()
+        except BaseException:
+            if savepoint is not None and savepoint.is_active:
+                savepoint.rollback()
+            elif not caller_transaction:
+                self.db_session.rollback()
+            raise
+        finally:
+            info.pop(UNIT_OF_WORK, None)
+            info.pop(PENDING_DATA_VERSION_BUMP, None)
+
+    def _current_session(self) -> Session:
+        """Get the session behind a scoped_session, which does not proxy the transaction accessors."""
+        return self.db_session() if isinstance(self.db_session, scoped_session) else self.db_session
+
+    def _in_caller_transaction(self) -> bool:
+        """Whether the session is in a transaction the caller began explicitly rather than by autobegin."""
+        transaction = self._current_session().get_transaction()
+        return transaction is not None and transaction.origin is not SessionTransactionOrigin.AUTOBEGIN
+
+    def _in_transaction(self) -> bool:
+        """Whether the session already has a transaction, its own or one of the connection it is bound to."""
+        if self._current_session().in_transaction():
+            return True
+        bind = self.db_session.get_bind()
+        return isinstance(bind, Connection) and bind.in_transaction()
+
+    def in_unit_of_work(self) -> bool:
+        """Whether writes are currently deferred to an enclosing unit of work."""
+        return self.db_session.info.get(UNIT_OF_WORK) is True
+
+    def create(self, obj_in: dict, refresh: bool = True) -> ModelType:
         """Create a new record."""
         db_obj = self.model(**obj_in)
         self.db_session.add(db_obj)
-        self.db_session.commit()
-        self.db_session.refresh(db_obj)
+        self._commit()
+        if refresh and not self.in_unit_of_work():
+            self.db_session.refresh(db_obj)
         return db_obj
 
-    def update(self, id: int, obj_in: dict) -> Optional[ModelType]:
+    def update(self, id: int, obj_in: dict, refresh: bool = True) -> Optional[ModelType]:
         """Update a record."""
-        db_obj = self.get(id)
+        # Session.get checks the identity map before querying
+        db_obj = self.db_session.get(self.model, id)
         if db_obj:
             for key, value in obj_in.items():
                 setattr(db_obj, key, value)
-            self.db_session.commit()
-            self.db_session.refresh(db_obj)
+            self._commit()
+            if refresh and not self.in_unit_of_work():
+                self.db_session.refresh(db_obj)
         return db_obj
 
     def delete(self, id: int) -> bool:
         """Delete a record."""
-        db_obj = self.get(id)
+        db_obj = self.db_session.get(self.model, id)
         if db_obj:
             self.db_session.delete(db_obj)
-            self.db_session.commit()
+            self._commit()
             return True
         return False
 
@@ -50,5 +157,39 @@ class BaseRepository(Generic[ModelType]):
         """Create multiple records in bulk."""
         db_objs = [self.model(**obj_in) for obj_in in objs_in]
         self.db_session.bulk_save_objects(db_objs)
+        self._commit()
+        return db_objs 
+
+    def _iter_batches(self, stmt, chunk_size: int) -> Iterator[List[ModelType]]:
+        """Execute an ORM select with yield_per (a server-side cursor where supported) and yield batches."""
+        result = self.db_session.execute(stmt.execution_options(yield_per=chunk_size))
+        try:
+            yield from result.scalars().partitions()
+        finally:
+            result.close()
+
+    def _commit(self) -> None:
+        """Commit the current transaction, bumping the data version if needed.
+
+        Inside a unit of work the changes are only flushed, and the data
+        version is bumped once when it commits.
+        """
+        if self.in_unit_of_work():
+            if self.bumps_data_version:
+                self.db_session.info[PENDING_DATA_VERSION_BUMP] = True
+            self.db_session.flush()
+            return
+        if self.bumps_data_version:
+            DataVersionRepository(self.db_session).bump()
         self.db_session.commit()
-        return db_objs 
\ No newline at end of file
+
+    def _dialect_insert(self) -> Callable[..., Insert]:
+        """Get the dialect-specific insert construct supporting ON CONFLICT."""
+        dialect = self.db_session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise NotImplementedError(f"Upserts are not supported on {dialect}")
+        return insert
@@ -0,0 +1,36 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Column, Integer, String, Table, insert, select, update
+from app.db.models import Base
+
+DATA_VERSION = 'data'
+
+# Counters bumped by every write, used to invalidate cached responses
+data_versions = Table(
+    'data_versions',
+    Base.metadata,
+    Column('name', String(50), primary_key=True),
+    Column('version', Integer, nullable=False)
+)
+
+class DataVersionRepository:
+    """Repository for the data-version counters."""
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    def get(self, name: str = DATA_VERSION) -> int:
+        """Get the current version of a counter (0 if it was never bumped)."""
+        version = self.db_session.execute(
+            select(data_versions.c.version).where(data_versions.c.name == name)
+        ).scalar()
+        return version or 0
+
+    def bump(self, name: str = DATA_VERSION) -> None:
+        """Increment a counter within the current transaction."""
+        result = self.db_session.execute(
+            update(data_versions)
+            .where(data_versions.c.name == name)
+            .values(version=data_versions.c.version + 1)
+        )
+        if result.rowcount == 0:
+            self.db_session.execute(insert(data_versions).values(name=name, version=1))
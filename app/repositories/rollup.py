@@ -0,0 +1,189 @@
+from typing import Callable, Dict, Iterable, List, Tuple
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Column, Date, Float, ForeignKey, Integer, Table, and_, cast, delete, extract, func, insert, select
+)
+from app.db.models import Base, Temperature
+
+# Per station and day
+daily_rollups = Table(
+    'temperature_daily_rollups',
+    Base.metadata,
+    Column('station_id', Integer, ForeignKey('stations.id'), primary_key=True),
+    Column('day', Date, primary_key=True),
+    Column('temperature_sum', Float, nullable=False),
+    Column('reading_count', Integer, nullable=False),
+    Column('temperature_min', Float, nullable=False),
+    Column('temperature_max', Float, nullable=False),
+    Column('temperature_sum_squares', Float, nullable=False)
+)
+
+# Per station, month (first day of the month) and hour of day
+monthly_hourly_rollups = Table(
+    'temperature_monthly_hourly_rollups',
+    Base.metadata,
+    Column('station_id', Integer, ForeignKey('stations.id'), primary_key=True),
+    Column('month', Date, primary_key=True),
+    Column('hour', Integer, primary_key=True),
+    Column('temperature_sum', Float, nullable=False),
+    Column('reading_count', Integer, nullable=False),
+    Column('temperature_min', Float, nullable=False),
+    Column('temperature_max', Float, nullable=False),
+    Column('temperature_sum_squares', Float, nullable=False)
+)
+
+# Dialects with a month truncation expression; elsewhere readings are aggregated on the fly
+SUPPORTED_DIALECTS = ('postgresql', 'sqlite')
+
+def month_start(day: date) -> date:
+    """Get the first day of the month of a date."""
+    return day.replace(day=1)
+
+def next_month(day: date) -> date:
+    """Get the first day of the month following a date."""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def group_runs(values: List[date], step: Callable[[date], date]) -> List[Tuple[date, date]]:
+    """Group sorted values into runs where each value is `step` of the previous one."""
+    runs = []
+    for value in values:
+        if runs and step(runs[-1][1]) == value:
+            runs[-1] = (runs[-1][0], value)
+        else:
+            runs.append((value, value))
+    return runs
+
+class RollupRepository:
+    """Repository maintaining and reading the temperature rollup tables."""
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the rollups are maintained on this database."""
+        return self.db_session.get_bind().dialect.name in SUPPORTED_DIALECTS
+
+    def refresh(self, touched_days: Dict[int, Iterable[date]]) -> None:
+        """Recompute the daily and monthly rollups covering the given days of each station."""
+        if not self.enabled:
+            return
+        for station_id, days in touched_days.items():
+            days = sorted(set(days))
+            for first_day, last_day in group_runs(days, lambda day: day + timedelta(days=1)):
+                self._refresh_daily(station_id, first_day, last_day)
+            months = sorted({month_start(day) for day in days})
+            for first_month, last_month in group_runs(months, next_month):
+                self._refresh_monthly_hourly(station_id, first_month, last_month)
+
+    def get_daily(self, station_ids: List[int], first_day: date, last_day: date) -> List[tuple]:
+        """Get the daily rollups of stations between two days (inclusive).
+
+        Without rollups on this database, the same rows are aggregated from
+        the raw readings.
+        """
+        if not self.enabled:
+            day = cast(Temperature.timestamp, Date).label('day')
+            return self.db_session.execute(
+                self._aggregate(
+                    station_ids,
+                    datetime.combine(first_day, datetime.min.time()),
+                    datetime.combine(last_day + timedelta(days=1), datetime.min.time()),
+                    day
+                ).order_by(Temperature.station_id, day)
+            ).all()
+        return self.db_session.execute(
+            select(daily_rollups).where(
+                daily_rollups.c.station_id.in_(station_ids),
+                daily_rollups.c.day.between(first_day, last_day)
+            ).order_by(daily_rollups.c.station_id, daily_rollups.c.day)
+        ).all()
+
+    def get_hourly_sums(
+        self,
+        station_ids: List[int],
+        first_month: date,
+        end_month: date,
+        by_month: bool = False
+    ) -> List[tuple]:
+        """Get (station_id, [month of year,] hour, sum, count, min, max, sum of squares) of whole months in [first_month, end_month)."""
+        table = monthly_hourly_rollups
+        keys = [table.c.hour]
+        if by_month:
+            keys.insert(0, extract('month', table.c.month))
+        return self.db_session.execute(
+            select(
+                table.c.station_id,
+                *keys,
+                func.sum(table.c.temperature_sum),
+                func.sum(table.c.reading_count),
+                func.min(table.c.temperature_min),
+                func.max(table.c.temperature_max),
+                func.sum(table.c.temperature_sum_squares)
+            ).where(
+                table.c.station_id.in_(station_ids),
+                table.c.month >= first_month,
+                table.c.month < end_month
+            ).group_by(table.c.station_id, *keys)
+        ).all()
+
+    def _refresh_daily(self, station_id: int, first_day: date, last_day: date) -> None:
+        """Rebuild the daily rollups of a station for a run of days."""
+        day = func.date(Temperature.timestamp)
+        self.db_session.execute(delete(daily_rollups).where(
+            daily_rollups.c.station_id == station_id,
+            daily_rollups.c.day.between(first_day, last_day)
+        ))
+        self.db_session.execute(insert(daily_rollups).from_select(
+            [c.name for c in daily_rollups.c],
+            self._aggregate(
+                [station_id],
+                datetime.combine(first_day, datetime.min.time()),
+                datetime.combine(last_day + timedelta(days=1), datetime.min.time()),
+                day
+            )
+        ))
+
+    def _refresh_monthly_hourly(self, station_id: int, first_month: date, last_month: date) -> None:
+        """Rebuild the month x hour-of-day rollups of a station for a run of months."""
+        hour = cast(extract('hour', Temperature.timestamp), Integer)
+        self.db_session.execute(delete(monthly_hourly_rollups).where(
+            monthly_hourly_rollups.c.station_id == station_id,
+            monthly_hourly_rollups.c.month.between(first_month, last_month)
+        ))
+        self.db_session.execute(insert(monthly_hourly_rollups).from_select(
+            [c.name for c in monthly_hourly_rollups.c],
+            self._aggregate(
+                [station_id],
+                datetime.combine(first_month, datetime.min.time()),
+                datetime.combine(next_month(last_month), datetime.min.time()),
+                self._month_expression(),
+                hour
+            )
+        ))
+
+    def _aggregate(self, station_ids: List[int], start: datetime, end: datetime, *keys):
+        """Select the rollup statistics of stations' readings in [start, end) grouped by station and keys."""
+        temperature = Temperature.temperature
+        return select(
+            Temperature.station_id,
+            *keys,
+            func.sum(temperature).label('temperature_sum'),
+            func.count(Temperature.id).label('reading_count'),
+            func.min(temperature).label('temperature_min'),
+            func.max(temperature).label('temperature_max'),
+            func.sum(temperature * temperature).label('temperature_sum_squares')
+        ).where(
+            and_(
+                Temperature.station_id.in_(station_ids),
+                Temperature.timestamp >= start,
+                Temperature.timestamp < end
+            )
+        ).group_by(Temperature.station_id, *keys)
+
+    def _month_expression(self):
+        """Get the dialect-specific expression truncating a reading timestamp to its month."""
+        if self.db_session.get_bind().dialect.name == 'postgresql':
+            return cast(func.date_trunc('month', Temperature.timestamp), Date)
+        return func.date(Temperature.timestamp, 'start of month')
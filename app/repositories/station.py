@@ -1,11 +1,14 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from sqlalchemy.orm import Session
+from sqlalchemy import func, select
 from app.db.models import Station
 from .base import BaseRepository
 
 class StationRepository(BaseRepository[Station]):
     """Repository for station operations."""
     
+    bumps_data_version = True
+    
     def __init__(self, db_session: Session):
         super().__init__(Station, db_session)
 
@@ -30,4 +33,37 @@ class StationRepository(BaseRepository[Station]):
         station = self.get_by_code(station_data['code'])
         if station:
             return self.update(station.id, station_data)
-        return self.create(station_data) 
\ No newline at end of file
+        return self.create(station_data)
+
+    def bulk_upsert_by_code(self, stations: List[dict]) -> Dict[str, int]:
+        """Insert or update many stations by code in one transaction and return a code -> id map.
+
+        All stations are written with a single executemany INSERT ... ON
+        CONFLICT (code) DO UPDATE, then their ids are resolved with one
+        SELECT. Stations should carry the same fields; a repeated code keeps
+        its last entry.
+        """
+        rows = list({station['code']: station for station in stations}.values())
+        if not rows:
+            return {}
+
+        table = Station.__table__
+        insert = self._dialect_insert()
+        stmt = insert(table)
+        set_ = {
+            column: stmt.excluded[column]
+            for column in rows[0]
+            if column not in ('id', 'code', 'created_at', 'updated_at')
+        }
+        if 'created_at' in table.c:
+            stmt = stmt.values(created_at=func.current_timestamp(), updated_at=func.current_timestamp())
+            set_['updated_at'] = func.current_timestamp()
+        stmt = stmt.on_conflict_do_update(index_elements=['code'], set_=set_)
+        self.db_session.execute(stmt, rows)
+
+        codes = [row['code'] for row in rows]
+        ids = dict(self.db_session.execute(
+            select(Station.code, Station.id).where(Station.code.in_(codes))
+        ).all())
+        self._commit()
+        return ids
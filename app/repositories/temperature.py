@@ -1,15 +1,27 @@
-from typing import List, Optional
-from datetime import datetime
+import csv
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta
+from io import StringIO
+from itertools import islice
+import numpy as np
+import pandas as pd
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import Index, and_, extract, func, literal_column, select, text, tuple_
 from app.db.models import Temperature
 from .base import BaseRepository
+from .rollup import RollupRepository, month_start, next_month
+
+# Key of the readings upserts conflict on (migration fcb29cb0b5b5)
+Index('ix_temperatures_station_id_timestamp', Temperature.station_id, Temperature.timestamp, unique=True)
 
 class TemperatureRepository(BaseRepository[Temperature]):
     """Repository for temperature operations."""
     
+    bumps_data_version = True
+    
     def __init__(self, db_session: Session):
         super().__init__(Temperature, db_session)
+        self.rollups = RollupRepository(db_session)
 
     def get_by_station(self, station_id: int) -> List[Temperature]:
         """Get all temperature readings for a station."""
@@ -32,12 +44,426 @@ class TemperatureRepository(BaseRepository[Temperature]):
             )
         ).all()
 
+    def get_page_by_station_and_timestamp(
+        self,
+        limit: int = 1000,
+        after: Optional[Tuple[int, datetime]] = None,
+        station_id: Optional[int] = None
+    ) -> List[Temperature]:
+        """Get up to `limit` readings after the (station_id, timestamp) key `after` (keyset pagination), in key order."""
+        query = self.db_session.query(Temperature)
+        if station_id is not None:
+            query = query.filter(Temperature.station_id == station_id)
+        if after is not None:
+            query = query.filter(tuple_(Temperature.station_id, Temperature.timestamp) > tuple_(*after))
+        return query.order_by(Temperature.station_id, Temperature.timestamp).limit(limit).all()
+
+    def iter_by_station(self, station_id: int, chunk_size: int = 1000) -> Iterator[List[Temperature]]:
+        """Stream all temperature readings of a station in batches of `chunk_size`, in time order."""
+        return self._iter_batches(
+            select(Temperature).where(Temperature.station_id == station_id).order_by(Temperature.timestamp),
+            chunk_size
+        )
+
+    def iter_by_station_and_date_range(
+        self,
+        station_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        chunk_size: int = 1000
+    ) -> Iterator[List[Temperature]]:
+        """Stream temperature readings of a station within a date range in batches of `chunk_size`, in time order."""
+        return self._iter_batches(
+            select(Temperature).where(
+                Temperature.station_id == station_id,
+                Temperature.timestamp >= start_date,
+                Temperature.timestamp <= end_date
+            ).order_by(Temperature.timestamp),
+            chunk_size
+        )
+
     def get_latest_by_station(self, station_id: int) -> Optional[Temperature]:
         """Get the latest temperature reading for a station."""
         return self.db_session.query(Temperature).filter(
             Temperature.station_id == station_id
         ).order_by(Temperature.timestamp.desc()).first()
 
+    def get_series(
+        self,
+        station_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[tuple]:
+        """Get (timestamp, temperature) rows of a station within a date range, in time order, without ORM objects."""
+        return self.db_session.execute(
+            select(Temperature.timestamp, Temperature.temperature).where(
+                Temperature.station_id == station_id,
+                Temperature.timestamp >= start_date,
+                Temperature.timestamp <= end_date
+            ).order_by(Temperature.timestamp)
+        ).all()
+
+    def get_arrays_by_station(self, station_id: int, dtype=np.float32) -> Tuple[np.ndarray, np.ndarray]:
+        """Get all timestamps (datetime64[us]) and temperatures of a station as NumPy arrays, in time order."""
+        return self._fetch_arrays(dtype, Temperature.station_id == station_id)
+
+    def get_arrays_by_station_and_date_range(
+        self,
+        station_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        dtype=np.float32
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get timestamps (datetime64[us]) and temperatures of a station within a date range as NumPy arrays, in time order."""
+        return self._fetch_arrays(
+            dtype,
+            Temperature.station_id == station_id,
+            Temperature.timestamp >= start_date,
+            Temperature.timestamp <= end_date
+        )
+
+    def get_frame_by_station_and_date_range(
+        self,
+        station_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        dtype=np.float32
+    ) -> pd.DataFrame:
+        """Get the timestamp and temperature columns of a station within a date range as a DataFrame."""
+        timestamps, temperatures = self.get_arrays_by_station_and_date_range(station_id, start_date, end_date, dtype)
+        return pd.DataFrame({'timestamp': timestamps, 'temperature': temperatures})
+
+    def _fetch_arrays(self, dtype, *conditions, chunk_size: int = 50000) -> Tuple[np.ndarray, np.ndarray]:
+        """Select only timestamp and temperature with Core and fill arrays chunk by chunk, without ORM objects.
+
+        Rows are streamed (a server-side cursor where supported), so only one
+        chunk of Python rows is held at a time.
+        """
+        result = self.db_session.execute(
+            select(Temperature.timestamp, Temperature.temperature)
+            .where(*conditions)
+            .order_by(Temperature.timestamp)
+            .execution_options(stream_results=True, max_row_buffer=chunk_size)
+        )
+        timestamp_chunks = []
+        temperature_chunks = []
+        try:
+            for rows in result.partitions(chunk_size):
+                timestamps, temperatures = zip(*rows)
+                timestamp_chunks.append(np.array(timestamps, dtype='datetime64[us]'))
+                temperature_chunks.append(np.array(temperatures, dtype=dtype))
+        finally:
+            result.close()
+        if not timestamp_chunks:
+            return np.array([], dtype='datetime64[us]'), np.array([], dtype=dtype)
+        return np.concatenate(timestamp_chunks), np.concatenate(temperature_chunks)
+
+    def get_daily_coverage(
+        self,
+        station_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[date, int]:
+        """Get the number of stored readings per day for a station within a date range."""
+        day = func.date(Temperature.timestamp)
+        rows = self.db_session.query(day, func.count(Temperature.id)).filter(
+            and_(
+                Temperature.station_id == station_id,
+                Temperature.timestamp >= start_date,
+                Temperature.timestamp <= end_date
+            )
+        ).group_by(day).all()
+        # SQLite returns dates as ISO strings
+        return {
+            date.fromisoformat(d) if isinstance(d, str) else d: count
+            for d, count in rows
+        }
+
+    def get_hourly_stats(
+        self,
+        station_ids: List[int],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[int, Dict[int, Dict[str, float]]]:
+        """Get per-hour-of-day AVG/COUNT/MIN/MAX of temperature for stations within a date range.
+
+        Whole months inside the range are read from the month x hour rollups
+        and only the partial months at its edges are aggregated from the raw
+        readings, so at most 24 rows per station are returned regardless of
+        the range length.
+        """
+        totals = self._aggregate_sums(station_ids, start_date, end_date, by_month=False)
+        return {
+            station_id: {
+                hour: {'avg': total / count, 'count': count, 'min': min_temp, 'max': max_temp}
+                for (hour,), (total, count, min_temp, max_temp, _) in sorted(groups.items())
+            }
+            for station_id, groups in totals.items()
+        }
+
+    def get_monthly_hourly_stats(
+        self,
+        station_ids: List[int],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[int, Dict[tuple, Dict[str, float]]]:
+        """Get per (month of year, hour of day) SUM/COUNT/MIN/MAX/SUM of squares of temperature for stations.
+
+        Like get_hourly_stats, whole months are read from the rollups. The
+        sums let callers merge months into seasons and derive the standard
+        deviation.
+        """
+        totals = self._aggregate_sums(station_ids, start_date, end_date, by_month=True)
+        return {
+            station_id: {
+                key: {'sum': total, 'count': count, 'min': min_temp, 'max': max_temp, 'sum_squares': sum_squares}
+                for key, (total, count, min_temp, max_temp, sum_squares) in sorted(groups.items())
+            }
+            for station_id, groups in totals.items()
+        }
+
+    def _aggregate_sums(
+        self,
+        station_ids: List[int],
+        start_date: datetime,
+        end_date: datetime,
+        by_month: bool
+    ) -> Dict[int, Dict[tuple, tuple]]:
+        """Merge rollup and raw-reading sums per station and (month of year,) hour of day."""
+        # Whole months are those in [first_month, end_month)
+        first_month = month_start(start_date.date())
+        if datetime.combine(first_month, datetime.min.time()) < start_date:
+            first_month = next_month(start_date.date())
+        end_month = month_start((end_date + timedelta(microseconds=1)).date())
+
+        if first_month < end_month and self.rollups.enabled:
+            first_month_start = datetime.combine(first_month, datetime.min.time())
+            end_month_start = datetime.combine(end_month, datetime.min.time())
+            rows = (
+                self._reading_sums(station_ids, by_month, Temperature.timestamp >= start_date, Temperature.timestamp < first_month_start)
+                + self.rollups.get_hourly_sums(station_ids, first_month, end_month, by_month)
+                + self._reading_sums(station_ids, by_month, Temperature.timestamp >= end_month_start, Temperature.timestamp <= end_date)
+            )
+        else:
+            rows = self._reading_sums(station_ids, by_month, Temperature.timestamp >= start_date, Temperature.timestamp <= end_date)
+
+        key_length = 2 if by_month else 1
+        totals = {station_id: {} for station_id in station_ids}
+        for row in rows:
+            # PostgreSQL returns EXTRACT as numeric
+            key = tuple(int(part) for part in row[1:1 + key_length])
+            total, count, min_temp, max_temp, sum_squares = row[1 + key_length:]
+            current = totals[row[0]].get(key)
+            if current is not None:
+                total += current[0]
+                count += current[1]
+                min_temp = min(min_temp, current[2])
+                max_temp = max(max_temp, current[3])
+                sum_squares += current[4]
+            totals[row[0]][key] = (total, count, min_temp, max_temp, sum_squares)
+        return totals
+
+    def _reading_sums(self, station_ids: List[int], by_month: bool, *conditions) -> List[tuple]:
+        """Get (station_id, [month,] hour, sum, count, min, max, sum of squares) of the raw readings matching the conditions."""
+        keys = [extract('hour', Temperature.timestamp)]
+        if by_month:
+            keys.insert(0, extract('month', Temperature.timestamp))
+        temperature = Temperature.temperature
+        return self.db_session.query(
+            Temperature.station_id,
+            *keys,
+            func.sum(temperature),
+            func.count(Temperature.id),
+            func.min(temperature),
+            func.max(temperature),
+            func.sum(temperature * temperature)
+        ).filter(
+            and_(Temperature.station_id.in_(station_ids), *conditions)
+        ).group_by(Temperature.station_id, *keys).all()
+
+    def create(self, obj_in: dict, refresh: bool = True) -> Temperature:
+        """Create a temperature reading and refresh the rollups of its day."""
+        db_obj = Temperature(**obj_in)
+        self.db_session.add(db_obj)
+        self.db_session.flush()
+        self.rollups.refresh(self._touched_days([self._reading_key(db_obj)]))
+        self._commit()
+        if refresh and not self.in_unit_of_work():
+            self.db_session.refresh(db_obj)
+        return db_obj
+
+    def update(self, id: int, obj_in: dict, refresh: bool = True) -> Optional[Temperature]:
+        """Update a temperature reading and refresh the rollups of its old and new day."""
+        db_obj = self.db_session.get(Temperature, id)
+        if db_obj:
+            touched = self._touched_days([self._reading_key(db_obj)])
+            for key, value in obj_in.items():
+                setattr(db_obj, key, value)
+            self.db_session.flush()
+            self.rollups.refresh(self._touched_days([self._reading_key(db_obj)], touched))
+            self._commit()
+            if refresh and not self.in_unit_of_work():
+                self.db_session.refresh(db_obj)
+        return db_obj
+
+    def delete(self, id: int) -> bool:
+        """Delete a temperature reading and refresh the rollups of its day."""
+        db_obj = self.db_session.get(Temperature, id)
+        if db_obj:
+            touched = self._touched_days([self._reading_key(db_obj)])
+            self.db_session.delete(db_obj)
+            self.db_session.flush()
+            self.rollups.refresh(touched)
+            self._commit()
+            return True
+        return False
+
+    def bulk_create(self, objs_in: List[dict]) -> List[Temperature]:
+        """Create multiple temperature readings in bulk and refresh their rollups."""
+        return self.bulk_create_temperatures(objs_in)
+
     def bulk_create_temperatures(self, temperatures: List[dict]) -> List[Temperature]:
-        """Create multiple temperature readings in bulk."""
-        return self.bulk_create(temperatures) 
\ No newline at end of file
+        """Create multiple temperature readings in bulk and refresh their rollups."""
+        db_objs = [Temperature(**obj_in) for obj_in in temperatures]
+        self.db_session.bulk_save_objects(db_objs)
+        self.rollups.refresh(self._touched_days(temperatures))
+        self._commit()
+        return db_objs
+
+    def bulk_upsert_temperatures(self, temperatures: Iterable[dict], batch_size: int = 5000) -> Dict[str, int]:
+        """Insert or update temperature readings keyed by (station_id, timestamp).
+
+        Rows are written with Core-level executemany INSERT ... ON CONFLICT
+        DO UPDATE statements in batches, without building ORM objects, so
+        re-ingesting the same readings is idempotent. Requires the unique
+        index on (station_id, timestamp) and, on SQLite, version 3.35 or
+        later for RETURNING.
+        """
+        table = Temperature.__table__
+        insert = self._dialect_insert()
+        stmt = insert(table)
+        set_ = {'temperature': stmt.excluded.temperature}
+        # Audit timestamps are computed by the database instead of binding
+        # two extra datetime parameters per row
+        if 'created_at' in table.c:
+            stmt = stmt.values(created_at=func.current_timestamp(), updated_at=func.current_timestamp())
+            set_['updated_at'] = func.current_timestamp()
+        stmt = stmt.on_conflict_do_update(index_elements=['station_id', 'timestamp'], set_=set_)
+        # Inserted and updated rows are told apart from what the upsert
+        # returns: xmax is 0 on rows PostgreSQL inserted, and on SQLite
+        # inserted rows get ids above the previous maximum
+        postgresql = self.db_session.get_bind().dialect.name == 'postgresql'
+        stmt = stmt.returning(literal_column('xmax = 0') if postgresql else table.c.id)
+
+        counts = {'inserted': 0, 'updated': 0}
+        touched = {}
+        readings = iter(temperatures)
+        while True:
+            batch = list(islice(readings, batch_size))
+            if not batch:
+                break
+            rows = self._prepare_upsert_rows(batch)
+            if postgresql:
+                inserted = sum(1 for is_new in self.db_session.execute(stmt, rows).scalars() if is_new)
+            else:
+                last_id = self.db_session.execute(select(func.max(table.c.id))).scalar() or 0
+                inserted = sum(1 for id in self.db_session.execute(stmt, rows).scalars() if id > last_id)
+            self._touched_days(rows, touched)
+            counts['inserted'] += inserted
+            counts['updated'] += len(rows) - inserted
+        self.rollups.refresh(touched)
+        self._commit()
+        return counts
+
+    def _touched_days(self, readings: Iterable[dict], touched: Optional[Dict[int, Set[date]]] = None) -> Dict[int, Set[date]]:
+        """Collect the days each station has readings on, for refreshing rollups."""
+        touched = {} if touched is None else touched
+        for reading in readings:
+            touched.setdefault(reading['station_id'], set()).add(reading['timestamp'].date())
+        return touched
+
+    def _reading_key(self, db_obj: Temperature) -> dict:
+        """Get the station and timestamp of a reading, as consumed by _touched_days."""
+        return {'station_id': db_obj.station_id, 'timestamp': db_obj.timestamp}
+
+    def _prepare_upsert_rows(self, batch: List[dict]) -> List[dict]:
+        """Keep only table columns and drop in-batch duplicates (last one wins)."""
+        rows = {}
+        for reading in batch:
+            rows[(reading['station_id'], reading['timestamp'])] = {
+                'station_id': reading['station_id'],
+                'temperature': reading['temperature'],
+                'timestamp': reading['timestamp']
+            }
+        return list(rows.values())
+
+    def copy_upsert_temperatures(self, temperatures: Iterable[dict], batch_size: int = 50000) -> Dict[str, int]:
+        """Ingest temperature readings through PostgreSQL COPY and a set-based upsert.
+
+        Readings are streamed in CSV batches with COPY FROM STDIN into a
+        temporary staging table (reused and emptied when several calls share
+        a transaction, as in a unit of work), then merged into the temperatures table with
+        a single INSERT ... SELECT ... ON CONFLICT DO UPDATE. Other databases
+        fall back to bulk_upsert_temperatures.
+        """
+        if self.db_session.get_bind().dialect.name != 'postgresql':
+            return self.bulk_upsert_temperatures(temperatures)
+
+        table = Temperature.__tablename__
+        connection = self.db_session.connection()
+        connection.execute(text(
+            "CREATE TEMPORARY TABLE IF NOT EXISTS temperatures_staging ("
+            "seq bigserial, station_id integer NOT NULL, "
+            "temperature double precision NOT NULL, timestamp timestamp NOT NULL"
+            ") ON COMMIT DROP"
+        ))
+        connection.execute(text("TRUNCATE temperatures_staging"))
+
+        touched = {}
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            readings = iter(temperatures)
+            while True:
+                batch = list(islice(readings, batch_size))
+                if not batch:
+                    break
+                self._touched_days(batch, touched)
+                cursor.copy_expert(
+                    "COPY temperatures_staging (station_id, temperature, timestamp) FROM STDIN WITH (FORMAT csv)",
+                    self._to_csv(batch)
+                )
+        finally:
+            cursor.close()
+
+        # Audit timestamps are set the same way as in bulk_upsert_temperatures
+        columns = ['station_id', 'temperature', 'timestamp']
+        values = list(columns)
+        updates = ['temperature = EXCLUDED.temperature']
+        if 'created_at' in Temperature.__table__.c:
+            columns += ['created_at', 'updated_at']
+            values += ['now()', 'now()']
+            updates.append('updated_at = EXCLUDED.updated_at')
+
+        # DISTINCT ON keeps the last staged reading of each key
+        inserted, updated = connection.execute(text(
+            f"WITH merged AS ("
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT DISTINCT ON (station_id, timestamp) {', '.join(values)} "
+            f"FROM temperatures_staging ORDER BY station_id, timestamp, seq DESC "
+            f"ON CONFLICT (station_id, timestamp) DO UPDATE "
+            f"SET {', '.join(updates)} "
+            f"RETURNING (xmax = 0) AS inserted"
+            f") SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged"
+        )).one()
+        self.rollups.refresh(touched)
+        self._commit()
+        return {'inserted': inserted, 'updated': updated}
+
+    def _to_csv(self, batch: List[dict]) -> StringIO:
+        """Encode readings as the CSV stream consumed by COPY."""
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        for reading in batch:
+            writer.writerow((reading['station_id'], reading['temperature'], reading['timestamp'].isoformat(sep=' ')))
+        buffer.seek(0)
+        return buffer
@@ -0,0 +1,160 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+def hourly_means_matrix(stats: Dict[int, Dict[int, Dict]], station_ids: List[int]) -> np.ndarray:
+    """
+    Arrange per-hour-of-day averages into a stations x 24 matrix.
+
+    Args:
+        stats: Per-station, per-hour statistics as returned by
+            TemperatureRepository.get_hourly_stats
+        station_ids: Stations in row order
+
+    Returns:
+        Matrix of hourly averages, NaN where a station has no readings at that hour
+    """
+    means = np.full((len(station_ids), 24), np.nan)
+    for row, station_id in enumerate(station_ids):
+        hours = stats.get(station_id, {})
+        if hours:
+            means[row, list(hours)] = [hour_stats['avg'] for hour_stats in hours.values()]
+    return means
+
+def pairwise_differences(means: np.ndarray) -> np.ndarray:
+    """
+    Compute the mean hourly temperature difference between every pair of stations.
+
+    Differences are taken hour by hour with broadcasting and averaged over
+    the hours both stations have readings for.
+
+    Args:
+        means: Stations x 24 matrix of hourly averages
+
+    Returns:
+        Stations x stations matrix where entry (i, j) is station i minus station j,
+        NaN for pairs without a common hour
+    """
+    differences = means[:, np.newaxis, :] - means[np.newaxis, :, :]
+    valid = ~np.isnan(differences)
+    counts = valid.sum(axis=2)
+    totals = np.where(valid, differences, 0.0).sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, totals / counts, np.nan)
+
+def to_json_list(array: np.ndarray) -> List[List[Optional[float]]]:
+    """
+    Convert a float matrix into nested lists with NaN replaced by None.
+
+    Args:
+        array: Float matrix
+
+    Returns:
+        JSON-serializable nested lists
+    """
+    return np.where(np.isnan(array), None, array).tolist()
+
+SEASONS = ['Summer', 'Autumn', 'Winter', 'Spring']
+
+# Meteorological seasons of the Southern Hemisphere; the Northern one is shifted by two seasons
+SOUTHERN_SEASON_BY_MONTH = {
+    12: 'Summer', 1: 'Summer', 2: 'Summer',
+    3: 'Autumn', 4: 'Autumn', 5: 'Autumn',
+    6: 'Winter', 7: 'Winter', 8: 'Winter',
+    9: 'Spring', 10: 'Spring', 11: 'Spring'
+}
+
+def season_of_month(month: int, latitude: float) -> str:
+    """
+    Get the meteorological season of a month at a latitude.
+
+    Args:
+        month: Month of the year (1-12)
+        latitude: Station latitude; negative in the Southern Hemisphere
+
+    Returns:
+        One of 'Summer', 'Autumn', 'Winter' or 'Spring'
+    """
+    season = SOUTHERN_SEASON_BY_MONTH[month]
+    if latitude >= 0:
+        season = SEASONS[(SEASONS.index(season) + 2) % 4]
+    return season
+
+def seasonal_hourly_stats(monthly: Dict[tuple, Dict], latitude: float) -> Dict[str, Dict[int, Dict]]:
+    """
+    Merge (month of year, hour) sums into per season and hour statistics.
+
+    Args:
+        monthly: Sums keyed by (month, hour) as returned by
+            TemperatureRepository.get_monthly_hourly_stats
+        latitude: Station latitude, selecting the hemisphere
+
+    Returns:
+        Mapping of season to hour to mean, min, max, std (sample) and count
+    """
+    sums = {}
+    for (month, hour), stats in monthly.items():
+        key = (season_of_month(month, latitude), hour)
+        current = sums.get(key)
+        if current is None:
+            sums[key] = dict(stats)
+        else:
+            current['sum'] += stats['sum']
+            current['count'] += stats['count']
+            current['min'] = min(current['min'], stats['min'])
+            current['max'] = max(current['max'], stats['max'])
+            current['sum_squares'] += stats['sum_squares']
+
+    seasons = {season: {} for season in SEASONS}
+    for (season, hour), stats in sums.items():
+        count = stats['count']
+        mean = stats['sum'] / count
+        std = None
+        if count > 1:
+            variance = (stats['sum_squares'] - stats['sum'] * mean) / (count - 1)
+            std = float(np.sqrt(max(variance, 0.0)))
+        seasons[season][hour] = {
+            'mean': mean,
+            'min': stats['min'],
+            'max': stats['max'],
+            'std': std,
+            'count': count
+        }
+    return seasons
+
+def seasonal_hourly_medians(
+    timestamps: np.ndarray,
+    temperatures: np.ndarray,
+    latitude: float
+) -> Dict[str, Dict[int, float]]:
+    """
+    Compute the median temperature per season and hour from raw readings.
+
+    Medians cannot be merged from rollups, so this needs every reading.
+
+    Args:
+        timestamps: Reading timestamps (datetime64)
+        temperatures: Reading temperatures
+        latitude: Station latitude, selecting the hemisphere
+
+    Returns:
+        Mapping of season to hour to median temperature
+    """
+    seasons = {season: {} for season in SEASONS}
+    if len(timestamps) == 0:
+        return seasons
+
+    months = timestamps.astype('datetime64[M]').astype(int) % 12 + 1
+    hours = (timestamps.astype('datetime64[h]') - timestamps.astype('datetime64[D]')).astype(int)
+    season_index = np.array([SEASONS.index(season_of_month(month, latitude)) for month in range(1, 13)])[months - 1]
+
+    # Sort by (season, hour) once, then split into contiguous groups
+    keys = season_index * 24 + hours
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    temperatures = temperatures[order]
+    boundaries = np.flatnonzero(np.diff(keys)) + 1
+    for group_keys, values in zip(np.split(keys, boundaries), np.split(temperatures, boundaries)):
+        season, hour = divmod(int(group_keys[0]), 24)
+        seasons[SEASONS[season]][hour] = float(np.median(values))
+    return seasons
@@ -0,0 +1,122 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+BUCKETS = ['hour', 'day', 'week', 'month']
+
+def choose_bucket(start_date: datetime, end_date: datetime, max_points: int) -> str:
+    """
+    Choose the finest bucket that keeps a range within a point budget.
+
+    Args:
+        start_date: Start of the range
+        end_date: End of the range
+        max_points: Maximum number of points per series
+
+    Returns:
+        One of 'hour', 'day', 'week' or 'month'
+    """
+    hours = (end_date - start_date).total_seconds() / 3600
+    for bucket, hours_per_point in (('hour', 1), ('day', 24), ('week', 24 * 7)):
+        if hours / hours_per_point <= max_points:
+            return bucket
+    return 'month'
+
+def bucket_start(day: date, bucket: str) -> date:
+    """
+    Get the first day of the bucket a day falls in.
+
+    Args:
+        day: Day to place
+        bucket: 'day', 'week' (starting on Monday) or 'month'
+
+    Returns:
+        First day of the bucket
+    """
+    if bucket == 'day':
+        return day
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    raise ValueError(f"Unsupported bucket: {bucket}")
+
+def aggregate_daily(rows: Iterable, bucket: str) -> List[Dict]:
+    """
+    Merge daily rollup rows into day, week or month points.
+
+    Args:
+        rows: Daily rollups in day order, with day, temperature_sum,
+            reading_count, temperature_min and temperature_max
+        bucket: 'day', 'week' or 'month'
+
+    Returns:
+        Points with timestamp, avg, min, max and count, in time order
+    """
+    merged = {}
+    for row in rows:
+        key = bucket_start(row.day, bucket)
+        current = merged.get(key)
+        if current is None:
+            merged[key] = [row.temperature_sum, row.reading_count, row.temperature_min, row.temperature_max]
+        else:
+            current[0] += row.temperature_sum
+            current[1] += row.reading_count
+            current[2] = min(current[2], row.temperature_min)
+            current[3] = max(current[3], row.temperature_max)
+
+    return [
+        {
+            'timestamp': datetime.combine(key, datetime.min.time()),
+            'avg': total / count,
+            'min': min_temp,
+            'max': max_temp,
+            'count': count
+        }
+        for key, (total, count, min_temp, max_temp) in merged.items()
+    ]
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the points of a series to keep with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Every other bucket keeps the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves the visual shape
+    (peaks and troughs) of the series.
+
+    Args:
+        x: Point positions, increasing
+        y: Point values
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = x.astype(float)
+    y = y.astype(float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        indices[i + 1] = previous
+    return indices
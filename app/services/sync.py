@@ -0,0 +1,202 @@
+import logging
+from datetime import date, datetime, timedelta
+from itertools import chain, islice
+from typing import Dict, List, Optional
+
+from app.repositories.rollup import group_runs
+from app.repositories.temperature import TemperatureRepository
+from app.services.weather.base import WeatherServiceBase
+
+logger = logging.getLogger(__name__)
+
+class IncrementalSync:
+    """Fetch only the days a station is missing in the database."""
+
+    def __init__(
+        self,
+        service: WeatherServiceBase,
+        temperature_repo: TemperatureRepository,
+        interval: str = 'hourly',
+        stale_days: int = 2,
+        batch_size: int = 5000
+    ):
+        """
+        Initialize the incremental sync.
+
+        Args:
+            service: Weather service to fetch readings from
+            temperature_repo: Repository holding the stored readings
+            interval: Data interval requested from the service ('hourly' or 'daily')
+            stale_days: Number of most recent days that are always re-fetched,
+                since providers may still be completing them
+            batch_size: Number of readings streamed into each bulk upsert
+        """
+        self.service = service
+        self.temperature_repo = temperature_repo
+        self.interval = interval
+        self.stale_days = stale_days
+        self.batch_size = batch_size
+        self.readings_per_day = 24 if interval == 'hourly' else 1
+
+    def missing_days(self, station_id: int, start_date: datetime, end_date: datetime) -> List[date]:
+        """
+        Find the days in a range that are missing, incomplete or stale.
+
+        Args:
+            station_id: Database station ID
+            start_date: Start date for the data range
+            end_date: End date for the data range
+
+        Returns:
+            Days to fetch, in date order
+        """
+        coverage = self.temperature_repo.get_daily_coverage(station_id, start_date, end_date)
+        # "Today" in the provider's time zone, as used to decide which day files are final
+        today = datetime.now(getattr(self.service, 'TIMEZONE', None)).date()
+        stale_after = today - timedelta(days=self.stale_days)
+
+        days = []
+        day = start_date.date()
+        while day <= end_date.date():
+            if coverage.get(day, 0) < self.readings_per_day or day > stale_after:
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def _resolve_start(self, station_id: int, start_date: Optional[datetime]) -> datetime:
+        """
+        Resolve the start of the sync range.
+
+        Without an explicit start, the sync resumes from the day of the
+        latest stored reading.
+
+        Args:
+            station_id: Database station ID
+            start_date: Requested start date, if any
+
+        Returns:
+            Start date for the data range
+
+        Raises:
+            ValueError: If no start date is given and the station has no readings
+        """
+        if start_date is not None:
+            return start_date
+        latest = self.temperature_repo.get_latest_by_station(station_id)
+        if latest is None:
+            raise ValueError(f"Station {station_id} has no readings; a start date is required")
+        return datetime.combine(latest.timestamp.date(), datetime.min.time())
+
+    def sync_station(
+        self,
+        station_id: int,
+        provider_station_id: str,
+        start_date: Optional[datetime],
+        end_date: datetime
+    ) -> int:
+        """
+        Fetch and store the readings a station is missing within a date range.
+
+        Args:
+            station_id: Database station ID
+            provider_station_id: Station identifier used by the weather service
+            start_date: Start date for the data range (None resumes from the latest reading)
+            end_date: End date for the data range
+
+        Returns:
+            Number of new readings stored
+        """
+        return self.sync_stations({station_id: provider_station_id}, start_date, end_date)
+
+    def sync_stations(
+        self,
+        stations: Dict[int, str],
+        start_date: Optional[datetime],
+        end_date: datetime
+    ) -> int:
+        """
+        Fetch and store the readings several stations are missing within a date range.
+
+        Readings are streamed from the service and upserted in batches. Services
+        that can extract many stations per request (SMN) fetch each missing
+        day once for all stations.
+
+        Args:
+            stations: Mapping of database station ID to provider station identifier
+            start_date: Start date for the data range (None resumes from each station's latest reading)
+            end_date: End date for the data range
+
+        Returns:
+            Number of new readings stored
+        """
+        starts = {station_id: self._resolve_start(station_id, start_date) for station_id in stations}
+        missing = {
+            station_id: set(self.missing_days(station_id, starts[station_id], end_date))
+            for station_id in stations
+        }
+        all_days = sorted(set().union(*missing.values()))
+        if not all_days:
+            logger.info("All stations are up to date")
+            return 0
+
+        stored = 0
+        # Several database stations may share a provider station
+        by_provider_id = {}
+        for station_id, provider_id in stations.items():
+            by_provider_id.setdefault(provider_id, []).append(station_id)
+        for first_day, last_day in group_runs(all_days, lambda day: day + timedelta(days=1)):
+            run_start = datetime.combine(first_day, datetime.min.time())
+            run_end = datetime.combine(last_day, datetime.max.time())
+            logger.info(f"Fetching {first_day} to {last_day} for {len(stations)} station(s)")
+
+            if hasattr(self.service, 'iter_temperature_data_many'):
+                readings = self.service.iter_temperature_data_many(
+                    list(by_provider_id), run_start, run_end, self.interval
+                )
+            else:
+                readings = chain.from_iterable(
+                    self.service.iter_temperature_data(provider_id, run_start, run_end, self.interval)
+                    for provider_id in by_provider_id
+                )
+
+            while True:
+                batch = list(islice(readings, self.batch_size))
+                if not batch:
+                    break
+                stored += self._store(batch, by_provider_id, missing)
+
+        return stored
+
+    def _store(
+        self,
+        readings: List[Dict],
+        by_provider_id: Dict[str, List[int]],
+        missing: Dict[int, set]
+    ) -> int:
+        """
+        Upsert a batch of readings falling on the days stations were missing.
+
+        Readings already stored are updated in place through the unique
+        (station_id, timestamp) index, so stale days pick up revised values.
+
+        Args:
+            readings: Readings returned by the weather service
+            by_provider_id: Mapping of provider station identifier to the database station IDs using it
+            missing: Days each station was missing
+
+        Returns:
+            Number of new readings stored
+        """
+        rows = []
+        for reading in readings:
+            timestamp = reading['timestamp']
+            for station_id in by_provider_id[reading['station_id']]:
+                if timestamp.date() in missing[station_id]:
+                    rows.append({
+                        'station_id': station_id,
+                        'temperature': reading['temperature'],
+                        'timestamp': timestamp
+                    })
+        if not rows:
+            return 0
+        return self.temperature_repo.bulk_upsert_temperatures(rows)['inserted']
@@ -1,36 +1,200 @@
-from datetime import datetime
-from typing import Dict, List
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from .base import WeatherServiceBase
+from .catalog import StationCatalog
 
 class AEMETService(WeatherServiceBase):
     """AEMET weather service implementation."""
     
-    def __init__(self, api_key: str):
+    # The daily climatological endpoint rejects ranges longer than six months
+    MAX_DAYS_PER_REQUEST = 180
+    
+    def __init__(
+        self,
+        api_key: str,
+        max_workers: int = 4,
+        requests_per_second: Optional[float] = None,
+        max_days_per_request: int = MAX_DAYS_PER_REQUEST,
+        metadata_ttl: Optional[float] = 86400,
+        metadata_snapshot_path: Optional[str] = None
+    ):
         """
         Initialize the AEMET weather service.
         
         Args:
             api_key: AEMET API key
+            max_workers: Number of date-range chunks fetched concurrently
+            requests_per_second: Rate limit for requests to the AEMET host
+            max_days_per_request: Maximum number of days covered by one query
+            metadata_ttl: Seconds before the station inventory is downloaded again
+            metadata_snapshot_path: JSON file persisting the station inventory
         """
+        if max_days_per_request < 1:
+            raise ValueError("max_days_per_request must be at least 1")
         super().__init__(
             api_key=api_key,
-            base_url="https://opendata.aemet.es/opendata/api"
+            base_url="https://opendata.aemet.es/opendata/api",
+            max_workers=max_workers,
+            requests_per_second=requests_per_second
+        )
+        self.max_days_per_request = max_days_per_request
+        self.station_catalog = StationCatalog(
+            load_inventory=self._load_station_inventory,
+            ttl=metadata_ttl,
+            snapshot_path=metadata_snapshot_path
         )
         
-    def get_station_metadata(self, station_id: str) -> Dict:
+    def _generate_metadata_url(self) -> str:
         """
-        Get metadata for a specific AEMET weather station.
+        Generate URL for the stations inventory.
+        
+        Returns:
+            URL string
+        """
+        return f"{self.base_url}/valores/climatologicos/inventarioestaciones/todasestaciones"
+        
+    def _generate_data_url(self, station_id: str, start_date: datetime, end_date: datetime) -> str:
+        """
+        Generate URL for daily climatological data.
         
         Args:
             station_id: AEMET station identifier
+            start_date: First day of the query
+            end_date: Last day of the query
             
         Returns:
-            Dictionary containing station metadata
+            URL string
+        """
+        # Format dates for AEMET API
+        start_str = start_date.strftime('%Y-%m-%dT00:00:00UTC')
+        end_str = end_date.strftime('%Y-%m-%dT23:59:59UTC')
+        return (
+            f"{self.base_url}/valores/climatologicos/diarios/datos"
+            f"/fechaini/{start_str}/fechafin/{end_str}/estacion/{station_id}"
+        )
+        
+    def _split_date_range(self, start_date: datetime, end_date: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Split a date range into consecutive chunks accepted by the API.
+        
+        Args:
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            
+        Returns:
+            List of (chunk_start, chunk_end) tuples in date order
+        """
+        chunks = []
+        chunk_start = start_date
+        while chunk_start.date() <= end_date.date():
+            chunk_end = min(chunk_start + timedelta(days=self.max_days_per_request - 1), end_date)
+            chunks.append((chunk_start, chunk_end))
+            chunk_start = datetime.combine(chunk_end.date() + timedelta(days=1), datetime.min.time())
+        return chunks
+        
+    def _get_data_url(self, response: Dict) -> Optional[str]:
+        """
+        Get the data URL from the first step of an AEMET query.
+        
+        Args:
+            response: Response of the query endpoint
+            
+        Returns:
+            Data URL, or None if AEMET reports no data for the query (estado 404)
+            
+        Raises:
+            ValueError: If AEMET reports any other error, e.g. an invalid API key
+                (401) or an exceeded quota (429)
+        """
+        if 'datos' in response:
+            return response['datos']
+        if response.get('estado') == 404:
+            return None
+        raise ValueError(
+            f"AEMET API error {response.get('estado')}: {response.get('descripcion', 'no data URL returned')}"
+        )
+        
+    def _fetch_chunk(self, station_id: str, chunk: Tuple[datetime, datetime]) -> List[Dict]:
+        """
+        Fetch and transform the daily data for one date-range chunk.
+        
+        Args:
+            station_id: AEMET station identifier
+            chunk: (chunk_start, chunk_end) tuple
+            
+        Returns:
+            List of dictionaries containing temperature data
         """
-        endpoint = f"valores/climatologicos/inventarioestaciones/todasestaciones"
         response = self._make_request(
-            endpoint,
+            self._generate_data_url(station_id, *chunk),
+            params={'api_key': self.api_key}
+        )
+        
+        data_url = self._get_data_url(response)
+        if data_url is None:
+            return []
+            
+        temperature_data = self._make_request(data_url)
+        
+        return self._transform_entries(temperature_data, station_id)
+        
+    async def _fetch_chunk_async(self, station_id: str, chunk: Tuple[datetime, datetime]) -> List[Dict]:
+        """
+        Fetch and transform the daily data for one date-range chunk on the async backend.
+        
+        Args:
+            station_id: AEMET station identifier
+            chunk: (chunk_start, chunk_end) tuple
+            
+        Returns:
+            List of dictionaries containing temperature data
+        """
+        response = await self._make_request_async(
+            self._generate_data_url(station_id, *chunk),
+            params={'api_key': self.api_key}
+        )
+        
+        data_url = self._get_data_url(response)
+        if data_url is None:
+            return []
+            
+        temperature_data = await self._make_request_async(data_url)
+        return self._transform_entries(temperature_data, station_id)
+        
+    def _transform_entries(self, temperature_data: List[Dict], station_id: str) -> List[Dict]:
+        """
+        Transform AEMET daily entries into our standard format.
+        
+        Args:
+            temperature_data: Entries returned by the data URL
+            station_id: AEMET station identifier
+            
+        Returns:
+            List of dictionaries containing temperature data
+        """
+        transformed_data = []
+        for entry in temperature_data:
+            transformed_data.append({
+                'timestamp': datetime.strptime(entry['fecha'], '%Y-%m-%d'),
+                'temperature': float(entry['tmed']),  # Average temperature
+                'temperature_max': float(entry['tmax']),  # Maximum temperature
+                'temperature_min': float(entry['tmin']),  # Minimum temperature
+                'station_id': station_id
+            })
+            
+        return transformed_data
+        
+    def _load_station_inventory(self) -> Dict[str, Dict]:
+        """
+        Download the full AEMET stations inventory.
+        
+        Returns:
+            Dictionary of station metadata keyed by station id
+        """
+        response = self._make_request(
+            self._generate_metadata_url(),
             params={'api_key': self.api_key}
         )
         
@@ -38,19 +202,72 @@ class AEMETService(WeatherServiceBase):
         data_url = response['datos']
         station_data = self._make_request(data_url)
         
-        # Find the specific station
-        for station in station_data:
-            if station['indicativo'] == station_id:
-                return {
-                    'id': station['indicativo'],
-                    'name': station['nombre'],
-                    'province': station['provincia'],
-                    'altitude': station['altitud'],
-                    'latitude': station['latitud'],
-                    'longitude': station['longitud']
-                }
-                
-        raise ValueError(f"Station {station_id} not found")
+        return self._parse_station_inventory(station_data)
+        
+    def _parse_station_inventory(self, station_data: List[Dict]) -> Dict[str, Dict]:
+        """
+        Index the AEMET stations inventory by station id.
+        
+        Args:
+            station_data: Entries returned by the inventory data URL
+            
+        Returns:
+            Dictionary of station metadata keyed by station id
+        """
+        return {
+            station['indicativo']: {
+                'id': station['indicativo'],
+                'name': station['nombre'],
+                'province': station['provincia'],
+                'altitude': station['altitud'],
+                'latitude': station['latitud'],
+                'longitude': station['longitud']
+            }
+            for station in station_data
+        }
+        
+    def get_station_metadata(self, station_id: str) -> Dict:
+        """
+        Get metadata for a specific AEMET weather station.
+        
+        The stations inventory is downloaded once and cached in the
+        service's station catalog.
+        
+        Args:
+            station_id: AEMET station identifier
+            
+        Returns:
+            Dictionary containing station metadata
+            
+        Raises:
+            ValueError: If station is not found
+        """
+        return self.station_catalog.get(station_id)
+        
+    async def get_station_metadata_async(self, station_id: str) -> Dict:
+        """
+        Get metadata for a specific AEMET weather station on the async backend.
+        
+        Args:
+            station_id: AEMET station identifier
+            
+        Returns:
+            Dictionary containing station metadata
+            
+        Raises:
+            ValueError: If station is not found
+        """
+        metadata = self.station_catalog.lookup(station_id)
+        if metadata is not None:
+            return metadata
+            
+        response = await self._make_request_async(
+            self._generate_metadata_url(),
+            params={'api_key': self.api_key}
+        )
+        station_data = await self._make_request_async(response['datos'])
+        self.station_catalog.load(self._parse_station_inventory(station_data))
+        return self.station_catalog.get(station_id)
         
     def get_temperature_data(
         self,
@@ -62,6 +279,9 @@ class AEMETService(WeatherServiceBase):
         """
         Get temperature data for a specific AEMET station and time period.
         
+        Ranges longer than `max_days_per_request` are split into several
+        queries, each a two-step request (data URL, then payload).
+        
         Args:
             station_id: AEMET station identifier
             start_date: Start date for the data range
@@ -74,29 +294,58 @@ class AEMETService(WeatherServiceBase):
         if interval != 'daily':
             raise ValueError("AEMET API only supports daily data")
             
-        # Format dates for AEMET API
-        start_str = start_date.strftime('%Y-%m-%dT00:00:00UTC')
-        end_str = end_date.strftime('%Y-%m-%dT23:59:59UTC')
+        return list(self.iter_temperature_data(station_id, start_date, end_date, interval))
         
-        endpoint = f"valores/climatologicos/diarios/datos/fechaini/{start_str}/fechafin/{end_str}/estacion/{station_id}"
-        response = self._make_request(
-            endpoint,
-            params={'api_key': self.api_key}
-        )
+    def iter_temperature_data(
+        self,
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> Iterator[Dict]:
+        """
+        Stream temperature data for a specific AEMET station, one chunk at a time.
         
-        # Get the actual data URL from the response
-        data_url = response['datos']
-        temperature_data = self._make_request(data_url)
+        Args:
+            station_id: AEMET station identifier
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (must be 'daily' for AEMET)
+            
+        Returns:
+            Iterator over dictionaries containing temperature data
+        """
+        if interval != 'daily':
+            raise ValueError("AEMET API only supports daily data")
+            
+        # Long ranges are split into API-sized chunks fetched concurrently;
+        # chunk results are yielded back in date order
+        chunks = self._split_date_range(start_date, end_date)
+        results = self._fetch_concurrently(lambda chunk: self._fetch_chunk(station_id, chunk), chunks)
+        return (entry for chunk_data in results for entry in chunk_data)
         
-        # Transform the data into our standard format
-        transformed_data = []
-        for entry in temperature_data:
-            transformed_data.append({
-                'timestamp': datetime.strptime(entry['fecha'], '%Y-%m-%d'),
-                'temperature': float(entry['tmed']),  # Average temperature
-                'temperature_max': float(entry['tmax']),  # Maximum temperature
-                'temperature_min': float(entry['tmin']),  # Minimum temperature
-                'station_id': station_id
-            })
+    async def get_temperature_data_async(
+        self,
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> List[Dict]:
+        """
+        Get temperature data for a specific AEMET station on the async backend.
+        
+        Args:
+            station_id: AEMET station identifier
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (must be 'daily' for AEMET)
+            
+        Returns:
+            List of dictionaries containing temperature data
+        """
+        if interval != 'daily':
+            raise ValueError("AEMET API only supports daily data")
             
-        return transformed_data 
\ No newline at end of file
+        chunks = self._split_date_range(start_date, end_date)
+        results = await asyncio.gather(*(self._fetch_chunk_async(station_id, chunk) for chunk in chunks))
+        return [entry for chunk_data in results for entry in chunk_data]
@@ -1,18 +1,81 @@
+import asyncio
+import json
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, tzinfo
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+from urllib.parse import urlparse
 
+import aiohttp
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces out calls to at most `rate` per second."""
+
+    def __init__(self, rate: Optional[float] = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Maximum number of calls per second (None disables limiting)
+        """
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def _reserve(self) -> float:
+        """Reserve the next call slot and return how long to wait for it."""
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        return slot - now
+
+    def acquire(self) -> None:
+        """Block until the caller is allowed to issue the next call."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait, without blocking the event loop, for the next call slot."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
 class WeatherServiceBase(ABC):
     """Base class for weather data services."""
     
-    def __init__(self, api_key: str, base_url: str, max_retries: int = 3):
+    # Time zone the provider's days are defined in (None for local time)
+    TIMEZONE: Optional[tzinfo] = None
+    
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        max_retries: int = 3,
+        max_workers: int = 4,
+        requests_per_second: Optional[float] = None,
+        max_async_requests: int = 100
+    ):
         """
         Initialize the weather service.
         
@@ -20,10 +83,28 @@ class WeatherServiceBase(ABC):
             api_key: API key for the weather service
             base_url: Base URL for the weather service API
             max_retries: Maximum number of retries for failed requests
+            max_workers: Maximum number of concurrent requests (1 fetches serially)
+            requests_per_second: Per-host request rate limit (None for unlimited)
+            max_async_requests: Maximum number of in-flight requests on the async backend
         """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+        self.max_async_requests = max_async_requests
         self.session = self._create_session(max_retries)
+        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self._rate_limiters_lock = threading.Lock()
+        # Async backend state, created lazily on the running event loop. A
+        # shared aiohttp.ClientSession may be assigned to `async_session` to
+        # pool connections across services.
+        self.async_session: Optional[aiohttp.ClientSession] = None
+        self._owns_async_session = False
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_semaphore: Optional[asyncio.Semaphore] = None
         
     def _create_session(self, max_retries: int) -> requests.Session:
         """
@@ -41,10 +122,190 @@ class WeatherServiceBase(ABC):
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_maxsize=max(self.max_workers, 10)
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         return session
+
+    def _get_rate_limiter(self, url: str) -> RateLimiter:
+        """
+        Get the rate limiter shared by all requests to the URL's host.
+        
+        Args:
+            url: URL about to be requested
+            
+        Returns:
+            Rate limiter for the host
+        """
+        host = urlparse(url).netloc
+        with self._rate_limiters_lock:
+            limiter = self._rate_limiters.get(host)
+            if limiter is None:
+                limiter = RateLimiter(self.requests_per_second)
+                self._rate_limiters[host] = limiter
+        return limiter
+
+    def _throttle(self, url: str) -> None:
+        """
+        Wait for the rate limiter of the URL's host before issuing a request.
+        
+        Args:
+            url: URL about to be requested
+        """
+        self._get_rate_limiter(url).acquire()
+
+    def _fetch_concurrently(self, fetch: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """
+        Apply `fetch` to every item using a bounded thread pool.
+        
+        Results are yielded in the same order as `items`. At most
+        `2 * max_workers` fetches are in flight or buffered at any time, so
+        long ranges are not materialized up front.
+        
+        Args:
+            fetch: Callable performing a single (usually network-bound) fetch
+            items: Items to fetch, e.g. dates or date-range chunks
+            
+        Returns:
+            Iterator over the fetch results, in input order
+        """
+        if self.max_workers == 1:
+            for item in items:
+                yield fetch(item)
+            return
+            
+        window = 2 * self.max_workers
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            try:
+                for item in items:
+                    pending.append(executor.submit(fetch, item))
+                    if len(pending) >= window:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+        
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """
+        Get the aiohttp session used by the async backend.
+        
+        The session keeps connections alive and is created on first use on
+        the running event loop.
+        
+        Returns:
+            aiohttp client session
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_loop = loop
+            self._async_semaphore = asyncio.Semaphore(self.max_async_requests)
+            if self._owns_async_session:
+                self.async_session = None
+                
+        if self.async_session is None or self.async_session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_async_requests, keepalive_timeout=30)
+            self.async_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={'User-Agent': 'Compare-Temp/1.0'}
+            )
+            self._owns_async_session = True
+        return self.async_session
+
+    async def aclose(self) -> None:
+        """Close the async session if it was created by this service."""
+        if self._owns_async_session and self.async_session is not None:
+            await self.async_session.close()
+        self.async_session = None
+        self._owns_async_session = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _get_async(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> bytes:
+        """
+        Issue a GET request on the async backend and return the body.
+        
+        Requests are bounded by the service's concurrency semaphore, throttled
+        per host and retried with exponential backoff on transient status
+        codes, connection errors and timeouts, like the sync backend.
+        
+        Args:
+            url: URL to request
+            params: Query parameters
+            headers: Request headers
+            
+        Returns:
+            Response body as bytes
+            
+        Raises:
+            aiohttp.ClientError: If the request fails
+        """
+        session = self._get_async_session()
+        limiter = self._get_rate_limiter(url)
+        
+        async with self._async_semaphore:
+            for attempt in range(self.max_retries + 1):
+                await limiter.acquire_async()
+                try:
+                    async with session.get(url, params=params, headers=headers) as response:
+                        if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                            response.raise_for_status()
+                            return await response.read()
+                except aiohttp.ClientResponseError:
+                    raise
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if attempt == self.max_retries:
+                        raise
+                await asyncio.sleep(2 ** attempt)
+                    
+    async def _make_request_async(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Make a request to the weather service API on the async backend.
+        
+        Args:
+            endpoint: API endpoint, or an absolute URL
+            params: Query parameters
+            headers: Request headers
+            
+        Returns:
+            JSON response from the API
+            
+        Raises:
+            aiohttp.ClientError: If the request fails
+        """
+        if endpoint.startswith(('http://', 'https://')):
+            url = endpoint
+        else:
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
+            
+        default_headers = {
+            'Accept': 'application/json',
+            'User-Agent': 'Compare-Temp/1.0'
+        }
+        if headers:
+            default_headers.update(headers)
+            
+        try:
+            content = await self._get_async(url, params=params, headers=default_headers)
+            return json.loads(content)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to make request to {url}: {str(e)}")
+            raise
         
     @abstractmethod
     def get_station_metadata(self, station_id: str) -> Dict:
@@ -81,6 +342,94 @@ class WeatherServiceBase(ABC):
         """
         pass
         
+    @abstractmethod
+    def iter_temperature_data(
+        self,
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> Iterator[Dict]:
+        """
+        Stream temperature data for a specific station and time period.
+        
+        Readings are yielded as each day or chunk is parsed, so memory use
+        does not grow with the length of the range.
+        
+        Args:
+            station_id: Unique identifier for the weather station
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (e.g., 'hourly', 'daily')
+            
+        Returns:
+            Iterator over dictionaries containing temperature data
+        """
+        pass
+        
+    def iter_temperature_batches(
+        self,
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly',
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict]]:
+        """
+        Stream temperature data in batches, e.g. for repository bulk inserts.
+        
+        Args:
+            station_id: Unique identifier for the weather station
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (e.g., 'hourly', 'daily')
+            batch_size: Maximum number of readings per batch
+            
+        Returns:
+            Iterator over lists of at most `batch_size` readings
+        """
+        readings = self.iter_temperature_data(station_id, start_date, end_date, interval)
+        while True:
+            batch = list(islice(readings, batch_size))
+            if not batch:
+                return
+            yield batch
+        
+    @abstractmethod
+    async def get_station_metadata_async(self, station_id: str) -> Dict:
+        """
+        Get metadata for a specific weather station on the async backend.
+        
+        Args:
+            station_id: Unique identifier for the weather station
+            
+        Returns:
+            Dictionary containing station metadata
+        """
+        pass
+        
+    @abstractmethod
+    async def get_temperature_data_async(
+        self,
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> List[Dict]:
+        """
+        Get temperature data for a station and time period on the async backend.
+        
+        Args:
+            station_id: Unique identifier for the weather station
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (e.g., 'hourly', 'daily')
+            
+        Returns:
+            List of dictionaries containing temperature data
+        """
+        pass
+        
     def _make_request(
         self,
         endpoint: str,
@@ -91,7 +440,7 @@ class WeatherServiceBase(ABC):
         Make a request to the weather service API.
         
         Args:
-            endpoint: API endpoint
+            endpoint: API endpoint, or an absolute URL
             params: Query parameters
             headers: Request headers
             
@@ -101,7 +450,11 @@ class WeatherServiceBase(ABC):
         Raises:
             requests.exceptions.RequestException: If the request fails
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if endpoint.startswith(('http://', 'https://')):
+            # Absolute URLs, e.g. AEMET's 'datos' links, are requested as is
+            url = endpoint
+        else:
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
         default_headers = {
             'Accept': 'application/json',
@@ -110,6 +463,7 @@ class WeatherServiceBase(ABC):
         if headers:
             default_headers.update(headers)
             
+        self._throttle(url)
         try:
             response = self.session.get(
                 url,
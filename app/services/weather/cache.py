@@ -0,0 +1,114 @@
+import gzip
+import logging
+import os
+import tempfile
+from datetime import date, datetime, timedelta, tzinfo
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+class DayFileCache:
+    """On-disk cache for raw daily data files, keyed by date."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        prefix: str = "",
+        compress: bool = True,
+        timezone: Optional[tzinfo] = None,
+        final_after_days: int = 2
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory where cached files are stored
+            prefix: File name prefix (e.g. the provider's file name stem)
+            compress: Whether to store the files gzip-compressed
+            timezone: Time zone the provider's days are defined in (None for local time)
+            final_after_days: Number of days, counted back from the provider's
+                today, after which a file is considered final
+        """
+        self.cache_dir = cache_dir
+        self.prefix = prefix
+        self.compress = compress
+        self.timezone = timezone
+        self.final_after_days = final_after_days
+
+    def _path(self, day: Union[date, datetime]) -> str:
+        """
+        Build the cache path for a day.
+
+        Args:
+            day: Day of the cached file
+
+        Returns:
+            Absolute path of the cached file
+        """
+        suffix = '.txt.gz' if self.compress else '.txt'
+        file_name = f"{self.prefix}{day.strftime('%Y%m%d')}{suffix}"
+        return os.path.join(self.cache_dir, day.strftime('%Y'), day.strftime('%m'), file_name)
+
+    def is_cacheable(self, day: Union[date, datetime]) -> bool:
+        """
+        Check whether a day's file is final and can be cached.
+
+        Files for the provider's recent days may still be completed
+        upstream, so only days at least `final_after_days` before the
+        provider's today are cached.
+
+        Args:
+            day: Day to check
+
+        Returns:
+            True if the day's file is final
+        """
+        if isinstance(day, datetime):
+            day = day.date()
+        today = datetime.now(self.timezone).date()
+        return day <= today - timedelta(days=self.final_after_days)
+
+    def get(self, day: Union[date, datetime]) -> Optional[bytes]:
+        """
+        Read a cached file.
+
+        Args:
+            day: Day of the file
+
+        Returns:
+            Raw file content, or None if the day is not cached
+        """
+        path = self._path(day)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            return gzip.decompress(content) if self.compress else content
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError) as e:
+            logger.warning(f"Discarding unreadable cache file {path}: {str(e)}")
+            return None
+
+    def put(self, day: Union[date, datetime], content: bytes) -> None:
+        """
+        Store a file in the cache.
+
+        The file is written to a temporary name and renamed into place so
+        concurrent readers never see a partial file.
+
+        Args:
+            day: Day of the file
+            content: Raw file content
+        """
+        path = self._path(day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = gzip.compress(content) if self.compress else content
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,200 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class StationCatalog:
+    """In-memory station metadata index with TTL and optional on-disk snapshot.
+
+    The catalog either loads a provider's whole station inventory at once
+    (`load_inventory`) or fetches stations one at a time on first use
+    (`load_station`), and answers later lookups from a dict keyed by
+    station id.
+    """
+
+    def __init__(
+        self,
+        load_inventory: Optional[Callable[[], Dict[str, Dict]]] = None,
+        load_station: Optional[Callable[[str], Dict]] = None,
+        ttl: Optional[float] = 86400,
+        snapshot_path: Optional[str] = None
+    ):
+        """
+        Initialize the catalog.
+
+        Args:
+            load_inventory: Callable returning all stations keyed by station id
+            load_station: Callable returning the metadata of a single station
+            ttl: Seconds before cached metadata is refreshed (None never expires)
+            snapshot_path: JSON file used to persist the catalog between runs
+        """
+        if (load_inventory is None) == (load_station is None):
+            raise ValueError("Exactly one of load_inventory or load_station is required")
+        self.load_inventory = load_inventory
+        self.load_station = load_station
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        # Guards the cached entries only; slow loads run outside it, each
+        # under its own key's lock so concurrent misses share one request
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Optional[str], threading.Lock] = {}
+        self._stations: Dict[str, Dict] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._inventory_loaded_at: Optional[float] = None
+        if snapshot_path:
+            self._read_snapshot()
+
+    def _is_fresh(self, fetched_at: Optional[float]) -> bool:
+        """Check whether data fetched at the given time is still valid."""
+        if fetched_at is None:
+            return False
+        return self.ttl is None or time.time() - fetched_at < self.ttl
+
+    def _read_snapshot(self) -> None:
+        """Load the catalog from its on-disk snapshot, if present."""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable station snapshot {self.snapshot_path}: {str(e)}")
+            return
+
+        self._inventory_loaded_at = snapshot.get('inventory_loaded_at')
+        for station_id, entry in snapshot.get('stations', {}).items():
+            self._stations[station_id] = entry['metadata']
+            self._fetched_at[station_id] = entry['fetched_at']
+
+    def _write_snapshot(self) -> None:
+        """Persist the catalog atomically to its on-disk snapshot."""
+        if not self.snapshot_path:
+            return
+        snapshot = {
+            'inventory_loaded_at': self._inventory_loaded_at,
+            'stations': {
+                station_id: {'fetched_at': self._fetched_at[station_id], 'metadata': metadata}
+                for station_id, metadata in self._stations.items()
+            }
+        }
+        directory = os.path.dirname(os.path.abspath(self.snapshot_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Failed to write station snapshot {self.snapshot_path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load(self, stations: Dict[str, Dict]) -> None:
+        """
+        Replace the catalog contents with a freshly fetched inventory.
+
+        Args:
+            stations: All stations keyed by station id
+        """
+        with self._lock:
+            now = time.time()
+            self._stations = dict(stations)
+            self._fetched_at = {station_id: now for station_id in self._stations}
+            self._inventory_loaded_at = now
+            self._write_snapshot()
+
+    def add(self, station_id: str, metadata: Dict) -> None:
+        """
+        Add or refresh a single station.
+
+        Args:
+            station_id: Station identifier
+            metadata: Station metadata
+        """
+        with self._lock:
+            self._stations[station_id] = metadata
+            self._fetched_at[station_id] = time.time()
+            self._write_snapshot()
+
+    def lookup(self, station_id: str) -> Optional[Dict]:
+        """
+        Return cached metadata for a station without fetching anything.
+
+        Args:
+            station_id: Station identifier
+
+        Returns:
+            Station metadata, or None if it is not cached or has expired
+        """
+        with self._lock:
+            if station_id in self._stations and self._is_fresh(self._fetched_at[station_id]):
+                return self._stations[station_id]
+            return None
+
+    def _load_lock(self, station_id: Optional[str]) -> threading.Lock:
+        """Get the lock serializing loads of a station (None for the whole inventory)."""
+        with self._lock:
+            return self._load_locks.setdefault(station_id, threading.Lock())
+
+    def _inventory_is_fresh(self) -> bool:
+        """Check whether the loaded inventory is still valid."""
+        with self._lock:
+            return self._is_fresh(self._inventory_loaded_at)
+
+    def all(self) -> Dict[str, Dict]:
+        """
+        Get every station in the inventory, loading it if needed.
+
+        Returns:
+            Dictionary of station metadata keyed by station id
+        """
+        if self.load_inventory is not None and not self._inventory_is_fresh():
+            with self._load_lock(None):
+                # Another thread may have loaded it while this one waited
+                if not self._inventory_is_fresh():
+                    self.load(self.load_inventory())
+        with self._lock:
+            return dict(self._stations)
+
+    def get(self, station_id: str) -> Dict:
+        """
+        Get metadata for a station, fetching it only on a cache miss.
+
+        Args:
+            station_id: Station identifier
+
+        Returns:
+            Dictionary containing station metadata
+
+        Raises:
+            ValueError: If station is not found
+        """
+        metadata = self.lookup(station_id)
+        if metadata is not None:
+            return metadata
+
+        if self.load_inventory is not None:
+            stations = self.all()
+            if station_id not in stations:
+                raise ValueError(f"Station {station_id} not found")
+            return stations[station_id]
+
+        with self._load_lock(station_id):
+            # Another thread may have fetched it while this one waited
+            metadata = self.lookup(station_id)
+            if metadata is None:
+                metadata = self.load_station(station_id)
+                self.add(station_id, metadata)
+            return metadata
+
+    def invalidate(self) -> None:
+        """Drop all cached metadata so the next lookup fetches it again."""
+        with self._lock:
+            self._stations = {}
+            self._fetched_at = {}
+            self._inventory_loaded_at = None
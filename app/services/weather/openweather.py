@@ -1,34 +1,71 @@
-from datetime import datetime
-from typing import Dict, List
+import asyncio
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from .base import WeatherServiceBase
+from .catalog import StationCatalog
 
 class OpenWeatherService(WeatherServiceBase):
     """OpenWeather service implementation."""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        max_workers: int = 4,
+        requests_per_second: Optional[float] = None,
+        metadata_ttl: Optional[float] = 86400,
+        metadata_snapshot_path: Optional[str] = None
+    ):
         """
         Initialize the OpenWeather service.
         
         Args:
             api_key: OpenWeather API key
+            max_workers: Number of timemachine requests issued concurrently
+            requests_per_second: Rate limit for requests to the OpenWeather host
+            metadata_ttl: Seconds before cached station metadata is fetched again
+            metadata_snapshot_path: JSON file persisting fetched station metadata
         """
         super().__init__(
             api_key=api_key,
-            base_url="https://api.openweathermap.org/data/2.5"
+            base_url="https://api.openweathermap.org/data/2.5",
+            max_workers=max_workers,
+            requests_per_second=requests_per_second
+        )
+        # OpenWeather has no inventory endpoint, so stations are cached one by one
+        self.station_catalog = StationCatalog(
+            load_station=self._fetch_station_metadata,
+            ttl=metadata_ttl,
+            snapshot_path=metadata_snapshot_path
         )
         
     def get_station_metadata(self, station_id: str) -> Dict:
         """
         Get metadata for a specific OpenWeather station.
         
+        Metadata is cached in the service's station catalog after the
+        first lookup.
+        
+        Args:
+            station_id: OpenWeather station identifier (city ID)
+            
+        Returns:
+            Dictionary containing station metadata
+        """
+        return self.station_catalog.get(station_id)
+        
+    def _fetch_station_metadata(self, station_id: str) -> Dict:
+        """
+        Fetch metadata for a single OpenWeather station from the API.
+        
         Args:
             station_id: OpenWeather station identifier (city ID)
             
         Returns:
             Dictionary containing station metadata
         """
-        endpoint = f"weather"
+        endpoint = "weather"
         response = self._make_request(
             endpoint,
             params={
@@ -37,6 +74,18 @@ class OpenWeatherService(WeatherServiceBase):
             }
         )
         
+        return self._parse_station_metadata(response)
+        
+    def _parse_station_metadata(self, response: Dict) -> Dict:
+        """
+        Transform a current-weather response into station metadata.
+        
+        Args:
+            response: Response of the 'weather' endpoint
+            
+        Returns:
+            Dictionary containing station metadata
+        """
         return {
             'id': str(response['id']),
             'name': response['name'],
@@ -64,36 +113,201 @@ class OpenWeatherService(WeatherServiceBase):
         Returns:
             List of dictionaries containing temperature data
         """
+        return list(self.iter_temperature_data(station_id, start_date, end_date, interval))
+        
+    def iter_temperature_data(
+        self,
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> Iterator[Dict]:
+        """
+        Stream temperature data for a specific OpenWeather station, one day at a time.
+        
+        Args:
+            station_id: OpenWeather station identifier (city ID)
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval ('hourly' or 'daily')
+            
+        Returns:
+            Iterator over dictionaries containing temperature data
+        """
         if interval not in ['hourly', 'daily']:
             raise ValueError("OpenWeather API only supports hourly or daily data")
             
-        # Convert dates to Unix timestamps
-        start_timestamp = int(start_date.timestamp())
-        end_timestamp = int(end_date.timestamp())
+        # Resolve coordinates once; the catalog caches them across calls
+        metadata = self.get_station_metadata(station_id)
+        latitude = metadata['latitude']
+        longitude = metadata['longitude']
         
-        endpoint = f"onecall/timemachine"
-        response = self._make_request(
-            endpoint,
+        def fetch_day(day_start: datetime) -> Dict:
+            return self._make_request(
+                "onecall/timemachine",
+                params=self._timemachine_params(latitude, longitude, day_start)
+            )
+            
+        responses = self._fetch_concurrently(fetch_day, self._day_starts(start_date, end_date))
+        readings = self._iter_hourly(responses, station_id, start_date, end_date)
+        if interval == 'daily':
+            readings = self._iter_daily(readings)
+        return readings
+        
+    async def get_station_metadata_async(self, station_id: str) -> Dict:
+        """
+        Get metadata for a specific OpenWeather station on the async backend.
+        
+        Args:
+            station_id: OpenWeather station identifier (city ID)
+            
+        Returns:
+            Dictionary containing station metadata
+        """
+        metadata = self.station_catalog.lookup(station_id)
+        if metadata is not None:
+            return metadata
+            
+        response = await self._make_request_async(
+            "weather",
             params={
-                'lat': self.get_station_metadata(station_id)['latitude'],
-                'lon': self.get_station_metadata(station_id)['longitude'],
-                'dt': start_timestamp,
-                'appid': self.api_key,
-                'units': 'metric'  # Use Celsius
+                'id': station_id,
+                'appid': self.api_key
             }
         )
+        metadata = self._parse_station_metadata(response)
+        self.station_catalog.add(station_id, metadata)
+        return metadata
+        
+    async def get_temperature_data_async(
+        self,
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> List[Dict]:
+        """
+        Get temperature data for a specific OpenWeather station on the async backend.
+        
+        Args:
+            station_id: OpenWeather station identifier (city ID)
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval ('hourly' or 'daily')
+            
+        Returns:
+            List of dictionaries containing temperature data
+        """
+        if interval not in ['hourly', 'daily']:
+            raise ValueError("OpenWeather API only supports hourly or daily data")
+            
+        metadata = await self.get_station_metadata_async(station_id)
+        responses = await asyncio.gather(*(
+            self._make_request_async(
+                "onecall/timemachine",
+                params=self._timemachine_params(metadata['latitude'], metadata['longitude'], day_start)
+            )
+            for day_start in self._day_starts(start_date, end_date)
+        ))
+        readings = self._iter_hourly(responses, station_id, start_date, end_date)
+        if interval == 'daily':
+            readings = self._iter_daily(readings)
+        return list(readings)
+        
+    def _day_starts(self, start_date: datetime, end_date: datetime) -> List[datetime]:
+        """
+        List the request time of every day in a range.
+        
+        The timemachine endpoint returns one day per request, so ranges are
+        fanned out into one request per day.
+        
+        Args:
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            
+        Returns:
+            Start of each day in the range, clamped to `start_date`
+        """
+        first_day = datetime.combine(start_date.date(), datetime.min.time())
+        num_days = (end_date.date() - start_date.date()).days + 1
+        return [max(first_day + timedelta(days=offset), start_date) for offset in range(num_days)]
+        
+    def _timemachine_params(self, latitude: float, longitude: float, day_start: datetime) -> Dict:
+        """
+        Build the query parameters of a timemachine request.
         
-        # Transform the data into our standard format
-        transformed_data = []
-        for entry in response['hourly']:
-            timestamp = datetime.fromtimestamp(entry['dt'])
-            if start_date <= timestamp <= end_date:
-                transformed_data.append({
+        Args:
+            latitude: Station latitude
+            longitude: Station longitude
+            day_start: Requested time
+            
+        Returns:
+            Query parameters
+        """
+        return {
+            'lat': latitude,
+            'lon': longitude,
+            'dt': int(day_start.timestamp()),
+            'appid': self.api_key,
+            'units': 'metric'  # Use Celsius
+        }
+        
+    def _iter_hourly(
+        self,
+        responses: Iterable[Dict],
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Iterator[Dict]:
+        """
+        Transform per-day timemachine responses into our standard format.
+        
+        Args:
+            responses: Timemachine responses in date order
+            station_id: OpenWeather station identifier (city ID)
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            
+        Returns:
+            Iterator over dictionaries containing temperature data
+        """
+        # Responses are in date order, so entries overlapping the previous
+        # day are skipped by tracking the last emitted time
+        last_dt = None
+        for response in responses:
+            for entry in response.get('hourly', []):
+                timestamp = datetime.fromtimestamp(entry['dt'])
+                if (last_dt is not None and entry['dt'] <= last_dt) or not start_date <= timestamp <= end_date:
+                    continue
+                last_dt = entry['dt']
+                yield {
                     'timestamp': timestamp,
                     'temperature': entry['temp'],
                     'temperature_max': entry.get('temp_max', entry['temp']),
                     'temperature_min': entry.get('temp_min', entry['temp']),
                     'station_id': station_id
-                })
-                
-        return transformed_data 
\ No newline at end of file
+                }
+        
+    def _iter_daily(self, readings: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Aggregate hourly readings into one reading per day.
+        
+        The timemachine endpoint has no daily series, so daily data is the
+        mean of each day's hourly temperatures and the extremes of their
+        maximums and minimums.
+        
+        Args:
+            readings: Hourly readings in time order
+            
+        Returns:
+            Iterator over dictionaries containing daily temperature data
+        """
+        for day, day_readings in groupby(readings, key=lambda reading: reading['timestamp'].date()):
+            day_readings = list(day_readings)
+            yield {
+                'timestamp': datetime.combine(day, datetime.min.time()),
+                'temperature': sum(r['temperature'] for r in day_readings) / len(day_readings),
+                'temperature_max': max(r['temperature_max'] for r in day_readings),
+                'temperature_min': min(r['temperature_min'] for r in day_readings),
+                'station_id': day_readings[0]['station_id']
+            }
@@ -1,23 +1,67 @@
-import csv
-from datetime import datetime, timedelta
-from io import StringIO, BytesIO
-from typing import Dict, List
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from typing import Dict, Iterable, Iterator, List, Optional
+import aiohttp
+import asyncio
+import pandas as pd
 import requests
 import re
 import zipfile
 
 from .base import WeatherServiceBase
+from .cache import DayFileCache
+from .catalog import StationCatalog
+
+# Example line: "BASE BELGRANO II               ANTARTIDA                            -77      52       -34      37        256  89034 SAYB"
+METADATA_LINE_PATTERN = re.compile(
+    r"(.{30})\s+(.{30})\s+(-?\d+)\s+(\d+)\s+(-?\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(.*)"
+)
+
+# Example line: "20042025     0  14.7   71  1021.8  990    4     AEROPARQUE AERO"
+DATA_LINE_PATTERN = re.compile(
+    r"(?P<date>\d{8})\s+(?P<hour>\d{1,2})\s+(?P<temperature>-?\d+\.\d+)"
+    r"\s+\d+\s+\d+\.\d+\s+\d+\s+\d+\s+(?P<station>.*)"
+)
 
 class SMNService(WeatherServiceBase):
     """SMN (Servicio Meteorológico Nacional) Argentina service implementation."""
     
-    def __init__(self):
+    # Day files follow Argentina time (UTC-3, no daylight saving time)
+    TIMEZONE = timezone(timedelta(hours=-3))
+    
+    def __init__(
+        self,
+        max_workers: int = 4,
+        requests_per_second: Optional[float] = None,
+        cache_dir: Optional[str] = None,
+        compress_cache: bool = True,
+        metadata_ttl: Optional[float] = 86400,
+        metadata_snapshot_path: Optional[str] = None
+    ):
         """
         Initialize the SMN service.
+        
+        Args:
+            max_workers: Number of day files downloaded concurrently
+            requests_per_second: Rate limit for requests to the SMN host
+            cache_dir: Directory for caching raw day files (None disables caching)
+            compress_cache: Whether cached day files are gzip-compressed
+            metadata_ttl: Seconds before the station inventory is downloaded again
+            metadata_snapshot_path: JSON file persisting the station inventory
         """
         super().__init__(
             api_key="",  # SMN doesn't require an API key
-            base_url="https://ssl.smn.gob.ar/dpd"
+            base_url="https://ssl.smn.gob.ar/dpd",
+            max_workers=max_workers,
+            requests_per_second=requests_per_second
+        )
+        self.cache = DayFileCache(
+            cache_dir, prefix="datohorario", compress=compress_cache, timezone=self.TIMEZONE
+        ) if cache_dir else None
+        self.station_catalog = StationCatalog(
+            load_inventory=self._load_station_inventory,
+            ttl=metadata_ttl,
+            snapshot_path=metadata_snapshot_path
         )
         
     def _generate_data_url(self, date: datetime) -> str:
@@ -55,9 +99,66 @@ class SMNService(WeatherServiceBase):
         Raises:
             requests.exceptions.RequestException: If download fails
         """
+        self._throttle(url)
         response = requests.get(url)
         response.raise_for_status()
         return response.content
+
+    def _fetch_day_file(self, date: datetime) -> Optional[bytes]:
+        """
+        Download the hourly observations file for a single day.
+        
+        Final days are served from the cache when available; recent days
+        and days missing from the cache go to the network.
+        
+        Args:
+            date: Day to download
+            
+        Returns:
+            File content as bytes, or None if the day has no data
+        """
+        cacheable = self.cache is not None and self.cache.is_cacheable(date)
+        if cacheable:
+            content = self.cache.get(date)
+            if content is not None:
+                return content
+                
+        try:
+            content = self._download_file(self._generate_data_url(date))
+        except requests.exceptions.RequestException:
+            # Skip days with no data
+            return None
+            
+        if cacheable and content:
+            self.cache.put(date, content)
+        return content
+        
+    async def _fetch_day_file_async(self, date: datetime) -> Optional[bytes]:
+        """
+        Download the hourly observations file for a single day on the async backend.
+        
+        Args:
+            date: Day to download
+            
+        Returns:
+            File content as bytes, or None if the day has no data
+        """
+        cacheable = self.cache is not None and self.cache.is_cacheable(date)
+        if cacheable:
+            # Cache reads and writes run off the event loop
+            content = await asyncio.to_thread(self.cache.get, date)
+            if content is not None:
+                return content
+                
+        try:
+            content = await self._get_async(self._generate_data_url(date))
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # Skip days with no data
+            return None
+            
+        if cacheable and content:
+            await asyncio.to_thread(self.cache.put, date, content)
+        return content
         
     def _download_and_extract_metadata(self) -> bytes:
         """
@@ -69,8 +170,21 @@ class SMNService(WeatherServiceBase):
         Raises:
             ValueError: If the metadata file cannot be found in the zip archive
         """
-        zip_content = self._download_file(self._generate_metadata_url())
+        return self._extract_metadata(self._download_file(self._generate_metadata_url()))
         
+    def _extract_metadata(self, zip_content: bytes) -> bytes:
+        """
+        Extract the stations metadata file from the zip archive.
+        
+        Args:
+            zip_content: Content of the zip archive
+            
+        Returns:
+            Content of the metadata file as bytes
+            
+        Raises:
+            ValueError: If the metadata file cannot be found in the zip archive
+        """
         with zipfile.ZipFile(BytesIO(zip_content)) as zip_file:
             # Look for the metadata file in the zip
             metadata_files = [f for f in zip_file.namelist() if f.endswith('.txt')]
@@ -94,9 +208,7 @@ class SMNService(WeatherServiceBase):
         Raises:
             ValueError: If the line cannot be parsed
         """
-        # Example line: "BASE BELGRANO II               ANTARTIDA                            -77      52       -34      37        256  89034 SAYB"
-        pattern = r"(.{30})\s+(.{30})\s+(-?\d+)\s+(\d+)\s+(-?\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(.*)"
-        match = re.match(pattern, line.strip())
+        match = METADATA_LINE_PATTERN.match(line.strip())
         
         if not match:
             return None
@@ -116,49 +228,106 @@ class SMNService(WeatherServiceBase):
             'altitude': float(altitude)
         }
         
-    def _parse_data_line(self, line: str) -> Dict:
+    def _parse_data_line(self, line: str, date_cache: Optional[Dict[str, datetime]] = None) -> Dict:
         """
         Parse a line of data from the SMN file.
         
         Args:
             line: Line of data to parse
+            date_cache: Optional cache of already parsed date strings, shared
+                by all lines of a file
             
         Returns:
             Dictionary containing parsed data
         """
-        # Example line: "20042025     0  14.7   71  1021.8  990    4     AEROPARQUE AERO"
-        pattern = r"(\d{8})\s+(\d{1,2})\s+(-?\d+\.\d+)\s+\d+\s+\d+\.\d+\s+\d+\s+\d+\s+(.*)"
-        match = re.match(pattern, line.strip())
+        match = DATA_LINE_PATTERN.match(line.strip())
         
         if not match:
             return None
             
         date_str, hour_str, temp_str, station = match.groups()
-        date = datetime.strptime(date_str, "%d%m%Y")
-        hour = int(hour_str)
-        timestamp = datetime.combine(date.date(), datetime.min.time()) + timedelta(hours=hour)
+        date = date_cache.get(date_str) if date_cache is not None else None
+        if date is None:
+            date = datetime.strptime(date_str, "%d%m%Y")
+            if date_cache is not None:
+                date_cache[date_str] = date
         
         return {
-            'timestamp': timestamp,
+            'timestamp': date + timedelta(hours=int(hour_str)),
             'temperature': float(temp_str),
             'station_id': station.strip()
         }
         
-    def get_station_metadata(self, station_id: str) -> Dict:
+    def _parse_data_file(self, content: bytes) -> Iterator[Dict]:
         """
-        Get metadata for a specific SMN weather station.
+        Parse all data lines of an SMN day file.
         
         Args:
-            station_id: SMN station identifier
+            content: Raw file content
             
         Returns:
-            Dictionary containing station metadata
+            Iterator over dictionaries containing parsed data
+        """
+        # Every line in a file shares a handful of dates
+        date_cache = {}
+        
+        # Skip header rows (first two rows)
+        for line in content.decode('utf-8').split('\n')[2:]:
+            if not line.strip():
+                continue
+                
+            data = self._parse_data_line(line, date_cache)
+            if data:
+                yield data
+                
+    def parse_data_frame(self, content: bytes) -> pd.DataFrame:
+        """
+        Parse a whole SMN day file into columns at once.
+        
+        Args:
+            content: Raw file content
             
-        Raises:
-            ValueError: If station is not found
+        Returns:
+            DataFrame with 'timestamp', 'temperature' and 'station_id' columns
+        """
+        # Skip header rows (first two rows); matching runs in C via map
+        lines = content.decode('utf-8').split('\n')[2:]
+        matches = filter(None, map(DATA_LINE_PATTERN.match, map(str.strip, lines)))
+        fields = pd.DataFrame(
+            [match.groups() for match in matches],
+            columns=['date', 'hour', 'temperature', 'station']
+        )
+        
+        timestamps = pd.to_datetime(fields['date'], format='%d%m%Y') + pd.to_timedelta(
+            fields['hour'].astype('int64'), unit='h'
+        )
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'temperature': fields['temperature'].astype('float64'),
+            'station_id': fields['station'].str.strip()
+        })
+        
+    def _load_station_inventory(self) -> Dict[str, Dict]:
+        """
+        Download and parse the full SMN stations inventory.
+        
+        Returns:
+            Dictionary of station metadata keyed by station id
+        """
+        return self._parse_station_inventory(self._download_and_extract_metadata())
+        
+    def _parse_station_inventory(self, content: bytes) -> Dict[str, Dict]:
+        """
+        Parse the stations metadata file.
+        
+        Args:
+            content: Content of the metadata file
+            
+        Returns:
+            Dictionary of station metadata keyed by station id
         """
-        content = self._download_and_extract_metadata()
         lines = content.decode('utf-8').split('\n')
+        stations = {}
         
         # Skip header rows (first two rows)
         for line in lines[2:]:
@@ -166,10 +335,49 @@ class SMNService(WeatherServiceBase):
                 continue
                 
             metadata = self._parse_metadata_line(line)
-            if metadata and metadata['id'] == station_id:
-                return metadata
+            if metadata:
+                stations[metadata['id']] = metadata
                 
-        raise ValueError(f"Station {station_id} not found")
+        return stations
+        
+    def get_station_metadata(self, station_id: str) -> Dict:
+        """
+        Get metadata for a specific SMN weather station.
+        
+        The stations inventory is downloaded once and cached in the
+        service's station catalog.
+        
+        Args:
+            station_id: SMN station identifier
+            
+        Returns:
+            Dictionary containing station metadata
+            
+        Raises:
+            ValueError: If station is not found
+        """
+        return self.station_catalog.get(station_id)
+        
+    async def get_station_metadata_async(self, station_id: str) -> Dict:
+        """
+        Get metadata for a specific SMN weather station on the async backend.
+        
+        Args:
+            station_id: SMN station identifier
+            
+        Returns:
+            Dictionary containing station metadata
+            
+        Raises:
+            ValueError: If station is not found
+        """
+        metadata = self.station_catalog.lookup(station_id)
+        if metadata is not None:
+            return metadata
+            
+        zip_content = await self._get_async(self._generate_metadata_url())
+        self.station_catalog.load(self._parse_station_inventory(self._extract_metadata(zip_content)))
+        return self.station_catalog.get(station_id)
         
     def get_temperature_data(
         self,
@@ -190,37 +398,217 @@ class SMNService(WeatherServiceBase):
         Returns:
             List of dictionaries containing temperature data
             
+        Raises:
+            ValueError: If interval is not 'hourly'
+        """
+        return self.get_temperature_data_many([station_id], start_date, end_date, interval).get(station_id, [])
+        
+    def get_temperature_data_many(
+        self,
+        station_ids: Optional[Iterable[str]],
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get temperature data for several SMN stations in a single pass.
+        
+        Every SMN day file contains all stations, so each file is downloaded
+        and parsed once regardless of how many stations are requested.
+        
+        Args:
+            station_ids: SMN station identifiers, or None for all stations
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (must be 'hourly' for SMN)
+            
+        Returns:
+            Dictionary mapping each station identifier to its temperature data
+            
+        Raises:
+            ValueError: If interval is not 'hourly'
+        """
+        if interval != 'hourly':
+            raise ValueError("SMN API only supports hourly data")
+            
+        wanted = list(station_ids) if station_ids is not None else None
+        data_by_station = {station_id: [] for station_id in wanted} if wanted is not None else {}
+        for data in self.iter_temperature_data_many(wanted, start_date, end_date, interval):
+            data_by_station.setdefault(data['station_id'], []).append(data)
+            
+        return data_by_station
+        
+    def iter_temperature_data(
+        self,
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> Iterator[Dict]:
+        """
+        Stream temperature data for a specific SMN station, one day file at a time.
+        
+        Args:
+            station_id: SMN station identifier
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (must be 'hourly' for SMN)
+            
+        Returns:
+            Iterator over dictionaries containing temperature data
+            
+        Raises:
+            ValueError: If interval is not 'hourly'
+        """
+        return self.iter_temperature_data_many([station_id], start_date, end_date, interval)
+        
+    def iter_temperature_data_many(
+        self,
+        station_ids: Optional[Iterable[str]],
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> Iterator[Dict]:
+        """
+        Stream temperature data for several SMN stations in a single pass.
+        
+        Readings are yielded in date order as each day file is parsed; only a
+        bounded window of day files is held in memory.
+        
+        Args:
+            station_ids: SMN station identifiers, or None for all stations
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (must be 'hourly' for SMN)
+            
+        Returns:
+            Iterator over dictionaries containing temperature data
+            
+        Raises:
+            ValueError: If interval is not 'hourly'
+        """
+        if interval != 'hourly':
+            raise ValueError("SMN API only supports hourly data")
+            
+        # Download the day files concurrently; results come back in date order
+        first_day = datetime.combine(start_date.date(), datetime.min.time())
+        num_days = (end_date.date() - start_date.date()).days + 1
+        days = (first_day + timedelta(days=offset) for offset in range(num_days))
+        contents = self._fetch_concurrently(self._fetch_day_file, days)
+        
+        return self._iter_readings(contents, station_ids, start_date, end_date)
+        
+    async def get_temperature_data_async(
+        self,
+        station_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> List[Dict]:
+        """
+        Get temperature data for a specific SMN station on the async backend.
+        
+        Args:
+            station_id: SMN station identifier
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (must be 'hourly' for SMN)
+            
+        Returns:
+            List of dictionaries containing temperature data
+            
+        Raises:
+            ValueError: If interval is not 'hourly'
+        """
+        data = await self.get_temperature_data_many_async([station_id], start_date, end_date, interval)
+        return data.get(station_id, [])
+        
+    async def get_temperature_data_many_async(
+        self,
+        station_ids: Optional[Iterable[str]],
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = 'hourly'
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get temperature data for several SMN stations on the async backend.
+        
+        Args:
+            station_ids: SMN station identifiers, or None for all stations
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            interval: Data interval (must be 'hourly' for SMN)
+            
+        Returns:
+            Dictionary mapping each station identifier to its temperature data
+            
         Raises:
             ValueError: If interval is not 'hourly'
         """
         if interval != 'hourly':
             raise ValueError("SMN API only supports hourly data")
             
-        # Get data for each day in the range
-        current_date = start_date.date()
-        end_date_date = end_date.date()
-        all_data = []
+        first_day = datetime.combine(start_date.date(), datetime.min.time())
+        num_days = (end_date.date() - start_date.date()).days + 1
+        contents = await asyncio.gather(*(
+            self._fetch_day_file_async(first_day + timedelta(days=offset)) for offset in range(num_days)
+        ))
         
-        while current_date <= end_date_date:
-            url = self._generate_data_url(datetime.combine(current_date, datetime.min.time()))
-            try:
-                content = self._download_file(url)
-                lines = content.decode('utf-8').split('\n')
-                
-                # Skip header rows (first two rows)
-                for line in lines[2:]:
-                    if not line.strip():
-                        continue
-                        
-                    data = self._parse_data_line(line)
-                    if data and data['station_id'] == station_id:
-                        if start_date <= data['timestamp'] <= end_date:
-                            all_data.append(data)
-            except requests.exceptions.RequestException:
-                # Skip days with no data
-                pass
-                
-            current_date = datetime.combine(current_date, datetime.min.time()) + timedelta(days=1)
-            current_date = current_date.date()
+        return self._group_readings(contents, station_ids, start_date, end_date)
+        
+    def _group_readings(
+        self,
+        contents: Iterable[Optional[bytes]],
+        station_ids: Optional[Iterable[str]],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, List[Dict]]:
+        """
+        Parse day files and group the readings in range by station.
+        
+        Args:
+            contents: Day file contents in date order (None for missing days)
+            station_ids: SMN station identifiers, or None for all stations
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            
+        Returns:
+            Dictionary mapping each station identifier to its temperature data
+        """
+        wanted = list(station_ids) if station_ids is not None else None
+        data_by_station = {station_id: [] for station_id in wanted} if wanted is not None else {}
+        for data in self._iter_readings(contents, wanted, start_date, end_date):
+            data_by_station.setdefault(data['station_id'], []).append(data)
             
-        return all_data 
\ No newline at end of file
+        return data_by_station
+        
+    def _iter_readings(
+        self,
+        contents: Iterable[Optional[bytes]],
+        station_ids: Optional[Iterable[str]],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Iterator[Dict]:
+        """
+        Parse day files and yield the readings in range of the wanted stations.
+        
+        Args:
+            contents: Day file contents in date order (None for missing days)
+            station_ids: SMN station identifiers, or None for all stations
+            start_date: Start date for the data range
+            end_date: End date for the data range
+            
+        Returns:
+            Iterator over dictionaries containing temperature data
+        """
+        wanted = set(station_ids) if station_ids is not None else None
+        
+        for content in contents:
+            if content is None:
+                continue
+                
+            for data in self._parse_data_file(content):
+                if wanted is not None and data['station_id'] not in wanted:
+                    continue
+                if start_date <= data['timestamp'] <= end_date:
+                    yield data
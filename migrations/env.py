@@ -10,6 +10,10 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.models import Base
+# Core tables and indexes defined outside the models module
+import app.repositories.data_version  # noqa: F401
+import app.repositories.rollup  # noqa: F401
+import app.repositories.temperature  # noqa: F401
 from app.db.init_db import init_db
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,76 @@
+"""Add temperature rollup tables
+
+Revision ID: 434a3465f53c
+Revises: fcb29cb0b5b5
+Create Date: 2026-10-18 11:02:17.540931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '434a3465f53c'
+down_revision: Union[str, None] = 'fcb29cb0b5b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AGGREGATES = (
+    "SUM(temperature), COUNT(id), MIN(temperature), MAX(temperature), "
+    "SUM(temperature * temperature)"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('temperature_daily_rollups',
+    sa.Column('station_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('temperature_sum', sa.Float(), nullable=False),
+    sa.Column('reading_count', sa.Integer(), nullable=False),
+    sa.Column('temperature_min', sa.Float(), nullable=False),
+    sa.Column('temperature_max', sa.Float(), nullable=False),
+    sa.Column('temperature_sum_squares', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['station_id'], ['stations.id'], ),
+    sa.PrimaryKeyConstraint('station_id', 'day')
+    )
+    op.create_table('temperature_monthly_hourly_rollups',
+    sa.Column('station_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('hour', sa.Integer(), nullable=False),
+    sa.Column('temperature_sum', sa.Float(), nullable=False),
+    sa.Column('reading_count', sa.Integer(), nullable=False),
+    sa.Column('temperature_min', sa.Float(), nullable=False),
+    sa.Column('temperature_max', sa.Float(), nullable=False),
+    sa.Column('temperature_sum_squares', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['station_id'], ['stations.id'], ),
+    sa.PrimaryKeyConstraint('station_id', 'month', 'hour')
+    )
+
+    # Backfill from the readings already stored
+    if op.get_bind().dialect.name == 'postgresql':
+        day = "CAST(timestamp AS DATE)"
+        month = "CAST(date_trunc('month', timestamp) AS DATE)"
+        hour = "CAST(EXTRACT(HOUR FROM timestamp) AS INTEGER)"
+    else:
+        day = "date(timestamp)"
+        month = "date(timestamp, 'start of month')"
+        hour = "CAST(strftime('%H', timestamp) AS INTEGER)"
+    op.execute(
+        f"INSERT INTO temperature_daily_rollups "
+        f"SELECT station_id, {day}, {AGGREGATES} "
+        f"FROM temperatures GROUP BY station_id, {day}"
+    )
+    op.execute(
+        f"INSERT INTO temperature_monthly_hourly_rollups "
+        f"SELECT station_id, {month}, {hour}, {AGGREGATES} "
+        f"FROM temperatures GROUP BY station_id, {month}, {hour}"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('temperature_monthly_hourly_rollups')
+    op.drop_table('temperature_daily_rollups')
@@ -0,0 +1,33 @@
+"""Add data_versions table
+
+Revision ID: eef6a2d2694e
+Revises: 434a3465f53c
+Create Date: 2026-10-18 11:48:05.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eef6a2d2694e'
+down_revision: Union[str, None] = '434a3465f53c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    data_versions = op.create_table('data_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(data_versions, [{'name': 'data', 'version': 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('data_versions')
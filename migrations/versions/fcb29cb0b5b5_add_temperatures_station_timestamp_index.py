@@ -0,0 +1,38 @@
+"""Add unique (station_id, timestamp) index on temperatures
+
+Revision ID: fcb29cb0b5b5
+Revises: 0b4e24d759e6
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fcb29cb0b5b5'
+down_revision: Union[str, None] = '0b4e24d759e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep only the most recently inserted reading of each (station_id, timestamp)
+    # so the unique index can be built on databases loaded before it existed
+    op.execute(
+        "DELETE FROM temperatures WHERE id NOT IN ("
+        "SELECT MAX(id) FROM temperatures GROUP BY station_id, timestamp)"
+    )
+    op.create_index(
+        'ix_temperatures_station_id_timestamp',
+        'temperatures',
+        ['station_id', 'timestamp'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_temperatures_station_id_timestamp', table_name='temperatures')
@@ -3,9 +3,14 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import os
+import sys
 import zipfile
 import logging
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.comparison import SEASONS, seasonal_hourly_medians, seasonal_hourly_stats
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -13,6 +18,57 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Station latitudes, selecting the hemisphere of the seasons
+STATION_LATITUDES = {
+    'BUENOS AIRES OBSERVATORIO': -34.58,
+    'TANDIL AERO': -37.23
+}
+
+def station_seasonal_stats(station_df: pd.DataFrame, latitude: float) -> pd.DataFrame:
+    """
+    Compute per season and hour statistics of one station with the comparison service.
+
+    These are the same statistics served by /api/seasonal-comparison.
+
+    Args:
+        station_df: Readings of the station, with date, month, hour and temperature columns
+        latitude: Station latitude
+
+    Returns:
+        DataFrame indexed by (season, hour) with mean, median, max, min and std columns
+    """
+    temperatures = station_df['temperature']
+    grouped = temperatures.groupby([station_df['month'], station_df['hour']])
+    sums = pd.DataFrame({
+        'sum': grouped.sum(),
+        'count': grouped.count(),
+        'min': grouped.min(),
+        'max': grouped.max(),
+        'sum_squares': (temperatures ** 2).groupby([station_df['month'], station_df['hour']]).sum()
+    })
+    seasons = seasonal_hourly_stats(
+        {(int(month), int(hour)): row for (month, hour), row in sums.to_dict('index').items()},
+        latitude
+    )
+
+    timestamps = (station_df['date'] + pd.to_timedelta(station_df['hour'], unit='h')).to_numpy('datetime64[us]')
+    medians = seasonal_hourly_medians(timestamps, temperatures.to_numpy(dtype=float), latitude)
+
+    rows = [
+        {
+            'season': season,
+            'hour': hour,
+            'mean': stats['mean'],
+            'median': medians[season].get(hour),
+            'max': stats['max'],
+            'min': stats['min'],
+            'std': stats['std']
+        }
+        for season in SEASONS
+        for hour, stats in seasons[season].items()
+    ]
+    return pd.DataFrame(rows).set_index(['season', 'hour'])
+
 def main():
     try:
         # Create output directory if it doesn't exist
@@ -49,25 +105,21 @@ def main():
         date_range = f"{start_date}-{end_date}" if start_date != end_date else start_date
         logger.info(f"Data range: {date_range}")
 
-        # Define seasons for Southern Hemisphere
-        season_map = {
-            12: 'Summer', 1: 'Summer', 2: 'Summer',
-            3: 'Autumn', 4: 'Autumn', 5: 'Autumn',
-            6: 'Winter', 7: 'Winter', 8: 'Winter',
-            9: 'Spring', 10: 'Spring', 11: 'Spring'
-        }
-        df['season'] = df['month'].map(season_map)
-
         # Filter for the two stations
         stations = ['BUENOS AIRES OBSERVATORIO', 'TANDIL AERO']
         df_filtered = df[df['station'].isin(stations)]
         logger.info(f"Filtered data for stations: {stations}")
 
-        # Calculate statistics by hour and season for each station
+        # Calculate statistics by hour and season for each station, with the
+        # same service as the dashboard API (hemisphere-aware seasons)
         logger.info("Calculating statistics")
-        seasonal_hourly_stats = df_filtered.groupby(['season', 'station', 'hour'])['temperature'].agg([
-            'mean', 'median', 'max', 'min', 'std'
-        ]).unstack(level=1)
+        seasonal_stats = pd.concat(
+            {
+                station: station_seasonal_stats(df_filtered[df_filtered['station'] == station], STATION_LATITUDES[station])
+                for station in stations
+            },
+            names=['station']
+        ).reorder_levels(['season', 'station', 'hour']).unstack(level=1).sort_index()
 
         # Set up the color scheme and line styles
         colors = {
@@ -90,10 +142,10 @@ def main():
         sns.set_palette("husl")
 
         # Plot each season in a subplot
-        for i, season in enumerate(['Summer', 'Autumn', 'Winter', 'Spring'], 1):
+        for i, season in enumerate(SEASONS, 1):
             plt.subplot(2, 2, i)
             
-            season_data = seasonal_hourly_stats.loc[season]
+            season_data = seasonal_stats.loc[season].copy()
             
             # Calculate temperature differences
             season_data[('mean_diff', '')] = season_data[('mean', 'BUENOS AIRES OBSERVATORIO')] - season_data[('mean', 'TANDIL AERO')]
@@ -144,12 +196,12 @@ def main():
         logger.info(f"Saved combined plot to {output_file}")
 
         # Create individual plots for each season
-        for season in ['Summer', 'Autumn', 'Winter', 'Spring']:
+        for season in SEASONS:
             logger.info(f"Creating plot for {season}")
             plt.figure(figsize=(12, 6))
             sns.set_style("whitegrid")
             
-            season_data = seasonal_hourly_stats.loc[season]
+            season_data = seasonal_stats.loc[season].copy()
             
             # Calculate temperature differences
             season_data[('mean_diff', '')] = season_data[('mean', 'BUENOS AIRES OBSERVATORIO')] - season_data[('mean', 'TANDIL AERO')]
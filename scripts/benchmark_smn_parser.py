@@ -0,0 +1,133 @@
+"""Micro-benchmark of the SMN day-file parsers on a synthetic corpus.
+
+Compares the original per-line parser (uncompiled regex plus strptime for
+every row) against the compiled per-file parser and the vectorized pandas
+path of SMNService.
+
+Usage:
+    python scripts/benchmark_smn_parser.py --years 10 --stations 5
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.weather.smn import SMNService
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+HEADER = (
+    "Fecha    Hora    Temp    Hum    Pres    Viento  Dir     Estacion\n"
+    "ddmmyyyy hh      C       %      hPa     km/h    grados  texto\n"
+)
+
+STATION_NAMES = [
+    'AEROPARQUE AERO', 'BUENOS AIRES OBSERVATORIO', 'TANDIL AERO', 'AZUL AERO',
+    'LABOULAYE AERO', 'CORDOBA AERO', 'MENDOZA AERO', 'ROSARIO AERO',
+    'SALTA AERO', 'USHUAIA AERO'
+]
+
+
+def generate_corpus(years: int, stations: int, seed: int = 42) -> list:
+    """Generate one synthetic SMN day file per day."""
+    rng = random.Random(seed)
+    names = [STATION_NAMES[i % len(STATION_NAMES)] + ('' if i < len(STATION_NAMES) else f' {i}')
+             for i in range(stations)]
+    start = datetime(2015, 1, 1)
+    corpus = []
+    for offset in range(365 * years):
+        day = start + timedelta(days=offset)
+        date_str = day.strftime('%d%m%Y')
+        lines = [HEADER]
+        for hour in range(24):
+            for name in names:
+                temp = rng.uniform(-5.0, 35.0)
+                lines.append(
+                    f"{date_str} {hour:5d} {temp:5.1f} {rng.randint(10, 99):4d} "
+                    f"{rng.uniform(990, 1030):7.1f} {rng.randint(0, 360):4d} {rng.randint(0, 60):4d}     {name}\n"
+                )
+        corpus.append(''.join(lines).encode('utf-8'))
+    return corpus
+
+
+def legacy_parse_data_line(line: str):
+    """Original SMNService._parse_data_line implementation."""
+    pattern = r"(\d{8})\s+(\d{1,2})\s+(-?\d+\.\d+)\s+\d+\s+\d+\.\d+\s+\d+\s+\d+\s+(.*)"
+    match = re.match(pattern, line.strip())
+
+    if not match:
+        return None
+
+    date_str, hour_str, temp_str, station = match.groups()
+    date = datetime.strptime(date_str, "%d%m%Y")
+    hour = int(hour_str)
+    timestamp = datetime.combine(date.date(), datetime.min.time()) + timedelta(hours=hour)
+
+    return {
+        'timestamp': timestamp,
+        'temperature': float(temp_str),
+        'station_id': station.strip()
+    }
+
+
+def run_legacy(service: SMNService, corpus: list) -> int:
+    rows = 0
+    for content in corpus:
+        for line in content.decode('utf-8').split('\n')[2:]:
+            if not line.strip():
+                continue
+            if legacy_parse_data_line(line):
+                rows += 1
+    return rows
+
+
+def run_compiled(service: SMNService, corpus: list) -> int:
+    rows = 0
+    for content in corpus:
+        for _ in service._parse_data_file(content):
+            rows += 1
+    return rows
+
+
+def run_vectorized(service: SMNService, corpus: list) -> int:
+    rows = 0
+    for content in corpus:
+        rows += len(service.parse_data_frame(content))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=int, default=10, help='Years of daily files to generate')
+    parser.add_argument('--stations', type=int, default=5, help='Stations per day file')
+    args = parser.parse_args()
+
+    logger.info(f"Generating {args.years} years of synthetic data for {args.stations} stations")
+    corpus = generate_corpus(args.years, args.stations)
+    service = SMNService()
+
+    results = {}
+    for name, runner in [('legacy', run_legacy), ('compiled', run_compiled), ('vectorized', run_vectorized)]:
+        started = time.perf_counter()
+        rows = runner(service, corpus)
+        elapsed = time.perf_counter() - started
+        results[name] = elapsed
+        logger.info(f"{name:>10}: {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+
+    for name in ('compiled', 'vectorized'):
+        print(f"{name} speedup over legacy: {results['legacy'] / results[name]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
+import os
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 from app.db.models import Base
 from app.db.init_db import init_db
+from app.repositories import enable_sqlite_savepoints
 
 @pytest.fixture(scope="session")
 def db_engine():
     """Create a test database engine."""
     engine = create_engine('sqlite:///:memory:')
+    # The same transaction handling as the application's engine, so the
+    # per-test transaction is real and unit_of_work savepoints nest in it
+    enable_sqlite_savepoints(engine)
     Base.metadata.create_all(engine)
     return engine
 
@@ -22,4 +27,29 @@ def db_session(db_engine):
     
     session.close()
     transaction.rollback()
-    connection.close() 
\ No newline at end of file
+    connection.close()
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    """Create a PostgreSQL test engine from DATABASE_URL (set in CI)."""
+    url = os.environ.get('DATABASE_URL', '')
+    if not url.startswith('postgresql'):
+        pytest.skip("DATABASE_URL does not point to PostgreSQL")
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+@pytest.fixture(scope="function")
+def pg_session(pg_engine):
+    """Create a PostgreSQL session whose changes are rolled back after each test."""
+    connection = pg_engine.connect()
+    transaction = connection.begin()
+    session = scoped_session(sessionmaker(bind=connection))
+
+    yield session
+
+    session.close()
+    transaction.rollback()
+    connection.close()
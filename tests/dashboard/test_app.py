@@ -1,12 +1,38 @@
+import numpy as np
 import pytest
 from flask import Flask
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
+from sqlalchemy.exc import SQLAlchemyError
 from app.dashboard.app import create_app
-from datetime import datetime
+from app.dashboard.pagination import encode_cursor
+from datetime import date, datetime, timedelta
 
 @pytest.fixture
-def app():
-    """Create a test Flask application."""
+def mock_db_session():
+    """Create a mock database session."""
+    with patch('app.dashboard.app.init_db') as mock_init:
+        mock_session = MagicMock()
+        mock_init.return_value = mock_session
+        yield mock_session
+
+@pytest.fixture
+def mock_repos():
+    """Replace the repositories used by the endpoints with mocks."""
+    with patch('app.dashboard.app.StationRepository') as station_repo, \
+            patch('app.dashboard.app.TemperatureRepository') as temp_repo, \
+            patch('app.dashboard.app.RollupRepository') as rollup_repo, \
+            patch('app.dashboard.app.DataVersionRepository') as version_repo:
+        version_repo.return_value.get.return_value = 0
+        yield SimpleNamespace(
+            station=station_repo.return_value,
+            temperature=temp_repo.return_value,
+            rollup=rollup_repo.return_value
+        )
+
+@pytest.fixture
+def app(mock_db_session, mock_repos):
+    """Create a test Flask application on the mocked session and repositories."""
     app = create_app()
     app.config['TESTING'] = True
     return app
@@ -16,15 +42,7 @@ def client(app):
     """Create a test client for the Flask application."""
     return app.test_client()
 
-@pytest.fixture
-def mock_db_session():
-    """Create a mock database session."""
-    with patch('app.dashboard.app.init_db') as mock_init:
-        mock_session = MagicMock()
-        mock_init.return_value = mock_session
-        yield mock_session
-
-def test_get_cities_success(client, mock_db_session):
+def test_get_cities_success(client, mock_repos):
     """Test successful retrieval of cities."""
     # Mock station repository
     mock_stations = [
@@ -43,14 +61,14 @@ def test_get_cities_success(client, mock_db_session):
             longitude=-118.2437
         )
     ]
-    
-    mock_repo = MagicMock()
-    mock_repo.get_all.return_value = mock_stations
-    mock_db_session.return_value = mock_repo
-    
+    # MagicMock reserves `name` as a constructor argument
+    for station, name in zip(mock_stations, ["Test Station", "Another Station"]):
+        station.name = name
+    mock_repos.station.get_all.return_value = mock_stations
+
     response = client.get('/api/cities')
     assert response.status_code == 200
-    
+
     data = response.get_json()
     assert len(data) == 2
     assert data[0]['name'] == "Test Station"
@@ -62,81 +80,64 @@ def test_get_cities_success(client, mock_db_session):
     assert data[1]['latitude'] == 34.0522
     assert data[1]['longitude'] == -118.2437
 
-def test_get_cities_database_error(client, mock_db_session):
+def test_get_cities_database_error(client, mock_repos):
     """Test handling of database errors."""
-    mock_repo = MagicMock()
-    mock_repo.get_all.side_effect = Exception("Database error")
-    mock_db_session.return_value = mock_repo
-    
+    mock_repos.station.get_all.side_effect = SQLAlchemyError("Database error")
+
     response = client.get('/api/cities')
     assert response.status_code == 500
-    
+
     data = response.get_json()
     assert data['error'] == 'Database error occurred'
 
-def test_get_cities_unexpected_error(client, mock_db_session):
+def test_get_cities_unexpected_error(client, mock_repos):
     """Test handling of unexpected errors."""
-    mock_repo = MagicMock()
-    mock_repo.get_all.side_effect = ValueError("Unexpected error")
-    mock_db_session.return_value = mock_repo
-    
+    mock_repos.station.get_all.side_effect = ValueError("Unexpected error")
+
     response = client.get('/api/cities')
     assert response.status_code == 500
-    
+
     data = response.get_json()
     assert data['error'] == 'An unexpected error occurred'
 
-def test_get_temperature_comparison_success(client, mock_db_session):
-    """Test successful retrieval of temperature comparison data using real SMN data."""
-    # Create SMN service instance
-    from app.services.weather.smn import SMNService
-    smn_service = SMNService()
-    
-    # Get real station metadata
-    station1_metadata = smn_service.get_station_metadata("87534")  # LABOULAYE AERO
-    station2_metadata = smn_service.get_station_metadata("89034")  # BASE BELGRANO II
-    
-    # Get real temperature data for a specific date
-    start_date = datetime(2024, 4, 20)
-    end_date = datetime(2024, 4, 21)
-    
-    station1_data = smn_service.get_temperature_data("87534", start_date, end_date)
-    station2_data = smn_service.get_temperature_data("89034", start_date, end_date)
-    
-    # Mock the database session to return our real data
-    mock_repo = MagicMock()
-    mock_repo.get_by_station_and_date_range.return_value = station1_data + station2_data
-    mock_db_session.return_value = mock_repo
-    
-    response = client.get('/api/temperature-comparison?city1_id=87534&city2_id=89034&start_date=2024-04-20&end_date=2024-04-21')
+def test_get_temperature_comparison_success(client, mock_repos):
+    """Test successful retrieval of temperature comparison data."""
+    mock_repos.temperature.get_hourly_stats.return_value = {
+        1: {
+            hour: {'avg': 20.0 + hour, 'count': 2, 'min': 19.0 + hour, 'max': 21.0 + hour}
+            for hour in range(24)
+        },
+        # The second city has no readings at midnight
+        2: {
+            hour: {'avg': 10.0 + 2 * hour, 'count': 2, 'min': 9.0, 'max': 60.0}
+            for hour in range(1, 24)
+        }
+    }
+
+    response = client.get('/api/temperature-comparison?city1_id=1&city2_id=2&start_date=2024-04-20&end_date=2024-04-21')
     assert response.status_code == 200
-    
+    mock_repos.temperature.get_hourly_stats.assert_called_once_with(
+        [1, 2], datetime(2024, 4, 20), datetime(2024, 4, 21)
+    )
+
     data = response.get_json()
-    assert 'hourly_data' in data
-    assert 'min_difference' in data
-    assert 'max_difference' in data
-    
-    # Check hourly data
     hourly_data = data['hourly_data']
     assert len(hourly_data) == 24  # 24 hours in a day
-    
-    # Verify the data matches our expectations
-    for hour_data in hourly_data:
+    assert hourly_data[0] == {'hour': 0, 'city1_temperature': 20.0, 'city2_temperature': None, 'difference': None}
+    for hour_data in hourly_data[1:]:
         hour = hour_data['hour']
-        # Find corresponding data points from our real data
-        station1_temp = next((d['temperature'] for d in station1_data if d['timestamp'].hour == hour), None)
-        station2_temp = next((d['temperature'] for d in station2_data if d['timestamp'].hour == hour), None)
-        
-        if station1_temp is not None and station2_temp is not None:
-            assert hour_data['city1_temperature'] == station1_temp
-            assert hour_data['city2_temperature'] == station2_temp
-            assert hour_data['difference'] == abs(station1_temp - station2_temp)
+        assert hour_data['city1_temperature'] == 20.0 + hour
+        assert hour_data['city2_temperature'] == 10.0 + 2 * hour
+        assert hour_data['difference'] == 10.0 - hour
+
+    assert data['min_difference'] == {'hour': 23, 'difference': -13.0}
+    assert data['max_difference'] == {'hour': 1, 'difference': 9.0}
 
 def test_get_temperature_comparison_missing_params(client):
     """Test handling of missing parameters."""
     response = client.get('/api/temperature-comparison')
     assert response.status_code == 400
-    
+
     data = response.get_json()
     assert data['error'] == 'Missing required parameters'
 
@@ -144,30 +145,258 @@ def test_get_temperature_comparison_invalid_date(client):
     """Test handling of invalid date format."""
     response = client.get('/api/temperature-comparison?city1_id=87534&city2_id=89034&start_date=invalid&end_date=2024-04-21')
     assert response.status_code == 400
-    
+
     data = response.get_json()
     assert data['error'] == 'Invalid date format. Use YYYY-MM-DD'
 
-def test_get_temperature_comparison_database_error(client, mock_db_session):
+def test_get_temperature_comparison_database_error(client, mock_repos):
     """Test handling of database errors."""
-    mock_repo = MagicMock()
-    mock_repo.get_by_station_and_date_range.side_effect = Exception("Database error")
-    mock_db_session.return_value = mock_repo
-    
+    mock_repos.temperature.get_hourly_stats.side_effect = SQLAlchemyError("Database error")
+
     response = client.get('/api/temperature-comparison?city1_id=87534&city2_id=89034&start_date=2024-04-20&end_date=2024-04-21')
     assert response.status_code == 500
-    
+
     data = response.get_json()
     assert data['error'] == 'Database error occurred'
 
-def test_get_temperature_comparison_unexpected_error(client, mock_db_session):
+def test_get_temperature_comparison_unexpected_error(client, mock_repos):
     """Test handling of unexpected errors."""
-    mock_repo = MagicMock()
-    mock_repo.get_by_station_and_date_range.side_effect = ValueError("Unexpected error")
-    mock_db_session.return_value = mock_repo
-    
+    mock_repos.temperature.get_hourly_stats.side_effect = ValueError("Unexpected error")
+
     response = client.get('/api/temperature-comparison?city1_id=87534&city2_id=89034&start_date=2024-04-20&end_date=2024-04-21')
     assert response.status_code == 500
-    
+
+    data = response.get_json()
+    assert data['error'] == 'An unexpected error occurred'
+
+def test_get_seasonal_comparison_with_missing_medians(client, mock_repos):
+    """Test that hours without a median on either side get no median difference."""
+    mock_repos.station.get.side_effect = lambda station_id: MagicMock(id=station_id, latitude=-34.6)
+    sums = {'sum': 40.0, 'count': 2, 'min': 19.0, 'max': 21.0, 'sum_squares': 802.0}
+    mock_repos.temperature.get_monthly_hourly_stats.return_value = {
+        1: {(1, 0): dict(sums), (1, 1): dict(sums)},
+        2: {(1, 0): dict(sums, sum=30.0), (1, 1): dict(sums, sum=30.0)}
+    }
+    readings = {
+        # Station 1 has no raw readings at 01:00 but one at 05:00, an hour
+        # missing from its statistics
+        1: (['2024-01-10T00:00', '2024-01-11T00:00', '2024-01-10T05:00'], [19.0, 21.0, 25.0]),
+        2: (['2024-01-10T00:00', '2024-01-10T01:00'], [15.0, 14.0])
+    }
+    mock_repos.temperature.get_arrays_by_station_and_date_range.side_effect = (
+        lambda station_id, start, end, dtype: (
+            np.array(readings[station_id][0], dtype='datetime64[us]'),
+            np.array(readings[station_id][1], dtype=dtype)
+        )
+    )
+
+    response = client.get('/api/seasonal-comparison?city1_id=1&city2_id=2&start_date=2024-01-01&end_date=2024-01-31&median=true')
+    assert response.status_code == 200
+
+    summer = response.get_json()['seasons']['Summer']['hourly_data']
+    assert summer[0]['mean_difference'] == 5.0
+    assert summer[0]['median_difference'] == 5.0
+    assert summer[1]['mean_difference'] == 5.0
+    assert summer[1]['median_difference'] is None
+    assert summer[5]['city1'] is None
+
+def make_station(station_id):
+    """Create a mock station with the given ID."""
+    station = MagicMock(id=station_id, code=f"TEST{station_id:03d}", latitude=-34.6, longitude=-58.4)
+    station.name = f"Station {station_id}"
+    return station
+
+def test_get_cities_pages(client, mock_repos):
+    """Test walking the paginated cities list to its last page."""
+    stations = [make_station(station_id) for station_id in range(1, 6)]
+    mock_repos.station.get_page.side_effect = lambda limit, after_id: [
+        station for station in stations if after_id is None or station.id > after_id
+    ][:limit]
+
+    ids = []
+    url = '/api/cities?limit=2'
+    for _ in range(3):
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.get_json()
+        ids.extend(city['id'] for city in data['items'])
+        if data['next_cursor'] is None:
+            break
+        url = f"/api/cities?limit=2&cursor={data['next_cursor']}"
+
+    assert ids == [1, 2, 3, 4, 5]
+    assert data['next_cursor'] is None
+    assert len(data['items']) == 1
+
+def test_get_cities_invalid_pagination(client, mock_repos):
+    """Test that malformed cursors and out-of-range limits are rejected."""
+    for query in ['cursor=not-a-cursor', f"cursor={encode_cursor(['abc'])}", 'limit=0', 'limit=1001']:
+        response = client.get(f'/api/cities?{query}')
+        assert response.status_code == 400
+    mock_repos.station.get_page.assert_not_called()
+
+def test_get_temperatures_pages(client, mock_repos):
+    """Test walking the keyset-paginated readings to their last page."""
+    start = datetime(2024, 1, 1)
+    readings = [
+        MagicMock(station_id=station_id, timestamp=start.replace(hour=hour), temperature=float(hour))
+        for station_id in (1, 2) for hour in range(3)
+    ]
+    mock_repos.temperature.get_page_by_station_and_timestamp.side_effect = lambda limit, after, station_id: [
+        reading for reading in readings
+        if after is None or (reading.station_id, reading.timestamp) > after
+    ][:limit]
+
+    keys = []
+    url = '/api/temperatures?limit=4'
+    for _ in range(3):
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.get_json()
+        keys.extend((item['station_id'], item['timestamp']) for item in data['items'])
+        if data['next_cursor'] is None:
+            break
+        url = f"/api/temperatures?limit=4&cursor={data['next_cursor']}"
+
+    assert keys == [(reading.station_id, reading.timestamp.isoformat()) for reading in readings]
+    assert data['next_cursor'] is None
+    calls = mock_repos.temperature.get_page_by_station_and_timestamp.call_args_list
+    assert calls[1].args == (5, (2, datetime(2024, 1, 1)), None)
+
+def test_get_temperatures_invalid_pagination(client, mock_repos):
+    """Test that malformed cursors and out-of-range limits are rejected."""
+    for query in [
+        'cursor=not-a-cursor',
+        f"cursor={encode_cursor([1])}",
+        f"cursor={encode_cursor(['abc', datetime(2024, 1, 1)])}",
+        f"cursor={encode_cursor([1, 'abc'])}",
+        'limit=0'
+    ]:
+        response = client.get(f'/api/temperatures?{query}')
+        assert response.status_code == 400
+        assert response.get_json()['error'] in ('Invalid cursor', 'limit must be between 1 and 10000')
+    mock_repos.temperature.get_page_by_station_and_timestamp.assert_not_called()
+
+def test_get_multi_city_comparison_success(client, mock_repos):
+    """Test the hourly matrix and pairwise differences of several cities."""
+    mock_repos.station.get.side_effect = make_station
+    mock_repos.temperature.get_hourly_stats.return_value = {
+        1: {hour: {'avg': 20.0, 'count': 1, 'min': 20.0, 'max': 20.0} for hour in range(24)},
+        2: {hour: {'avg': 15.0, 'count': 1, 'min': 15.0, 'max': 15.0} for hour in range(12)},
+        3: {}
+    }
+
+    response = client.get('/api/multi-city-comparison?station_ids=1,2&station_ids=3&start_date=2024-04-20&end_date=2024-04-21')
+    assert response.status_code == 200
+    mock_repos.temperature.get_hourly_stats.assert_called_once_with(
+        [1, 2, 3], datetime(2024, 4, 20), datetime(2024, 4, 21)
+    )
+
+    data = response.get_json()
+    assert data['station_ids'] == [1, 2, 3]
+    assert [entry['station_id'] for entry in data['hourly_data']] == [1, 2, 3]
+    assert data['hourly_data'][0]['hours'][23] == {'hour': 23, 'avg': 20.0, 'count': 1, 'min': 20.0, 'max': 20.0}
+    assert data['hourly_data'][1]['hours'][12] == {'hour': 12, 'avg': None, 'count': 0, 'min': None, 'max': None}
+    # Differences are averaged over the hours both cities have readings for
+    assert data['difference_matrix'] == [
+        [0.0, 5.0, None],
+        [-5.0, 0.0, None],
+        [None, None, None]
+    ]
+
+def test_get_multi_city_comparison_unknown_city(client, mock_repos):
+    """Test that an unknown city is reported as not found."""
+    mock_repos.station.get.side_effect = lambda station_id: make_station(station_id) if station_id != 99 else None
+
+    response = client.get('/api/multi-city-comparison?station_ids=1,99&start_date=2024-04-20&end_date=2024-04-21')
+    assert response.status_code == 404
+    assert response.get_json()['error'] == 'Station not found'
+    mock_repos.temperature.get_hourly_stats.assert_not_called()
+
+def test_get_multi_city_comparison_invalid_params(client, mock_repos):
+    """Test that fewer than two cities and malformed ids are rejected."""
+    dates = 'start_date=2024-04-20&end_date=2024-04-21'
+    for query, error in [
+        (f'station_ids=1&{dates}', 'At least two station ids are required'),
+        (f'station_ids=1,1&{dates}', 'At least two station ids are required'),
+        (f'station_ids=1,abc&{dates}', 'Invalid station ids'),
+        ('station_ids=1,2', 'Missing required parameters')
+    ]:
+        response = client.get(f'/api/multi-city-comparison?{query}')
+        assert response.status_code == 400
+        assert response.get_json()['error'] == error
+    mock_repos.temperature.get_hourly_stats.assert_not_called()
+
+def test_get_temperature_series_hourly(client, mock_repos):
+    """Test that short ranges are served from the raw readings, one point per reading."""
+    start = datetime(2024, 4, 20)
+    mock_repos.temperature.get_series.return_value = [
+        (start.replace(hour=hour), float(hour)) for hour in range(24)
+    ]
+
+    response = client.get('/api/temperature-series?station_id=1&start_date=2024-04-20&end_date=2024-04-20')
+    assert response.status_code == 200
+    mock_repos.temperature.get_series.assert_called_once_with(1, start, datetime(2024, 4, 20, 23, 59, 59, 999999))
+    mock_repos.rollup.get_daily.assert_not_called()
+
+    data = response.get_json()
+    assert data['bucket'] == 'hour'
+    assert data['downsampled'] is False
+    assert len(data['points']) == 24
+    assert data['points'][5] == {'timestamp': '2024-04-20T05:00:00', 'avg': 5.0, 'min': 5.0, 'max': 5.0, 'count': 1}
+
+def test_get_temperature_series_daily(client, mock_repos):
+    """Test that long ranges are merged from the daily rollups."""
+    mock_repos.rollup.get_daily.return_value = [
+        SimpleNamespace(
+            day=date(2024, 1, 1) + timedelta(days=offset),
+            temperature_sum=24.0 * offset,
+            reading_count=24,
+            temperature_min=offset - 1.0,
+            temperature_max=offset + 1.0
+        )
+        for offset in range(366)
+    ]
+
+    response = client.get('/api/temperature-series?station_id=1&start_date=2024-01-01&end_date=2024-12-31&max_points=500')
+    assert response.status_code == 200
+    mock_repos.rollup.get_daily.assert_called_once_with([1], date(2024, 1, 1), date(2024, 12, 31))
+    mock_repos.temperature.get_series.assert_not_called()
+
+    data = response.get_json()
+    assert data['bucket'] == 'day'
+    assert data['downsampled'] is False
+    assert len(data['points']) == 366
+    assert data['points'][2] == {'timestamp': '2024-01-03T00:00:00', 'avg': 2.0, 'min': 1.0, 'max': 3.0, 'count': 24}
+
+def test_get_temperature_series_point_limit(client, mock_repos):
+    """Test that an explicit fine bucket is downsampled with LTTB to max_points."""
+    start = datetime(2024, 4, 1)
+    mock_repos.temperature.get_series.return_value = [
+        (start + timedelta(hours=hour), float(hour % 24)) for hour in range(24 * 30)
+    ]
+
+    response = client.get('/api/temperature-series?station_id=1&start_date=2024-04-01&end_date=2024-04-30&bucket=hour&max_points=100')
+    assert response.status_code == 200
+
     data = response.get_json()
-    assert data['error'] == 'An unexpected error occurred' 
\ No newline at end of file
+    assert data['bucket'] == 'hour'
+    assert data['downsampled'] is True
+    assert len(data['points']) == 100
+    # LTTB keeps the first and last points
+    assert data['points'][0]['timestamp'] == '2024-04-01T00:00:00'
+    assert data['points'][-1]['timestamp'] == '2024-04-30T23:00:00'
+
+def test_get_temperature_series_invalid_params(client, mock_repos):
+    """Test that invalid buckets, point limits and date ranges are rejected."""
+    for query in [
+        'station_id=1&start_date=2024-04-20&end_date=2024-04-21&bucket=minute',
+        'station_id=1&start_date=2024-04-20&end_date=2024-04-21&max_points=2',
+        'station_id=1&start_date=2024-04-21&end_date=2024-04-20',
+        'station_id=1&start_date=invalid&end_date=2024-04-20',
+        'start_date=2024-04-20&end_date=2024-04-21'
+    ]:
+        response = client.get(f'/api/temperature-series?{query}')
+        assert response.status_code == 400
+    mock_repos.temperature.get_series.assert_not_called()
+    mock_repos.rollup.get_daily.assert_not_called()
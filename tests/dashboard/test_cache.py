@@ -0,0 +1,151 @@
+import gzip
+import os
+import pytest
+from flask import Flask, jsonify, request
+from unittest.mock import MagicMock, patch
+
+from app.dashboard.cache import FileCacheBackend, MemoryCacheBackend, ResponseCache
+
+def test_memory_backend_lru_eviction():
+    """Test that the least recently used entry is evicted beyond the size bound."""
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set('a', b'1')
+    backend.set('b', b'2')
+    assert backend.get('a') == b'1'
+    backend.set('c', b'3')
+
+    assert backend.get('a') == b'1'
+    assert backend.get('b') is None
+    assert backend.get('c') == b'3'
+
+def test_file_backend_lru_eviction(tmp_path):
+    """Test that the file backend evicts the least recently used file."""
+    backend = FileCacheBackend(str(tmp_path / 'cache'), max_entries=2)
+    backend.set('a', b'1')
+    backend.set('b', b'2')
+    os.utime(backend._path('a'), (1000, 1000))
+    os.utime(backend._path('b'), (900, 900))
+    backend.set('c', b'3')
+
+    assert backend.get('a') == b'1'
+    assert backend.get('b') is None
+    assert backend.get('c') == b'3'
+
+    backend.clear()
+    assert backend.get('a') is None
+
+def test_file_backend_throttles_eviction(tmp_path):
+    """Test that the cache directory is scanned for eviction only every few writes."""
+    backend = FileCacheBackend(str(tmp_path / 'cache'), max_entries=2, evict_every=3)
+    for key in ('a', 'b', 'c'):
+        backend.set(key, b'1')
+    assert len(os.listdir(backend.cache_dir)) == 2
+    backend.set('d', b'1')
+    backend.set('e', b'1')
+    assert len(os.listdir(backend.cache_dir)) == 4
+    backend.set('f', b'1')
+    assert len(os.listdir(backend.cache_dir)) == 2
+
+def test_file_backend_clear_during_write(tmp_path):
+    """Test that clear() leaves in-flight writes alone and a write losing the race is not an error."""
+    backend = FileCacheBackend(str(tmp_path / 'cache'))
+    in_flight = tmp_path / 'cache' / 'pending.tmp'
+    in_flight.write_bytes(b'1')
+    backend.clear()
+    assert in_flight.exists()
+
+    with patch('app.dashboard.cache.os.replace', side_effect=FileNotFoundError):
+        backend.set('a', b'1')
+    assert backend.get('a') is None
+
+@pytest.fixture
+def app_and_view():
+    """Create a Flask app with a cached view counting its calls."""
+    app = Flask(__name__)
+    view = MagicMock(side_effect=lambda: jsonify({'city': request.args.get('city')}))
+    version = MagicMock(return_value=1)
+    cache = ResponseCache(get_version=version, version_ttl=0)
+
+    @app.route('/api/data')
+    @cache.cached
+    def data():
+        return view()
+
+    return app, view, version
+
+def test_repeated_requests_are_served_from_cache(app_and_view):
+    """Test that equivalent queries share one cached response."""
+    app, view, _ = app_and_view
+    client = app.test_client()
+
+    first = client.get('/api/data?city=1&unit=c')
+    second = client.get('/api/data?unit=c&city=1')
+
+    assert first.get_json() == second.get_json() == {'city': '1'}
+    assert view.call_count == 1
+    client.get('/api/data?city=2')
+    assert view.call_count == 2
+
+def test_version_bump_invalidates_cache(app_and_view):
+    """Test that a new data version recomputes responses."""
+    app, view, version = app_and_view
+    client = app.test_client()
+
+    client.get('/api/data?city=1')
+    version.return_value = 2
+    client.get('/api/data?city=1')
+    assert view.call_count == 2
+
+def test_errors_are_not_cached():
+    """Test that error responses are recomputed on every request."""
+    app = Flask(__name__)
+    view = MagicMock(side_effect=lambda: (jsonify({'error': 'Database error occurred'}), 500))
+    cache = ResponseCache(get_version=lambda: 1)
+
+    @app.route('/api/data')
+    @cache.cached
+    def data():
+        return view()
+
+    client = app.test_client()
+    assert client.get('/api/data').status_code == 500
+    assert client.get('/api/data').status_code == 500
+    assert view.call_count == 2
+
+def test_conditional_get_returns_not_modified(app_and_view):
+    """Test that a matching If-None-Match is answered with 304 until the data changes."""
+    app, view, version = app_and_view
+    client = app.test_client()
+
+    first = client.get('/api/data?city=1')
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    revalidated = client.get('/api/data?city=1', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == etag
+    assert view.call_count == 1
+
+    version.return_value = 2
+    changed = client.get('/api/data?city=1', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+def test_large_responses_are_gzipped():
+    """Test that large bodies are compressed for clients accepting gzip."""
+    app = Flask(__name__)
+    cache = ResponseCache(get_version=lambda: 1, min_compress_size=100)
+
+    @app.route('/api/data')
+    @cache.cached
+    def data():
+        return jsonify([{'hour': hour, 'temperature': 20.0} for hour in range(24)])
+
+    client = app.test_client()
+    plain = client.get('/api/data')
+    assert 'Content-Encoding' not in plain.headers
+
+    compressed = client.get('/api/data', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
@@ -0,0 +1,26 @@
+import pytest
+from datetime import datetime
+
+from app.dashboard.pagination import decode_cursor, encode_cursor
+
+def test_cursor_round_trip():
+    """Test that keys survive encoding, including datetimes."""
+    key = [3, datetime(2024, 1, 1, 5)]
+    token = encode_cursor(key)
+    assert decode_cursor(token, [int, datetime]) == key
+
+def test_invalid_cursor():
+    """Test that malformed tokens are rejected."""
+    with pytest.raises(ValueError):
+        decode_cursor('not a cursor', [int])
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([1]), [int, datetime])
+
+def test_cursor_with_unexpected_types():
+    """Test that keys whose values have other types are rejected."""
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(['abc']), [int])
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([True]), [int])
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([1, 2]), [int, datetime])
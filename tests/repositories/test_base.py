@@ -1,7 +1,11 @@
 import pytest
 from datetime import datetime
-from app.db.models import Station
-from app.repositories.base import BaseRepository
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.db.models import Base, Station
+from app.repositories.base import BaseRepository, enable_sqlite_savepoints
+
 
 def test_create(db_session):
     """Test creating a record."""
@@ -17,6 +21,7 @@ def test_create(db_session):
     assert station.name == 'Test Station'
     assert station.code == 'TEST001'
 
+
 def test_get(db_session):
     """Test getting a record by ID."""
     repo = BaseRepository(Station, db_session)
@@ -31,6 +36,7 @@ def test_get(db_session):
     assert retrieved is not None
     assert retrieved.name == 'Test Station'
 
+
 def test_get_all(db_session):
     """Test getting all records."""
     repo = BaseRepository(Station, db_session)
@@ -45,6 +51,7 @@ def test_get_all(db_session):
     assert len(stations) == 1
     assert stations[0].name == 'Test Station'
 
+
 def test_update(db_session):
     """Test updating a record."""
     repo = BaseRepository(Station, db_session)
@@ -58,6 +65,7 @@ def test_update(db_session):
     updated = repo.update(station.id, {'name': 'Updated Station'})
     assert updated.name == 'Updated Station'
 
+
 def test_delete(db_session):
     """Test deleting a record."""
     repo = BaseRepository(Station, db_session)
@@ -71,6 +79,7 @@ def test_delete(db_session):
     assert repo.delete(station.id) is True
     assert repo.get(station.id) is None
 
+
 def test_bulk_create(db_session):
     """Test creating multiple records in bulk."""
     repo = BaseRepository(Station, db_session)
@@ -91,4 +100,164 @@ def test_bulk_create(db_session):
     stations = repo.bulk_create(stations_data)
     assert len(stations) == 2
     assert stations[0].name == 'Station 1'
-    assert stations[1].name == 'Station 2' 
\ No newline at end of file
+    assert stations[1].name == 'Station 2'
+
+
+def test_iter_all(db_session):
+    """Test streaming all records in batches."""
+    repo = BaseRepository(Station, db_session)
+    for i in range(5):
+        repo.create({
+            'name': f'Station {i}',
+            'code': f'TEST{i:03d}',
+            'latitude': 40.0 + i,
+            'longitude': -74.0
+        })
+
+    batches = list(repo.iter_all(chunk_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [station.code for batch in batches for station in batch] == [f'TEST{i:03d}' for i in range(5)]
+
+
+def test_get_page(db_session):
+    """Test keyset pagination on the ID."""
+    repo = BaseRepository(Station, db_session)
+    ids = [
+        repo.create({
+            'name': f'Station {i}',
+            'code': f'TEST{i:03d}',
+            'latitude': 40.0 + i,
+            'longitude': -74.0
+        }).id
+        for i in range(5)
+    ]
+
+    first = repo.get_page(limit=2)
+    assert [station.id for station in first] == ids[:2]
+    second = repo.get_page(limit=2, after_id=first[-1].id)
+    assert [station.id for station in second] == ids[2:4]
+    assert [station.id for station in repo.get_page(limit=2, after_id=ids[-1])] == []
+
+
+def test_unit_of_work_commits_once(db_session):
+    """Test that writes inside a unit of work share a single commit."""
+    repo = BaseRepository(Station, db_session)
+    # The read autobegins a transaction, which the unit of work still commits
+    assert repo.get_all() == []
+    with patch.object(db_session, 'commit', wraps=db_session.commit) as commit:
+        with repo.unit_of_work():
+            stations = [
+                repo.create({
+                    'name': f'Station {i}',
+                    'code': f'TEST{i:03d}',
+                    'latitude': 40.0 + i,
+                    'longitude': -74.0
+                })
+                for i in range(3)
+            ]
+            # Flushed, so IDs are assigned before the commit
+            assert all(station.id is not None for station in stations)
+            repo.update(stations[0].id, {'name': 'Renamed'})
+            repo.delete(stations[1].id)
+            commit.assert_not_called()
+    commit.assert_called_once()
+    assert sorted(station.name for station in repo.get_all()) == ['Renamed', 'Station 2']
+
+
+@pytest.mark.filterwarnings('error')
+def test_unit_of_work_rolls_back_on_error(db_session):
+    """Test that a failing unit of work discards its writes."""
+    repo = BaseRepository(Station, db_session)
+    with pytest.raises(RuntimeError):
+        with repo.unit_of_work():
+            repo.create({
+                'name': 'Test Station',
+                'code': 'TEST001',
+                'latitude': 40.7128,
+                'longitude': -74.0060
+            })
+            raise RuntimeError("ingestion failed")
+    assert repo.get_all() == []
+    assert not repo.in_unit_of_work()
+
+
+@pytest.mark.filterwarnings('error')
+def test_unit_of_work_rolls_back_only_its_writes(db_session):
+    """Test that a failing unit of work keeps the session's earlier, uncommitted work."""
+    repo = BaseRepository(Station, db_session)
+    db_session.add(Station(name='Earlier Station', code='TEST000', latitude=40.0, longitude=-74.0))
+    db_session.flush()
+
+    with pytest.raises(RuntimeError):
+        with repo.unit_of_work():
+            repo.create({
+                'name': 'Test Station',
+                'code': 'TEST001',
+                'latitude': 40.7128,
+                'longitude': -74.0060
+            })
+            raise RuntimeError("ingestion failed")
+    assert [station.code for station in repo.get_all()] == ['TEST000']
+
+
+@pytest.mark.filterwarnings('error')
+def test_unit_of_work_leaves_the_callers_commit_to_the_caller(db_session):
+    """Test that a unit of work inside the caller's transaction only releases its savepoint."""
+    repo = BaseRepository(Station, db_session)
+    db_session.begin()
+    db_session.add(Station(name='Earlier Station', code='TEST000', latitude=40.0, longitude=-74.0))
+
+    with patch.object(db_session, 'commit', wraps=db_session.commit) as commit:
+        with repo.unit_of_work():
+            repo.create({
+                'name': 'Test Station',
+                'code': 'TEST001',
+                'latitude': 40.7128,
+                'longitude': -74.0060
+            })
+        commit.assert_not_called()
+    assert db_session().in_transaction()
+    assert [station.code for station in repo.get_all()] == ['TEST000', 'TEST001']
+
+
+# Rolling back the session also ends the fixture's outer transaction
+@pytest.mark.filterwarnings('ignore:transaction already deassociated from connection')
+def test_unit_of_work_failed_commit_rolls_back_the_session(db_session):
+    """Test that a commit failing after the savepoint is released rolls back the session, not the savepoint."""
+    repo = BaseRepository(Station, db_session)
+    with patch.object(db_session, 'commit', side_effect=RuntimeError("commit failed")), \
+            patch.object(db_session, 'rollback', wraps=db_session.rollback) as rollback:
+        with pytest.raises(RuntimeError, match="commit failed"):
+            with repo.unit_of_work():
+                repo.create({
+                    'name': 'Test Station',
+                    'code': 'TEST001',
+                    'latitude': 40.7128,
+                    'longitude': -74.0060
+                })
+    rollback.assert_called_once()
+    assert not repo.in_unit_of_work()
+
+
+def test_enable_sqlite_savepoints():
+    """Test that savepoints roll back only their own writes on an engine set up like the application's."""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    enable_sqlite_savepoints(engine)
+    # Connections pooled before the hooks were added are covered too
+    with engine.connect() as connection:
+        assert connection.connection.dbapi_connection.isolation_level is None
+    session = Session(engine)
+    repo = BaseRepository(Station, session)
+
+    session.begin()
+    session.add(Station(name='Earlier Station', code='TEST000', latitude=40.0, longitude=-74.0))
+    with pytest.raises(RuntimeError):
+        with repo.unit_of_work():
+            repo.create({'name': 'Test Station', 'code': 'TEST001', 'latitude': 40.7, 'longitude': -74.0})
+            raise RuntimeError("ingestion failed")
+    session.commit()
+
+    assert [station.code for station in repo.get_all()] == ['TEST000']
+    session.close()
+    engine.dispose()
@@ -0,0 +1,29 @@
+from datetime import datetime
+from app.repositories.data_version import DataVersionRepository
+from app.repositories.station import StationRepository
+from app.repositories.temperature import TemperatureRepository
+
+def test_bump(db_session):
+    """Test that counters start at zero and increase on each bump."""
+    repo = DataVersionRepository(db_session)
+    assert repo.get() == 0
+    repo.bump()
+    repo.bump()
+    assert repo.get() == 2
+    assert repo.get('other') == 0
+
+def test_writes_bump_data_version(db_session):
+    """Test that station and temperature writes bump the data version."""
+    versions = DataVersionRepository(db_session)
+    station = StationRepository(db_session).create({
+        'name': 'Test Station',
+        'code': 'TEST001',
+        'latitude': -34.6,
+        'longitude': -58.4
+    })
+    assert versions.get() == 1
+
+    TemperatureRepository(db_session).bulk_upsert_temperatures([
+        {'station_id': station.id, 'temperature': 20.0, 'timestamp': datetime(2024, 1, 1)}
+    ])
+    assert versions.get() == 2
@@ -0,0 +1,127 @@
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import PropertyMock, patch
+from app.repositories.rollup import RollupRepository, daily_rollups, monthly_hourly_rollups
+from app.repositories.station import StationRepository
+from app.repositories.temperature import TemperatureRepository
+
+@pytest.fixture
+def station(db_session):
+    """Create a test station."""
+    repo = StationRepository(db_session)
+    return repo.create({
+        'name': 'Test Station',
+        'code': 'TEST001',
+        'latitude': -34.6,
+        'longitude': -58.4
+    })
+
+def hourly(station_id, start, hours, temperature):
+    """Build hourly readings with a fixed temperature."""
+    return [
+        {'station_id': station_id, 'temperature': temperature(offset), 'timestamp': start + timedelta(hours=offset)}
+        for offset in range(hours)
+    ]
+
+def test_ingestion_refreshes_daily_rollups(db_session, station):
+    """Test that ingested readings are summarized per station and day."""
+    temp_repo = TemperatureRepository(db_session)
+    temp_repo.bulk_create_temperatures(hourly(station.id, datetime(2024, 1, 1), 30, lambda hour: float(hour % 24)))
+
+    rows = RollupRepository(db_session).get_daily(
+        [station.id], date(2024, 1, 1), date(2024, 1, 31)
+    )
+    assert [(row.day, row.reading_count) for row in rows] == [(date(2024, 1, 1), 24), (date(2024, 1, 2), 6)]
+    first = rows[0]
+    assert first.temperature_sum == sum(range(24))
+    assert first.temperature_min == 0.0
+    assert first.temperature_max == 23.0
+    assert first.temperature_sum_squares == sum(hour * hour for hour in range(24))
+
+def test_upsert_recomputes_touched_days(db_session, station):
+    """Test that updated readings replace their previous contribution to the rollups."""
+    temp_repo = TemperatureRepository(db_session)
+    temp_repo.bulk_upsert_temperatures(hourly(station.id, datetime(2024, 1, 31), 48, lambda hour: 10.0))
+    temp_repo.bulk_upsert_temperatures(hourly(station.id, datetime(2024, 2, 1), 24, lambda hour: 20.0))
+
+    months = db_session.execute(
+        monthly_hourly_rollups.select().where(monthly_hourly_rollups.c.hour == 0)
+    ).all()
+    assert [(row.month, row.reading_count, row.temperature_sum) for row in months] == [
+        (date(2024, 1, 1), 1, 10.0),
+        (date(2024, 2, 1), 1, 20.0)
+    ]
+    assert db_session.execute(daily_rollups.select()).all()[-1].temperature_max == 20.0
+
+def test_hourly_stats_from_rollups_match_raw_readings(db_session, station):
+    """Test that combining rollups with partial edge months gives the raw-reading aggregates."""
+    temp_repo = TemperatureRepository(db_session)
+    start = datetime(2023, 12, 20)
+    temp_repo.bulk_create_temperatures(hourly(station.id, start, 24 * 80, lambda hour: (hour * 7) % 31 - 5.0))
+
+    range_start = datetime(2023, 12, 25, 6)
+    range_end = datetime(2024, 3, 5)
+    stats = temp_repo.get_hourly_stats([station.id], range_start, range_end)
+
+    readings = temp_repo.get_by_station_and_date_range(station.id, range_start, range_end)
+    for hour in range(24):
+        values = [reading.temperature for reading in readings if reading.timestamp.hour == hour]
+        assert stats[station.id][hour]['count'] == len(values)
+        assert stats[station.id][hour]['avg'] == pytest.approx(sum(values) / len(values))
+        assert stats[station.id][hour]['min'] == min(values)
+        assert stats[station.id][hour]['max'] == max(values)
+
+def test_monthly_hourly_stats_from_rollups_match_raw_readings(db_session, station):
+    """Test per (month, hour) sums across rollups and partial edge months."""
+    temp_repo = TemperatureRepository(db_session)
+    temp_repo.bulk_create_temperatures(hourly(station.id, datetime(2023, 12, 20), 24 * 80, lambda hour: float(hour % 13)))
+
+    range_start = datetime(2023, 12, 25, 6)
+    range_end = datetime(2024, 3, 5)
+    stats = temp_repo.get_monthly_hourly_stats([station.id], range_start, range_end)
+
+    readings = temp_repo.get_by_station_and_date_range(station.id, range_start, range_end)
+    for (month, hour), month_stats in stats[station.id].items():
+        values = [r.temperature for r in readings if r.timestamp.month == month and r.timestamp.hour == hour]
+        assert month_stats['count'] == len(values)
+        assert month_stats['sum'] == pytest.approx(sum(values))
+        assert month_stats['sum_squares'] == pytest.approx(sum(v * v for v in values))
+    assert {month for month, _ in stats[station.id]} == {12, 1, 2, 3}
+
+
+def test_single_reading_writes_refresh_rollups(db_session, station):
+    """Test that create, update and delete keep the rollups in step with the readings."""
+    temp_repo = TemperatureRepository(db_session)
+    readings = [
+        temp_repo.create({'station_id': station.id, 'temperature': 10.0, 'timestamp': datetime(2024, 1, day, 12)})
+        for day in range(1, 32)
+    ]
+    january = (datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+    stats = temp_repo.get_hourly_stats([station.id], *january)
+    assert stats[station.id][12]['count'] == 31
+
+    temp_repo.update(readings[0].id, {'temperature': 100.0})
+    assert temp_repo.get_hourly_stats([station.id], *january)[station.id][12]['max'] == 100.0
+
+    # Moving a reading to another day refreshes both days
+    temp_repo.update(readings[1].id, {'timestamp': datetime(2024, 2, 10, 12)})
+    assert temp_repo.get_hourly_stats([station.id], *january)[station.id][12]['count'] == 30
+    rows = RollupRepository(db_session).get_daily([station.id], date(2024, 2, 1), date(2024, 2, 29))
+    assert [(row.day, row.reading_count) for row in rows] == [(date(2024, 2, 10), 1)]
+
+    temp_repo.delete(readings[0].id)
+    stats = temp_repo.get_hourly_stats([station.id], *january)
+    assert stats[station.id][12]['count'] == 29
+    assert stats[station.id][12]['max'] == 10.0
+
+def test_hourly_stats_without_rollups_use_raw_readings(db_session, station):
+    """Test that databases without rollup support aggregate the raw readings instead."""
+    temp_repo = TemperatureRepository(db_session)
+    with patch.object(RollupRepository, 'enabled', new_callable=PropertyMock, return_value=False):
+        temp_repo.bulk_create_temperatures(hourly(station.id, datetime(2024, 1, 1), 24 * 60, lambda hour: 5.0))
+        stats = temp_repo.get_hourly_stats([station.id], datetime(2024, 1, 1), datetime(2024, 3, 1))
+
+    assert db_session.execute(daily_rollups.select()).all() == []
+    assert stats[station.id][0]['count'] == 60
+    assert stats[station.id][0]['avg'] == 5.0
@@ -2,6 +2,7 @@ import pytest
 from datetime import datetime
 from app.repositories.station import StationRepository
 
+
 def test_get_by_code(db_session):
     """Test getting a station by code."""
     repo = StationRepository(db_session)
@@ -16,6 +17,7 @@ def test_get_by_code(db_session):
     assert station is not None
     assert station.name == 'Test Station'
 
+
 def test_get_by_name(db_session):
     """Test getting a station by name."""
     repo = StationRepository(db_session)
@@ -30,6 +32,7 @@ def test_get_by_name(db_session):
     assert station is not None
     assert station.code == 'TEST001'
 
+
 def test_get_by_location(db_session):
     """Test getting stations by location."""
     repo = StationRepository(db_session)
@@ -60,6 +63,7 @@ def test_get_by_location(db_session):
     assert len(stations) == 2
     assert {s.code for s in stations} == {'ST001', 'ST002'}
 
+
 def test_upsert_by_code(db_session):
     """Test upserting a station by code."""
     repo = StationRepository(db_session)
@@ -83,4 +87,29 @@ def test_upsert_by_code(db_session):
     }
     updated = repo.upsert_by_code(updated_data)
     assert updated.name == 'Updated Station'
-    assert updated.id == station.id 
\ No newline at end of file
+    assert updated.id == station.id
+
+
+def test_bulk_upsert_by_code(db_session):
+    """Test inserting and updating many stations at once."""
+    repo = StationRepository(db_session)
+    existing = repo.create({
+        'name': 'Old Name',
+        'code': 'TEST001',
+        'latitude': 40.7128,
+        'longitude': -74.0060
+    })
+
+    ids = repo.bulk_upsert_by_code([
+        {'name': 'New Name', 'code': 'TEST001', 'latitude': 40.7, 'longitude': -74.0},
+        {'name': 'Second Station', 'code': 'TEST002', 'latitude': 34.0, 'longitude': -118.2},
+        {'name': 'Second Station (renamed)', 'code': 'TEST002', 'latitude': 34.0, 'longitude': -118.2}
+    ])
+
+    assert ids['TEST001'] == existing.id
+    assert set(ids) == {'TEST001', 'TEST002'}
+    db_session.expire_all()
+    assert repo.get(existing.id).name == 'New Name'
+    assert repo.get(ids['TEST002']).name == 'Second Station (renamed)'
+    assert len(repo.get_all()) == 2
+    assert repo.bulk_upsert_by_code([]) == {}
@@ -1,8 +1,13 @@
 import pytest
 from datetime import datetime, timedelta
+import numpy as np
+from unittest.mock import MagicMock, patch
+from sqlalchemy import inspect
+from app.db.init_db import init_db
 from app.repositories.station import StationRepository
 from app.repositories.temperature import TemperatureRepository
 
+
 @pytest.fixture
 def station(db_session):
     """Create a test station."""
@@ -15,6 +20,7 @@ def station(db_session):
     }
     return repo.create(station_data)
 
+
 def test_get_by_station(db_session, station):
     """Test getting temperatures by station."""
     temp_repo = TemperatureRepository(db_session)
@@ -35,6 +41,7 @@ def test_get_by_station(db_session, station):
     assert len(temps) == 2
     assert {t.temperature for t in temps} == {20.5, 21.0}
 
+
 def test_get_by_station_and_date_range(db_session, station):
     """Test getting temperatures by station and date range."""
     temp_repo = TemperatureRepository(db_session)
@@ -67,6 +74,7 @@ def test_get_by_station_and_date_range(db_session, station):
     assert len(temps) == 2
     assert {t.temperature for t in temps} == {20.5, 21.0}
 
+
 def test_get_latest_by_station(db_session, station):
     """Test getting the latest temperature for a station."""
     temp_repo = TemperatureRepository(db_session)
@@ -88,6 +96,7 @@ def test_get_latest_by_station(db_session, station):
     assert latest is not None
     assert latest.temperature == 21.0
 
+
 def test_bulk_create_temperatures(db_session, station):
     """Test bulk creating temperature readings."""
     temp_repo = TemperatureRepository(db_session)
@@ -106,4 +115,268 @@ def test_bulk_create_temperatures(db_session, station):
     ]
     temps = temp_repo.bulk_create_temperatures(temps_data)
     assert len(temps) == 2
-    assert {t.temperature for t in temps} == {20.5, 21.0} 
\ No newline at end of file
+    assert {t.temperature for t in temps} == {20.5, 21.0}
+
+
+def test_get_daily_coverage(db_session, station):
+    """Test counting stored readings per day."""
+    temp_repo = TemperatureRepository(db_session)
+    day = datetime(2024, 1, 1)
+    temps_data = [
+        {
+            'station_id': station.id,
+            'temperature': 20.0,
+            'timestamp': day + timedelta(hours=hour)
+        }
+        for hour in range(30)
+    ]
+    temp_repo.bulk_create_temperatures(temps_data)
+
+    coverage = temp_repo.get_daily_coverage(station.id, day, day + timedelta(days=3))
+    assert coverage == {day.date(): 24, (day + timedelta(days=1)).date(): 6}
+
+
+def test_init_db_creates_station_timestamp_index():
+    """Test that databases built from the metadata carry the unique key upserts rely on."""
+    session = init_db('sqlite:///:memory:')
+    indexes = inspect(session.get_bind()).get_indexes('temperatures')
+    session.close()
+    assert {
+        'name': 'ix_temperatures_station_id_timestamp',
+        'column_names': ['station_id', 'timestamp'],
+        'unique': 1
+    } in [{key: index[key] for key in ('name', 'column_names', 'unique')} for index in indexes]
+
+
+def test_bulk_upsert_temperatures(db_session, station):
+    """Test idempotent bulk upserts of temperature readings."""
+    temp_repo = TemperatureRepository(db_session)
+    day = datetime(2024, 1, 1)
+    temps_data = [
+        {
+            'station_id': station.id,
+            'temperature': 20.0,
+            'timestamp': day + timedelta(hours=hour)
+        }
+        for hour in range(10)
+    ]
+
+    counts = temp_repo.bulk_upsert_temperatures(temps_data, batch_size=3)
+    assert counts == {'inserted': 10, 'updated': 0}
+
+    # Re-ingesting overlapping readings updates instead of duplicating
+    temps_data = [
+        {
+            'station_id': station.id,
+            'temperature': 25.0,
+            'temperature_max': 30.0,
+            'timestamp': day + timedelta(hours=hour)
+        }
+        for hour in range(5, 15)
+    ]
+    counts = temp_repo.bulk_upsert_temperatures(iter(temps_data), batch_size=4)
+    assert counts == {'inserted': 5, 'updated': 5}
+
+    temps = temp_repo.get_by_station(station.id)
+    assert len(temps) == 15
+    assert sorted(t.temperature for t in temps) == [20.0] * 5 + [25.0] * 10
+
+
+def test_bulk_upsert_temperatures_duplicates_in_batch(db_session, station):
+    """Test that duplicate keys within a batch keep the last reading."""
+    temp_repo = TemperatureRepository(db_session)
+    now = datetime(2024, 1, 1)
+    counts = temp_repo.bulk_upsert_temperatures([
+        {'station_id': station.id, 'temperature': 20.0, 'timestamp': now},
+        {'station_id': station.id, 'temperature': 21.0, 'timestamp': now}
+    ])
+    assert counts == {'inserted': 1, 'updated': 0}
+    assert temp_repo.get_latest_by_station(station.id).temperature == 21.0
+
+
+def test_copy_upsert_temperatures_sqlite_fallback(db_session, station):
+    """Test that COPY ingestion falls back to batched upserts on SQLite."""
+    temp_repo = TemperatureRepository(db_session)
+    now = datetime(2024, 1, 1)
+    temps_data = (
+        {'station_id': station.id, 'temperature': 20.0, 'timestamp': now + timedelta(hours=hour)}
+        for hour in range(5)
+    )
+    counts = temp_repo.copy_upsert_temperatures(temps_data)
+    assert counts == {'inserted': 5, 'updated': 0}
+    assert len(temp_repo.get_by_station(station.id)) == 5
+
+
+def test_copy_upsert_temperatures_postgresql():
+    """Test the COPY-then-merge flow issued on PostgreSQL."""
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = 'postgresql'
+    connection = session.connection.return_value
+    cursor = connection.connection.dbapi_connection.cursor.return_value
+    connection.execute.return_value.one.return_value = (3, 1)
+
+    temp_repo = TemperatureRepository(session)
+    now = datetime(2024, 1, 1, 5, 30)
+    counts = temp_repo.copy_upsert_temperatures(
+        [{'station_id': 1, 'temperature': 20.5, 'timestamp': now}] * 4, batch_size=3
+    )
+
+    assert counts == {'inserted': 3, 'updated': 1}
+    assert cursor.copy_expert.call_count == 2
+    copied = cursor.copy_expert.call_args_list[0].args[1].getvalue()
+    assert copied.splitlines() == ['1,20.5,2024-01-01 05:30:00'] * 3
+    merge_sql = str(connection.execute.call_args_list[-1].args[0])
+    assert 'ON CONFLICT (station_id, timestamp) DO UPDATE' in merge_sql
+    assert 'INSERT INTO temperatures (station_id, temperature, timestamp, created_at, updated_at)' in merge_sql
+    assert 'SET temperature = EXCLUDED.temperature, updated_at = EXCLUDED.updated_at' in merge_sql
+    session.commit.assert_called_once()
+
+
+def test_copy_upsert_temperatures_on_postgresql(pg_session):
+    """Test the COPY-then-merge flow against a real PostgreSQL database."""
+    station = StationRepository(pg_session).create({
+        'name': 'Test Station',
+        'code': 'TEST001',
+        'latitude': -34.6,
+        'longitude': -58.4
+    })
+    temp_repo = TemperatureRepository(pg_session)
+    start = datetime(2024, 1, 1)
+    readings = [
+        {'station_id': station.id, 'temperature': float(hour), 'timestamp': start + timedelta(hours=hour)}
+        for hour in range(24)
+    ]
+
+    with temp_repo.unit_of_work():
+        # The second call reuses the staging table of the first one
+        first = temp_repo.copy_upsert_temperatures(readings[:12] + [dict(readings[0], temperature=-1.0)], batch_size=5)
+        second = temp_repo.copy_upsert_temperatures(
+            [dict(reading, temperature=reading['temperature'] + 100) for reading in readings[6:]]
+        )
+
+    assert first == {'inserted': 12, 'updated': 0}
+    assert second == {'inserted': 12, 'updated': 6}
+    stored = {t.timestamp.hour: t.temperature for t in temp_repo.get_by_station(station.id)}
+    assert stored[0] == -1.0
+    assert stored[5] == 5.0
+    assert stored[6] == 106.0
+    assert len(stored) == 24
+    stats = temp_repo.get_hourly_stats([station.id], start, start + timedelta(days=1))
+    assert stats[station.id][6]['max'] == 106.0
+
+
+def test_get_hourly_stats(db_session, station):
+    """Test per-hour-of-day aggregation for several stations."""
+    other = StationRepository(db_session).create({
+        'name': 'Other Station',
+        'code': 'TEST002',
+        'latitude': -37.2,
+        'longitude': -59.2
+    })
+    temp_repo = TemperatureRepository(db_session)
+    day = datetime(2024, 1, 1)
+    temps_data = []
+    for offset in range(3):
+        for hour in range(24):
+            timestamp = day + timedelta(days=offset, hours=hour)
+            temps_data.append({'station_id': station.id, 'temperature': 10.0 + offset, 'timestamp': timestamp})
+            if hour < 12:
+                temps_data.append({'station_id': other.id, 'temperature': 20.0, 'timestamp': timestamp})
+    temp_repo.bulk_create_temperatures(temps_data)
+
+    stats = temp_repo.get_hourly_stats([station.id, other.id], day, day + timedelta(days=2, hours=23))
+
+    assert len(stats[station.id]) == 24
+    assert stats[station.id][5] == {'avg': 11.0, 'count': 3, 'min': 10.0, 'max': 12.0}
+    assert len(stats[other.id]) == 12
+    assert stats[other.id][0]['avg'] == 20.0
+    assert 12 not in stats[other.id]
+
+
+def test_get_arrays_by_station_and_date_range(db_session, station):
+    """Test columnar fetches of timestamps and temperatures."""
+    temp_repo = TemperatureRepository(db_session)
+    now = datetime(2024, 1, 1)
+    temp_repo.bulk_create_temperatures([
+        {'station_id': station.id, 'temperature': 20.0 + hour, 'timestamp': now + timedelta(hours=hour)}
+        for hour in reversed(range(5))
+    ])
+
+    timestamps, temperatures = temp_repo.get_arrays_by_station_and_date_range(
+        station.id, now + timedelta(hours=1), now + timedelta(hours=3)
+    )
+    assert timestamps.dtype == np.dtype('datetime64[us]')
+    assert temperatures.dtype == np.float32
+    assert timestamps.tolist() == [now + timedelta(hours=hour) for hour in (1, 2, 3)]
+    assert temperatures.tolist() == [21.0, 22.0, 23.0]
+
+    frame = temp_repo.get_frame_by_station_and_date_range(station.id, now, now + timedelta(days=1))
+    assert list(frame.columns) == ['timestamp', 'temperature']
+    assert len(frame) == 5
+
+    timestamps, temperatures = temp_repo.get_arrays_by_station(station.id + 1)
+    assert len(timestamps) == len(temperatures) == 0
+
+
+def test_get_arrays_streams_rows(db_session, station):
+    """Test that columnar fetches stream rows instead of buffering the whole result."""
+    temp_repo = TemperatureRepository(db_session)
+    temp_repo.bulk_create_temperatures([
+        {'station_id': station.id, 'temperature': float(hour), 'timestamp': datetime(2024, 1, 1) + timedelta(hours=hour)}
+        for hour in range(5)
+    ])
+
+    with patch.object(db_session, 'execute', wraps=db_session.execute) as execute:
+        timestamps, temperatures = temp_repo._fetch_arrays(np.float32, chunk_size=2)
+    assert execute.call_args.args[0].get_execution_options()['stream_results'] is True
+    assert temperatures.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_iter_by_station(db_session, station):
+    """Test streaming a station's readings in time-ordered batches."""
+    temp_repo = TemperatureRepository(db_session)
+    now = datetime(2024, 1, 1)
+    temp_repo.bulk_create_temperatures([
+        {'station_id': station.id, 'temperature': 20.0, 'timestamp': now + timedelta(hours=hour)}
+        for hour in reversed(range(7))
+    ])
+
+    batches = list(temp_repo.iter_by_station(station.id, chunk_size=3))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [t.timestamp for batch in batches for t in batch] == [now + timedelta(hours=hour) for hour in range(7)]
+
+    batches = list(temp_repo.iter_by_station_and_date_range(
+        station.id, now + timedelta(hours=2), now + timedelta(hours=4), chunk_size=10
+    ))
+    assert [len(batch) for batch in batches] == [3]
+
+
+def test_get_page_by_station_and_timestamp(db_session, station):
+    """Test keyset pagination on (station_id, timestamp) across stations."""
+    other = StationRepository(db_session).create({
+        'name': 'Other Station',
+        'code': 'TEST002',
+        'latitude': -37.2,
+        'longitude': -59.2
+    })
+    temp_repo = TemperatureRepository(db_session)
+    now = datetime(2024, 1, 1)
+    temp_repo.bulk_create_temperatures([
+        {'station_id': station_id, 'temperature': 20.0, 'timestamp': now + timedelta(hours=hour)}
+        for station_id in (other.id, station.id)
+        for hour in range(3)
+    ])
+
+    keys = []
+    after = None
+    while True:
+        page = temp_repo.get_page_by_station_and_timestamp(limit=4, after=after)
+        if not page:
+            break
+        keys.extend((t.station_id, t.timestamp) for t in page)
+        after = keys[-1]
+    assert keys == sorted(keys)
+    assert len(keys) == 6
+
+    page = temp_repo.get_page_by_station_and_timestamp(limit=10, after=(station.id, now), station_id=station.id)
+    assert [t.timestamp for t in page] == [now + timedelta(hours=1), now + timedelta(hours=2)]
@@ -0,0 +1,78 @@
+import numpy as np
+from datetime import datetime
+
+from app.services.comparison import (
+    hourly_means_matrix, pairwise_differences, season_of_month, seasonal_hourly_medians, seasonal_hourly_stats,
+    to_json_list
+)
+
+def test_hourly_means_matrix():
+    """Test that hourly averages are laid out by station and hour."""
+    stats = {
+        1: {hour: {'avg': 20.0 + hour} for hour in range(24)},
+        2: {0: {'avg': 15.0}, 12: {'avg': 25.0}}
+    }
+    means = hourly_means_matrix(stats, [2, 1])
+
+    assert means.shape == (2, 24)
+    assert means[0, 0] == 15.0
+    assert means[0, 12] == 25.0
+    assert np.isnan(means[0, 1])
+    assert means[1, 23] == 43.0
+
+def test_pairwise_differences():
+    """Test mean differences over the hours both stations have readings for."""
+    means = np.full((3, 24), np.nan)
+    means[0, :] = 20.0
+    means[1, :12] = 15.0
+    means[1, 12:] = 17.0
+
+    differences = pairwise_differences(means)
+
+    assert differences[0, 1] == 4.0
+    assert differences[1, 0] == -4.0
+    assert differences[0, 0] == 0.0
+    assert np.isnan(differences[0, 2])
+    assert to_json_list(differences)[2] == [None, None, None]
+
+def test_season_of_month_is_hemisphere_aware():
+    """Test that seasons are swapped between hemispheres."""
+    assert season_of_month(1, -34.6) == 'Summer'
+    assert season_of_month(1, 40.7) == 'Winter'
+    assert season_of_month(4, -34.6) == 'Autumn'
+    assert season_of_month(4, 40.7) == 'Spring'
+
+def test_seasonal_hourly_stats_match_raw_readings():
+    """Test that merged monthly sums give the same mean and std as the raw values."""
+    values = {1: [10.0, 12.0], 2: [14.0], 7: [2.0, 4.0]}
+    monthly = {
+        (month, 6): {
+            'sum': sum(temps), 'count': len(temps), 'min': min(temps), 'max': max(temps),
+            'sum_squares': sum(t * t for t in temps)
+        }
+        for month, temps in values.items()
+    }
+    seasons = seasonal_hourly_stats(monthly, -34.6)
+
+    summer = seasons['Summer'][6]
+    assert summer['mean'] == 12.0
+    assert summer['std'] == np.std([10.0, 12.0, 14.0], ddof=1)
+    assert (summer['min'], summer['max'], summer['count']) == (10.0, 14.0, 3)
+    assert seasons['Winter'][6]['mean'] == 3.0
+    assert seasons['Spring'] == {}
+
+def test_seasonal_hourly_medians():
+    """Test medians per season and hour from raw readings."""
+    readings = [
+        (datetime(2024, 1, 1, 6), 10.0),
+        (datetime(2024, 1, 2, 6), 30.0),
+        (datetime(2024, 2, 1, 6), 11.0),
+        (datetime(2024, 7, 1, 6), 2.0),
+        (datetime(2024, 7, 1, 7), 3.0)
+    ]
+    timestamps = np.array([timestamp for timestamp, _ in readings], dtype='datetime64[us]')
+    temperatures = np.array([temperature for _, temperature in readings])
+    medians = seasonal_hourly_medians(timestamps, temperatures, 40.7)
+
+    assert medians['Winter'] == {6: 11.0}
+    assert medians['Summer'] == {6: 2.0, 7: 3.0}
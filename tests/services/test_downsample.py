@@ -0,0 +1,41 @@
+import numpy as np
+from collections import namedtuple
+from datetime import date, datetime
+
+from app.services.downsample import aggregate_daily, choose_bucket, lttb
+
+DailyRollup = namedtuple('DailyRollup', 'day temperature_sum reading_count temperature_min temperature_max')
+
+def test_choose_bucket():
+    """Test that the finest bucket within the point budget is chosen."""
+    start = datetime(2015, 1, 1)
+    assert choose_bucket(start, datetime(2015, 1, 10), 1000) == 'hour'
+    assert choose_bucket(start, datetime(2016, 1, 1), 1000) == 'day'
+    assert choose_bucket(start, datetime(2025, 1, 1), 1000) == 'week'
+    assert choose_bucket(start, datetime(2025, 1, 1), 200) == 'month'
+
+def test_aggregate_daily_by_week():
+    """Test that daily rollups are merged into Monday-based weeks."""
+    rows = [
+        DailyRollup(date(2024, 1, 7), 24.0, 24, 0.0, 2.0),   # Sunday
+        DailyRollup(date(2024, 1, 8), 48.0, 24, 1.0, 3.0),   # Monday
+        DailyRollup(date(2024, 1, 9), 96.0, 24, -1.0, 5.0)
+    ]
+    points = aggregate_daily(rows, 'week')
+
+    assert [point['timestamp'] for point in points] == [datetime(2024, 1, 1), datetime(2024, 1, 8)]
+    assert points[1] == {'timestamp': datetime(2024, 1, 8), 'avg': 3.0, 'min': -1.0, 'max': 5.0, 'count': 48}
+
+def test_lttb_keeps_extremes_and_bounds():
+    """Test that LTTB keeps the end points and the peaks of a series."""
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50.0)
+    y[500] = 10.0
+
+    indices = lttb(x, y, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert 500 in indices
+    assert np.all(np.diff(indices) > 0)
+    assert len(lttb(x[:10], y[:10], 50)) == 10
@@ -0,0 +1,175 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from app.repositories.station import StationRepository
+from app.repositories.temperature import TemperatureRepository
+from app.services.sync import IncrementalSync
+
+
+def hourly_readings(provider_id, start_date, end_date):
+    """Generate one reading per hour between two dates."""
+    readings = []
+    timestamp = start_date
+    while timestamp <= end_date:
+        readings.append({'timestamp': timestamp, 'temperature': 20.0, 'station_id': provider_id})
+        timestamp += timedelta(hours=1)
+    return readings
+
+
+@pytest.fixture
+def station(db_session):
+    """Create a test station."""
+    repo = StationRepository(db_session)
+    return repo.create({
+        'name': 'Test Station',
+        'code': 'TEST001',
+        'latitude': -34.6,
+        'longitude': -58.4
+    })
+
+
+@pytest.fixture
+def service():
+    """Create a fake single-station weather service."""
+    service = MagicMock(spec=['iter_temperature_data'])
+    service.iter_temperature_data.side_effect = (
+        lambda provider_id, start, end, interval: iter(hourly_readings(provider_id, start, end))
+    )
+    return service
+
+
+def test_sync_fetches_only_missing_days(db_session, station, service):
+    """Test that days already stored are not fetched again."""
+    temp_repo = TemperatureRepository(db_session)
+    day1 = datetime(2024, 1, 1)
+    temp_repo.bulk_create_temperatures([
+        {'station_id': station.id, 'temperature': r['temperature'], 'timestamp': r['timestamp']}
+        for r in hourly_readings('AERO', day1, day1 + timedelta(hours=23))
+    ])
+
+    sync = IncrementalSync(service, temp_repo)
+    stored = sync.sync_station(station.id, 'AERO', day1, datetime(2024, 1, 3, 23))
+
+    assert stored == 48
+    service.iter_temperature_data.assert_called_once()
+    assert service.iter_temperature_data.call_args.args[1] == datetime(2024, 1, 2)
+
+    # Everything is stored now, so a second run fetches nothing
+    service.iter_temperature_data.reset_mock()
+    assert sync.sync_station(station.id, 'AERO', day1, datetime(2024, 1, 3, 23)) == 0
+    service.iter_temperature_data.assert_not_called()
+
+
+def test_sync_fills_partial_days_without_duplicates(db_session, station, service):
+    """Test that incomplete days are re-fetched and only new hours stored."""
+    temp_repo = TemperatureRepository(db_session)
+    day1 = datetime(2024, 1, 1)
+    temp_repo.bulk_create_temperatures([
+        {'station_id': station.id, 'temperature': 20.0, 'timestamp': day1 + timedelta(hours=hour)}
+        for hour in range(10)
+    ])
+
+    sync = IncrementalSync(service, temp_repo)
+    assert sync.missing_days(station.id, day1, datetime(2024, 1, 1, 23)) == [day1.date()]
+    assert sync.sync_station(station.id, 'AERO', day1, datetime(2024, 1, 1, 23)) == 14
+    assert len(temp_repo.get_by_station(station.id)) == 24
+
+
+def test_sync_resumes_from_latest_reading(db_session, station, service):
+    """Test that a sync without start date resumes from the latest stored day."""
+    temp_repo = TemperatureRepository(db_session)
+    temp_repo.bulk_create_temperatures([
+        {'station_id': station.id, 'temperature': 20.0, 'timestamp': datetime(2024, 1, 5, 12)}
+    ])
+
+    sync = IncrementalSync(service, temp_repo)
+    sync.sync_station(station.id, 'AERO', None, datetime(2024, 1, 6, 23))
+
+    assert service.iter_temperature_data.call_args.args[1] == datetime(2024, 1, 5)
+
+
+def test_sync_without_readings_requires_start(db_session, station, service):
+    """Test that a station without readings needs an explicit start date."""
+    sync = IncrementalSync(service, TemperatureRepository(db_session))
+    with pytest.raises(ValueError, match="a start date is required"):
+        sync.sync_station(station.id, 'AERO', None, datetime(2024, 1, 6))
+
+
+def test_sync_uses_multi_station_fetch(db_session, station):
+    """Test that services able to fetch many stations at once are called once per run."""
+    other = StationRepository(db_session).create({
+        'name': 'Other Station',
+        'code': 'TEST002',
+        'latitude': -37.2,
+        'longitude': -59.2
+    })
+    service = MagicMock(spec=['iter_temperature_data', 'iter_temperature_data_many'])
+    service.iter_temperature_data_many.side_effect = lambda ids, start, end, interval: iter([
+        reading for provider_id in ids for reading in hourly_readings(provider_id, start, end)
+    ])
+
+    sync = IncrementalSync(service, TemperatureRepository(db_session), batch_size=10)
+    stored = sync.sync_stations({station.id: 'AERO', other.id: 'TANDIL'}, datetime(2024, 1, 1), datetime(2024, 1, 2, 23))
+
+    assert stored == 96
+    service.iter_temperature_data_many.assert_called_once()
+    service.iter_temperature_data.assert_not_called()
+
+
+def test_sync_stations_sharing_a_provider_station(db_session, station, service):
+    """Test that database stations mapped to the same provider station all get its readings."""
+    other = StationRepository(db_session).create({
+        'name': 'Other Station',
+        'code': 'TEST002',
+        'latitude': -34.6,
+        'longitude': -58.4
+    })
+    temp_repo = TemperatureRepository(db_session)
+    sync = IncrementalSync(service, temp_repo)
+    stored = sync.sync_stations({station.id: 'AERO', other.id: 'AERO'}, datetime(2024, 1, 1), datetime(2024, 1, 1, 23))
+
+    assert stored == 48
+    assert len(temp_repo.get_by_station(station.id)) == 24
+    assert len(temp_repo.get_by_station(other.id)) == 24
+    service.iter_temperature_data.assert_called_once()
+
+
+def test_sync_updates_stale_days(db_session, station, service):
+    """Test that re-fetched stale days overwrite stored readings instead of duplicating them."""
+    temp_repo = TemperatureRepository(db_session)
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    temp_repo.bulk_create_temperatures([
+        {'station_id': station.id, 'temperature': 10.0, 'timestamp': today + timedelta(hours=hour)}
+        for hour in range(24)
+    ])
+
+    sync = IncrementalSync(service, temp_repo)
+    assert sync.sync_station(station.id, 'AERO', today, today + timedelta(hours=23)) == 0
+
+    readings = temp_repo.get_by_station(station.id)
+    assert len(readings) == 24
+    assert {reading.temperature for reading in readings} == {20.0}
+
+
+def test_stale_days_follow_the_provider_time_zone(db_session, station):
+    """Test that the stale window is measured from today in the service's time zone."""
+    temp_repo = TemperatureRepository(db_session)
+    # UTC+14 and UTC-12 are always on different dates
+    ahead, behind = timezone(timedelta(hours=14)), timezone(timedelta(hours=-12))
+    day = datetime.combine(datetime.now(ahead).date(), datetime.min.time())
+    temp_repo.bulk_create_temperatures([
+        {'station_id': station.id, 'temperature': 10.0, 'timestamp': day + timedelta(hours=hour)}
+        for hour in range(24)
+    ])
+
+    def missing_days(provider_timezone):
+        service = MagicMock(spec=['iter_temperature_data', 'TIMEZONE'])
+        service.TIMEZONE = provider_timezone
+        sync = IncrementalSync(service, temp_repo, stale_days=0)
+        return sync.missing_days(station.id, day, day + timedelta(hours=23))
+
+    # The complete day is today for the provider, and only days after it are stale
+    assert missing_days(ahead) == []
+    # For a provider whose today is earlier, the same day is still stale
+    assert missing_days(behind) == [day.date()]
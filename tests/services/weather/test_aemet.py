@@ -1,5 +1,5 @@
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
 from app.services.weather.aemet import AEMETService
@@ -132,4 +132,61 @@ def test_get_station_metadata_not_found(mock_request):
     ]
     
     with pytest.raises(ValueError, match="Station 1234 not found"):
-        service.get_station_metadata("1234") 
\ No newline at end of file
+        service.get_station_metadata("1234")
+
+
+def test_split_date_range():
+    """Test splitting a long range into API-sized chunks."""
+    service = AEMETService(api_key="test_key", max_days_per_request=180)
+    chunks = service._split_date_range(datetime(2023, 1, 1), datetime(2024, 2, 4))
+
+    assert chunks == [
+        (datetime(2023, 1, 1), datetime(2023, 6, 29)),
+        (datetime(2023, 6, 30), datetime(2023, 12, 26)),
+        (datetime(2023, 12, 27), datetime(2024, 2, 4))
+    ]
+
+@patch('app.services.weather.aemet.AEMETService._make_request')
+def test_get_temperature_data_chunked(mock_request):
+    """Test that long ranges are fetched as ordered, concurrent chunks."""
+    service = AEMETService(api_key="test_key", max_workers=3, max_days_per_request=10)
+
+    def make_request(endpoint, params=None, headers=None):
+        if '/fechaini/' in endpoint:
+            start = endpoint.split('/fechaini/')[1][:10]
+            end = endpoint.split('/fechafin/')[1][:10]
+            return {'datos': f'https://data.url/{start}/{end}'}
+        start, end = [datetime.strptime(d, '%Y-%m-%d') for d in endpoint.split('/')[-2:]]
+        return [
+            {'fecha': (start + timedelta(days=i)).strftime('%Y-%m-%d'), 'tmed': '20.0', 'tmax': '25.0', 'tmin': '15.0'}
+            for i in range((end - start).days + 1)
+        ]
+
+    mock_request.side_effect = make_request
+    data = service.get_temperature_data("1234", datetime(2024, 1, 1), datetime(2024, 1, 25), interval='daily')
+
+    assert mock_request.call_count == 6
+    assert [d['timestamp'] for d in data] == [datetime(2024, 1, 1) + timedelta(days=i) for i in range(25)]
+
+@patch('app.services.weather.aemet.AEMETService._make_request')
+def test_get_temperature_data_chunk_without_data(mock_request):
+    """Test that chunks the API reports as empty are skipped."""
+    service = AEMETService(api_key="test_key")
+    mock_request.return_value = {'estado': 404, 'descripcion': 'No hay datos que satisfagan esos criterios'}
+
+    data = service.get_temperature_data("1234", datetime(2024, 1, 1), datetime(2024, 1, 2), interval='daily')
+    assert data == []
+
+@patch('app.services.weather.aemet.AEMETService._make_request')
+def test_get_temperature_data_api_error(mock_request):
+    """Test that API errors other than "no data" are raised instead of returning no readings."""
+    service = AEMETService(api_key="test_key")
+    mock_request.return_value = {'estado': 401, 'descripcion': 'API key invalido'}
+
+    with pytest.raises(ValueError, match="AEMET API error 401"):
+        service.get_temperature_data("1234", datetime(2024, 1, 1), datetime(2024, 1, 2), interval='daily')
+
+def test_invalid_max_days_per_request():
+    """Test that chunk sizes below one day are rejected."""
+    with pytest.raises(ValueError, match="max_days_per_request"):
+        AEMETService(api_key="test_key", max_days_per_request=0)
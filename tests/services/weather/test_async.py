@@ -0,0 +1,168 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import aiohttp
+import pytest
+
+from app.services.weather.aemet import AEMETService
+from app.services.weather.openweather import OpenWeatherService
+from app.services.weather.smn import SMNService
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves canned SMN, AEMET and OpenWeather responses."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body: bytes, status: int = 200):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.server.requests.append(self.path)
+
+        if url.path == '/smn/descarga_opendata.php':
+            date_str = query['file'][0][-12:-4]
+            day = datetime.strptime(date_str, '%Y%m%d')
+            if day.day == 3:
+                return self._send(b'', status=404)
+            body = (
+                "Fecha    Hora    Temp    Hum    Pres    Viento  Dir     Estacion\n"
+                "ddmmyyyy hh      C       %      hPa     km/h    grados  texto\n"
+                f"{day.strftime('%d%m%Y')}     0  {day.day}.0   71  1021.8  990    4     AEROPARQUE AERO\n"
+                f"{day.strftime('%d%m%Y')}     0  -{day.day}.0   71  1021.8  990    4     BASE MARAMBIO\n"
+            )
+            return self._send(body.encode('utf-8'))
+
+        if url.path.startswith('/aemet/valores/climatologicos/diarios/datos'):
+            start = url.path.split('/fechaini/')[1][:10]
+            end = url.path.split('/fechafin/')[1][:10]
+            port = self.server.server_address[1]
+            return self._send(json.dumps({'datos': f'http://127.0.0.1:{port}/aemet/payload/{start}/{end}'}).encode())
+
+        if url.path.startswith('/aemet/payload/'):
+            start, end = [datetime.strptime(d, '%Y-%m-%d') for d in url.path.split('/')[-2:]]
+            entries = [
+                {'fecha': (start + timedelta(days=i)).strftime('%Y-%m-%d'), 'tmed': '20.0', 'tmax': '25.0', 'tmin': '15.0'}
+                for i in range((end - start).days + 1)
+            ]
+            return self._send(json.dumps(entries).encode())
+
+        if url.path == '/slow-once':
+            # Answer the first request too late for the client's timeout
+            if sum(1 for path in self.server.requests if path.startswith('/slow-once')) == 1:
+                time.sleep(1)
+            return self._send(b'{"ok": true}')
+
+        if url.path == '/owm/weather':
+            return self._send(json.dumps({
+                'id': 1234, 'name': 'Test City', 'sys': {'country': 'AR'}, 'coord': {'lat': -34.6, 'lon': -58.4}
+            }).encode())
+
+        if url.path == '/owm/onecall/timemachine':
+            dt = int(query['dt'][0])
+            return self._send(json.dumps({'hourly': [{'dt': dt + h * 3600, 'temp': float(h)} for h in range(24)]}).encode())
+
+        self._send(b'', status=404)
+
+@pytest.fixture
+def stub_server():
+    """Run a local HTTP server with canned provider responses."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def stub_url(server, prefix):
+    return f"http://127.0.0.1:{server.server_address[1]}/{prefix}"
+
+def test_smn_async_temperature_data(stub_server):
+    """Test concurrent SMN day-file downloads on the async backend."""
+    service = SMNService(max_workers=1)
+    service.base_url = stub_url(stub_server, 'smn')
+
+    async def run():
+        async with service:
+            return await service.get_temperature_data_many_async(
+                ['AEROPARQUE AERO', 'BASE MARAMBIO'], datetime(2025, 4, 1), datetime(2025, 4, 6, 23)
+            )
+
+    data = asyncio.run(run())
+    # The 3rd is missing upstream and is skipped
+    assert [d['timestamp'].day for d in data['AEROPARQUE AERO']] == [1, 2, 4, 5, 6]
+    assert [d['temperature'] for d in data['BASE MARAMBIO']] == [-1.0, -2.0, -4.0, -5.0, -6.0]
+    assert len(stub_server.requests) == 6
+
+def test_aemet_async_temperature_data(stub_server):
+    """Test chunked two-step AEMET fetches on the async backend."""
+    service = AEMETService(api_key="test_key", max_days_per_request=10)
+    service.base_url = stub_url(stub_server, 'aemet')
+
+    async def run():
+        async with service:
+            return await service.get_temperature_data_async(
+                '1234', datetime(2024, 1, 1), datetime(2024, 1, 25), interval='daily'
+            )
+
+    data = asyncio.run(run())
+    assert [d['timestamp'] for d in data] == [datetime(2024, 1, 1) + timedelta(days=i) for i in range(25)]
+    assert len(stub_server.requests) == 6
+
+def test_openweather_async_temperature_data(stub_server):
+    """Test per-day timemachine fan-out on the async backend."""
+    service = OpenWeatherService(api_key="test_key")
+    service.base_url = stub_url(stub_server, 'owm')
+
+    async def run():
+        async with service:
+            metadata = await service.get_station_metadata_async('1234')
+            data = await service.get_temperature_data_async('1234', datetime(2024, 4, 20), datetime(2024, 4, 21, 23))
+            return metadata, data
+
+    metadata, data = asyncio.run(run())
+    assert metadata['latitude'] == -34.6
+    assert len(data) == 48
+    assert [d['timestamp'] for d in data] == sorted(d['timestamp'] for d in data)
+    # One metadata request plus one request per day
+    assert len(stub_server.requests) == 3
+
+def test_async_request_retries_timeouts(stub_server):
+    """Test that timed-out requests are retried on the async backend, like on the sync one."""
+    service = SMNService()
+
+    async def run():
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=0.5)) as session:
+            service.async_session = session
+            return await service._make_request_async(stub_url(stub_server, 'slow-once'))
+
+    assert asyncio.run(run()) == {'ok': True}
+    assert len(stub_server.requests) == 2
+
+def test_smn_async_caches_final_day_files(stub_server, tmp_path):
+    """Test that the async backend serves final day files from the disk cache."""
+    service = SMNService(cache_dir=str(tmp_path))
+    service.base_url = stub_url(stub_server, 'smn')
+
+    async def run():
+        async with service:
+            return await service.get_temperature_data_many_async(
+                ['AEROPARQUE AERO'], datetime(2025, 4, 1), datetime(2025, 4, 2, 23)
+            )
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+    assert first == second
+    assert len(stub_server.requests) == 2
+    assert len(list(tmp_path.rglob('*.gz'))) == 2
@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.weather.catalog import StationCatalog
+from app.services.weather.smn import SMNService
+
+INVENTORY = {
+    '87534': {'id': '87534', 'name': 'LABOULAYE AERO'},
+    '89034': {'id': '89034', 'name': 'BASE BELGRANO II'}
+}
+
+def test_inventory_loaded_once():
+    """Test that many lookups share a single inventory download."""
+    load_inventory = MagicMock(return_value=INVENTORY)
+    catalog = StationCatalog(load_inventory=load_inventory)
+
+    assert catalog.get('87534')['name'] == 'LABOULAYE AERO'
+    assert catalog.get('89034')['name'] == 'BASE BELGRANO II'
+    with pytest.raises(ValueError, match="Station 12345 not found"):
+        catalog.get('12345')
+    assert load_inventory.call_count == 1
+
+def test_inventory_reloaded_after_ttl():
+    """Test that an expired inventory is downloaded again."""
+    load_inventory = MagicMock(return_value=INVENTORY)
+    catalog = StationCatalog(load_inventory=load_inventory, ttl=60)
+
+    with patch('app.services.weather.catalog.time.time', return_value=1000.0):
+        catalog.get('87534')
+    with patch('app.services.weather.catalog.time.time', return_value=1030.0):
+        catalog.get('87534')
+    assert load_inventory.call_count == 1
+
+    with patch('app.services.weather.catalog.time.time', return_value=1061.0):
+        catalog.get('87534')
+    assert load_inventory.call_count == 2
+
+def test_per_station_loading():
+    """Test lazily fetching and caching stations one at a time."""
+    load_station = MagicMock(side_effect=lambda station_id: {'id': station_id})
+    catalog = StationCatalog(load_station=load_station)
+
+    assert catalog.get('1') == {'id': '1'}
+    assert catalog.get('1') == {'id': '1'}
+    assert catalog.get('2') == {'id': '2'}
+    assert load_station.call_count == 2
+
+def test_snapshot_round_trip(tmp_path):
+    """Test that a new catalog is served from the on-disk snapshot."""
+    snapshot_path = str(tmp_path / 'stations.json')
+    StationCatalog(load_inventory=MagicMock(return_value=INVENTORY), snapshot_path=snapshot_path).get('87534')
+
+    load_inventory = MagicMock(return_value={})
+    catalog = StationCatalog(load_inventory=load_inventory, snapshot_path=snapshot_path)
+    assert catalog.get('89034')['name'] == 'BASE BELGRANO II'
+    load_inventory.assert_not_called()
+
+def test_requires_exactly_one_loader():
+    """Test that the catalog needs either an inventory or a station loader."""
+    with pytest.raises(ValueError):
+        StationCatalog()
+    with pytest.raises(ValueError):
+        StationCatalog(load_inventory=dict, load_station=dict)
+
+@patch('app.services.weather.smn.SMNService._download_and_extract_metadata')
+def test_smn_metadata_downloaded_once(mock_download):
+    """Test that SMN resolves many stations from a single archive download."""
+    mock_download.return_value = b"""NOMBRE                          PROVINCIA                        LATITUD LONGITUD ALTURA  INDICATIVO
+texto                          texto                           grados  grados    m       texto
+BASE BELGRANO II               ANTARTIDA                            -77      52       -34      37        256  89034 SAYB
+LABOULAYE AERO                 CORDOBA                              -31      33       -63      22        137  87534 SAYB
+"""
+    service = SMNService()
+
+    assert service.get_station_metadata("89034")['name'] == 'BASE BELGRANO II'
+    assert service.get_station_metadata("87534")['name'] == 'LABOULAYE AERO'
+    assert mock_download.call_count == 1
+
+def test_slow_load_does_not_block_cached_lookups():
+    """Test that a station being fetched does not block lookups of cached ones, nor fetch twice."""
+    started, release = threading.Event(), threading.Event()
+
+    def load_station(station_id):
+        if station_id == 'slow':
+            started.set()
+            release.wait(5)
+        return {'id': station_id}
+
+    load_station = MagicMock(side_effect=load_station)
+    catalog = StationCatalog(load_station=load_station)
+    catalog.get('cached')
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        slow = [executor.submit(catalog.get, 'slow') for _ in range(2)]
+        assert started.wait(5)
+        # Served while the slow request is still in flight
+        assert executor.submit(catalog.get, 'cached').result(1) == {'id': 'cached'}
+        release.set()
+        assert [future.result(5) for future in slow] == [{'id': 'slow'}] * 2
+
+    assert [c.args[0] for c in load_station.call_args_list] == ['cached', 'slow']
@@ -4,10 +4,12 @@ from unittest.mock import patch, MagicMock
 
 from app.services.weather.openweather import OpenWeatherService
 
+
 @pytest.fixture
 def openweather_service():
     return OpenWeatherService(api_key="test_key")
 
+
 @patch('app.services.weather.openweather.OpenWeatherService._make_request')
 def test_get_station_metadata(mock_request):
     """Test station metadata retrieval."""
@@ -32,6 +34,7 @@ def test_get_station_metadata(mock_request):
         'longitude': -58.4
     }
 
+
 @patch('app.services.weather.openweather.OpenWeatherService._make_request')
 def test_get_temperature_data(mock_request):
     """Test temperature data retrieval."""
@@ -77,6 +80,7 @@ def test_get_temperature_data(mock_request):
     assert data[0]['temperature_min'] == 15.0
     assert data[0]['station_id'] == '1234'
 
+
 @patch('app.services.weather.openweather.OpenWeatherService._make_request')
 def test_get_temperature_data_invalid_interval(mock_request):
     """Test temperature data retrieval with invalid interval."""
@@ -87,6 +91,7 @@ def test_get_temperature_data_invalid_interval(mock_request):
     with pytest.raises(ValueError, match="OpenWeather API only supports hourly or daily data"):
         service.get_temperature_data("1234", start_date, end_date, interval='weekly')
 
+
 @patch('app.services.weather.openweather.OpenWeatherService._make_request')
 def test_get_temperature_data_no_data_in_range(mock_request):
     """Test temperature data retrieval when no data is available in the specified range."""
@@ -112,6 +117,9 @@ def test_get_temperature_data_no_data_in_range(mock_request):
                     'temp_min': 15.0
                 }
             ]
+        },
+        {  # Third call: the range spans two days, one request per day
+            'hourly': []
         }
     ]
     
@@ -122,6 +130,7 @@ def test_get_temperature_data_no_data_in_range(mock_request):
     
     assert len(data) == 0
 
+
 @patch('app.services.weather.openweather.OpenWeatherService._make_request')
 def test_get_temperature_data_daily_interval(mock_request):
     """Test temperature data retrieval with daily interval."""
@@ -138,22 +147,42 @@ def test_get_temperature_data_daily_interval(mock_request):
                 'lon': -58.4
             }
         },
-        {  # Second call: get temperature data
-            'daily': [
+        {  # Second call: hourly data of the first day
+            'hourly': [
                 {
                     'dt': 1713571200,  # 2024-04-20 00:00:00 UTC
-                    'temp': {'day': 20.5, 'max': 25.0, 'min': 15.0}
+                    'temp': 18.0,
+                    'temp_max': 25.0,
+                    'temp_min': 15.0
                 },
+                {
+                    'dt': 1713574800,  # 2024-04-20 01:00:00 UTC
+                    'temp': 23.0,
+                    'temp_max': 24.0,
+                    'temp_min': 16.0
+                }
+            ]
+        },
+        {  # Third call: hourly data of the second day
+            'hourly': [
                 {
                     'dt': 1713657600,  # 2024-04-21 00:00:00 UTC
-                    'temp': {'day': 21.0, 'max': 26.0, 'min': 16.0}
+                    'temp': 20.0,
+                    'temp_max': 26.0,
+                    'temp_min': 16.0
+                },
+                {
+                    'dt': 1713661200,  # 2024-04-21 01:00:00 UTC
+                    'temp': 22.0,
+                    'temp_max': 25.0,
+                    'temp_min': 17.0
                 }
             ]
         }
     ]
     
     start_date = datetime(2024, 4, 20)
-    end_date = datetime(2024, 4, 21)
+    end_date = datetime(2024, 4, 21, 23)
     data = service.get_temperature_data("1234", start_date, end_date, interval='daily')
     
     assert len(data) == 2
@@ -161,4 +190,40 @@ def test_get_temperature_data_daily_interval(mock_request):
     assert data[0]['temperature'] == 20.5
     assert data[0]['temperature_max'] == 25.0
     assert data[0]['temperature_min'] == 15.0
-    assert data[0]['station_id'] == '1234' 
\ No newline at end of file
+    assert data[0]['station_id'] == '1234'
+    assert data[1]['timestamp'] == datetime(2024, 4, 21)
+    assert data[1]['temperature'] == 21.0
+    assert data[1]['temperature_max'] == 26.0
+    assert data[1]['temperature_min'] == 16.0
+
+
+@patch('app.services.weather.openweather.OpenWeatherService._make_request')
+def test_get_temperature_data_multi_day(mock_request):
+    """Test that multi-day ranges fan out one timemachine request per day."""
+    service = OpenWeatherService(api_key="test_key", max_workers=3)
+    start_date = datetime(2024, 4, 20)
+    end_date = datetime(2024, 4, 22, 23)
+    day_starts = [int(datetime(2024, 4, day).timestamp()) for day in (20, 21, 22)]
+
+    def make_request(endpoint, params=None, headers=None):
+        if endpoint == 'weather':
+            return {
+                'id': 1234,
+                'name': 'Test City',
+                'sys': {'country': 'AR'},
+                'coord': {'lat': -34.6, 'lon': -58.4}
+            }
+        return {'hourly': [
+            {'dt': params['dt'] + hour * 3600, 'temp': float(hour)} for hour in range(24)
+        ]}
+
+    mock_request.side_effect = make_request
+    data = service.get_temperature_data("1234", start_date, end_date)
+
+    endpoints = [c.args[0] for c in mock_request.call_args_list]
+    assert endpoints.count('weather') == 1
+    assert sorted(c.kwargs['params']['dt'] for c in mock_request.call_args_list if c.args[0] != 'weather') == day_starts
+    assert len(data) == 72
+    assert [d['timestamp'] for d in data] == sorted(d['timestamp'] for d in data)
+    assert data[0]['timestamp'] == start_date
+    assert data[-1]['timestamp'] == end_date
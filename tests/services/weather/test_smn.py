@@ -1,15 +1,18 @@
 import pytest
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 import zipfile
 from io import BytesIO
 
 from app.services.weather.smn import SMNService
 
+
 @pytest.fixture
 def smn_service():
     return SMNService()
 
+
 def test_generate_data_url():
     """Test URL generation for SMN data files."""
     service = SMNService()
@@ -18,12 +21,14 @@ def test_generate_data_url():
     expected_url = "https://ssl.smn.gob.ar/dpd/descarga_opendata.php?file=observaciones/datohorario20240420.txt"
     assert service._generate_data_url(date) == expected_url
 
+
 def test_generate_metadata_url():
     """Test URL generation for SMN metadata file."""
     service = SMNService()
     expected_url = "https://ssl.smn.gob.ar/dpd/zipopendata.php?dato=estaciones"
     assert service._generate_metadata_url() == expected_url
 
+
 @patch('requests.get')
 def test_download_file(mock_get):
     """Test file download functionality."""
@@ -36,6 +41,7 @@ def test_download_file(mock_get):
     assert content == b"test content"
     mock_get.assert_called_once_with("https://test.url")
 
+
 @patch('app.services.weather.smn.SMNService._download_file')
 def test_download_and_extract_metadata(mock_download):
     """Test metadata file download and extraction."""
@@ -56,6 +62,7 @@ LABOULAYE AERO                 CORDOBA                              -31      33
     content = service._download_and_extract_metadata()
     assert content.decode('utf-8') == metadata_content
 
+
 @patch('app.services.weather.smn.SMNService._download_and_extract_metadata')
 def test_get_station_metadata(mock_download):
     """Test station metadata retrieval."""
@@ -88,6 +95,7 @@ LABOULAYE AERO                 CORDOBA                              -31      33
         'altitude': 137
     }
 
+
 @patch('app.services.weather.smn.SMNService._download_file')
 def test_get_temperature_data(mock_download):
     """Test temperature data retrieval."""
@@ -106,6 +114,7 @@ ddmmyyyy hh      C       %      hPa     km/h    grados  texto
     assert data[0]['temperature'] == 20.5
     assert data[0]['station_id'] == '1234'
 
+
 @patch('app.services.weather.smn.SMNService._download_file')
 def test_parse_2025_data(mock_download):
     """Test parsing of specific data format from April 20, 2025."""
@@ -122,4 +131,150 @@ ddmmyyyy hh      C       %      hPa     km/h    grados  texto
     assert len(data) == 1
     assert data[0]['timestamp'] == datetime(2025, 4, 20, 0, 0)
     assert data[0]['temperature'] == 14.7
-    assert data[0]['station_id'] == 'AEROPARQUE AERO' 
\ No newline at end of file
+    assert data[0]['station_id'] == 'AEROPARQUE AERO'
+
+
+@patch('app.services.weather.smn.SMNService._download_file')
+def test_get_temperature_data_concurrent_keeps_date_order(mock_download):
+    """Test that concurrently downloaded day files are returned in date order."""
+    def download(url):
+        # Make earlier days finish last to exercise out-of-order completion
+        day = int(url[-6:-4])
+        time.sleep((25 - day) * 0.005)
+        return f"""Fecha    Hora    Temp    Hum    Pres    Viento  Dir     Estacion
+ddmmyyyy hh      C       %      hPa     km/h    grados  texto
+{day:02d}042025     0  {day}.0   71  1021.8  990    4     AEROPARQUE AERO
+""".encode('utf-8')
+
+    mock_download.side_effect = download
+    service = SMNService(max_workers=4)
+    data = service.get_temperature_data(
+        "AEROPARQUE AERO", datetime(2025, 4, 15), datetime(2025, 4, 24)
+    )
+
+    assert mock_download.call_count == 10
+    assert [d['timestamp'] for d in data] == [datetime(2025, 4, day) for day in range(15, 25)]
+    assert [d['temperature'] for d in data] == [float(day) for day in range(15, 25)]
+
+
+def test_invalid_max_workers():
+    """Test that the worker count must be positive."""
+    with pytest.raises(ValueError, match="max_workers must be at least 1"):
+        SMNService(max_workers=0)
+
+
+SAMPLE_DAY_FILE = b"""Fecha    Hora    Temp    Hum    Pres    Viento  Dir     Estacion
+ddmmyyyy hh      C       %      hPa     km/h    grados  texto
+20042025     0  14.7   71  1021.8  990    4     AEROPARQUE AERO
+"""
+
+
+@patch('app.services.weather.smn.SMNService._download_file')
+def test_get_temperature_data_uses_file_cache(mock_download, tmp_path):
+    """Test that past day files are downloaded once and then served from disk."""
+    mock_download.return_value = SAMPLE_DAY_FILE
+    start_date = datetime(2025, 4, 20)
+    end_date = datetime(2025, 4, 20, 1)
+
+    first = SMNService(cache_dir=str(tmp_path)).get_temperature_data("AEROPARQUE AERO", start_date, end_date)
+    second = SMNService(cache_dir=str(tmp_path)).get_temperature_data("AEROPARQUE AERO", start_date, end_date)
+
+    assert mock_download.call_count == 1
+    assert first == second
+    assert (tmp_path / '2025' / '04' / 'datohorario20250420.txt.gz').exists()
+
+
+@patch('app.services.weather.smn.SMNService._download_file')
+def test_get_temperature_data_does_not_cache_today(mock_download, tmp_path):
+    """Test that today's file is always fetched from the network."""
+    mock_download.return_value = SAMPLE_DAY_FILE
+    service = SMNService(cache_dir=str(tmp_path))
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+
+    service.get_temperature_data("AEROPARQUE AERO", today, today)
+    service.get_temperature_data("AEROPARQUE AERO", today, today)
+
+    assert mock_download.call_count == 2
+    assert not any(tmp_path.rglob('*.gz'))
+
+
+def test_recent_day_files_are_not_final(tmp_path):
+    """Test that day files are cached only two days after they end in Argentina time."""
+    service = SMNService(cache_dir=str(tmp_path))
+    today = datetime.now(SMNService.TIMEZONE).date()
+
+    assert not service.cache.is_cacheable(today - timedelta(days=1))
+    assert service.cache.is_cacheable(today - timedelta(days=2))
+
+
+@patch('app.services.weather.smn.SMNService._download_file')
+def test_get_temperature_data_many(mock_download):
+    """Test single-pass extraction of several stations from each day file."""
+    mock_download.return_value = b"""Fecha    Hora    Temp    Hum    Pres    Viento  Dir     Estacion
+ddmmyyyy hh      C       %      hPa     km/h    grados  texto
+20042025     0  14.7   71  1021.8  990    4     AEROPARQUE AERO
+20042025     0  11.2   80  1019.4  180    9     TANDIL AERO
+20042025     0   9.8   85  1018.0  200    7     AZUL AERO
+"""
+    service = SMNService()
+    start_date = datetime(2025, 4, 20)
+    end_date = datetime(2025, 4, 20, 1)
+
+    data = service.get_temperature_data_many(["AEROPARQUE AERO", "TANDIL AERO", "MISSING"], start_date, end_date)
+    assert mock_download.call_count == 1
+    assert set(data) == {"AEROPARQUE AERO", "TANDIL AERO", "MISSING"}
+    assert [d['temperature'] for d in data["AEROPARQUE AERO"]] == [14.7]
+    assert [d['temperature'] for d in data["TANDIL AERO"]] == [11.2]
+    assert data["MISSING"] == []
+
+    all_stations = service.get_temperature_data_many(None, start_date, end_date)
+    assert set(all_stations) == {"AEROPARQUE AERO", "TANDIL AERO", "AZUL AERO"}
+
+
+def test_parse_data_frame_matches_line_parser():
+    """Test that the vectorized parser agrees with the per-line parser."""
+    service = SMNService()
+    content = b"""Fecha    Hora    Temp    Hum    Pres    Viento  Dir     Estacion
+ddmmyyyy hh      C       %      hPa     km/h    grados  texto
+20042025     0  14.7   71  1021.8  990    4     AEROPARQUE AERO
+20042025    23  -1.5   80  1019.4  180    9     TANDIL AERO
+not a data line
+21042025     5   9.8   85  1018.0  200    7     AZUL AERO
+"""
+    expected = list(service._parse_data_file(content))
+    df = service.parse_data_frame(content)
+
+    assert len(expected) == 3
+    assert df.to_dict('records') == expected
+    assert expected[1]['timestamp'] == datetime(2025, 4, 20, 23)
+    assert expected[1]['temperature'] == -1.5
+
+
+def test_parse_data_frame_empty_file():
+    """Test vectorized parsing of a file with only headers."""
+    service = SMNService()
+    df = service.parse_data_frame(b"Fecha    Hora\nddmmyyyy hh\n")
+    assert df.empty
+    assert list(df.columns) == ['timestamp', 'temperature', 'station_id']
+
+
+@patch('app.services.weather.smn.SMNService._download_file')
+def test_iter_temperature_batches(mock_download):
+    """Test streaming readings in batches as day files are parsed."""
+    mock_download.side_effect = lambda url: f"""Fecha    Hora    Temp    Hum    Pres    Viento  Dir     Estacion
+ddmmyyyy hh      C       %      hPa     km/h    grados  texto
+{url[-6:-4]}042025     0  14.7   71  1021.8  990    4     AEROPARQUE AERO
+{url[-6:-4]}042025     1  13.9   71  1021.8  990    4     AEROPARQUE AERO
+""".encode('utf-8')
+    service = SMNService(max_workers=1)
+
+    readings = service.iter_temperature_data("AEROPARQUE AERO", datetime(2025, 4, 1), datetime(2025, 4, 30, 23))
+    next(readings)
+    # Only the first day file has been downloaded so far
+    assert mock_download.call_count == 1
+
+    batches = list(service.iter_temperature_batches(
+        "AEROPARQUE AERO", datetime(2025, 4, 1), datetime(2025, 4, 5, 23), batch_size=4
+    ))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert batches[-1][-1]['timestamp'] == datetime(2025, 4, 5, 1)